@@ -24,11 +24,6 @@ function SleepBarColor(score: number) {
   return "#ef4444";
 }
 
-function avg(arr: number[]): number {
-  if (arr.length === 0) return 0;
-  return Math.round(arr.reduce((a, b) => a + b, 0) / arr.length * 10) / 10;
-}
-
 function delta(current: number, previous: number): { text: string; color: string } {
   const diff = current - previous;
   if (Math.abs(diff) < 0.5) return { text: "—", color: "var(--muted-hex)" };
@@ -84,6 +79,21 @@ function MetricTile({ label, value, unit, color, delay, sub, baseline }: {
   );
 }
 
+// Today's reading against the 90-day baseline, in standard deviations.
+function ZBadge({ z, lowerIsBetter }: { z?: number; lowerIsBetter?: boolean }) {
+  if (z == null) return null;
+  const good = lowerIsBetter ? z <= 0 : z >= 0;
+  const color = Math.abs(z) < 1 ? "var(--muted-hex)" : good ? "#10b981" : "#ef4444";
+  return (
+    <span style={{
+      fontSize: "0.55rem", fontFamily: "'JetBrains Mono', monospace",
+      color, fontWeight: 700,
+    }}>
+      {z > 0 ? "+" : ""}{z.toFixed(1)}σ vs 90d
+    </span>
+  );
+}
+
 function DeltaBadge({ d }: { d: { text: string; color: string } }) {
   return (
     <span style={{
@@ -98,20 +108,22 @@ function DeltaBadge({ d }: { d: { text: string; color: string } }) {
 export default function HealthPage() {
   const health = useQuery(api.health.getLatestHealth);
   const history = useQuery(api.health.getHealthHistory, { days: 14 });
+  const aggregates = useQuery(api.health.getHealthAggregates);
 
   const allData = history ?? [];
-  const last7 = allData.slice(0, 7);
-  const prev7 = allData.slice(7, 14);
-
-  // 7d averages
-  const hrvAvg7 = avg(last7.filter((h: any) => h.hrv != null).map((h: any) => h.hrv));
-  const hrvAvgPrev = avg(prev7.filter((h: any) => h.hrv != null).map((h: any) => h.hrv));
-  const sleepAvg7 = avg(last7.filter((h: any) => h.sleepHours != null).map((h: any) => h.sleepHours));
-  const sleepAvgPrev = avg(prev7.filter((h: any) => h.sleepHours != null).map((h: any) => h.sleepHours));
-  const stressAvg7 = avg(last7.filter((h: any) => h.stress != null).map((h: any) => h.stress));
-  const stressAvgPrev = avg(prev7.filter((h: any) => h.stress != null).map((h: any) => h.stress));
-  const rhrAvg7 = avg(last7.filter((h: any) => h.restingHR != null).map((h: any) => h.restingHR));
-  const rhrAvgPrev = avg(prev7.filter((h: any) => h.restingHR != null).map((h: any) => h.restingHR));
+
+  // 7d averages, precomputed by the sync script
+  const agg: Record<string, any> = Object.fromEntries((aggregates ?? []).map((a: any) => [a.metric, a]));
+  const mean7 = (metric: string) => Math.round((agg[metric]?.mean7 ?? 0) * 10) / 10;
+  const prevMean7 = (metric: string) => Math.round((agg[metric]?.prevMean7 ?? agg[metric]?.mean7 ?? 0) * 10) / 10;
+  const hrvAvg7 = mean7("hrv");
+  const hrvAvgPrev = prevMean7("hrv");
+  const sleepAvg7 = mean7("sleepHours");
+  const sleepAvgPrev = prevMean7("sleepHours");
+  const stressAvg7 = mean7("stress");
+  const stressAvgPrev = prevMean7("stress");
+  const rhrAvg7 = mean7("restingHR");
+  const rhrAvgPrev = prevMean7("restingHR");
 
   const hrvDelta = delta(hrvAvg7, hrvAvgPrev);
   const sleepDelta = delta(sleepAvg7, sleepAvgPrev);
@@ -176,9 +188,9 @@ export default function HealthPage() {
 
       {/* Today's metrics — 2 rows of 4 */}
       <div style={{ display: "grid", gridTemplateColumns: "repeat(4, 1fr)", gap: "var(--space-md)", marginBottom: "var(--space-lg)" }}>
-        <MetricTile label="HRV" value={health?.hrv} unit="ms" color="#10b981" delay={0.05} baseline={BASELINES.hrv.label} />
-        <MetricTile label="RHR" value={health?.restingHR} unit="bpm" color="#ef4444" delay={0.1} baseline={BASELINES.rhr.label} />
-        <MetricTile label="Stress" value={health?.stress} color="#f59e0b" delay={0.15} />
+        <MetricTile label="HRV" value={health?.hrv} unit="ms" color="#10b981" delay={0.05} baseline={BASELINES.hrv.label} sub={<ZBadge z={agg.hrv?.z} />} />
+        <MetricTile label="RHR" value={health?.restingHR} unit="bpm" color="#ef4444" delay={0.1} baseline={BASELINES.rhr.label} sub={<ZBadge z={agg.restingHR?.z} lowerIsBetter />} />
+        <MetricTile label="Stress" value={health?.stress} color="#f59e0b" delay={0.15} sub={<ZBadge z={agg.stress?.z} lowerIsBetter />} />
         <MetricTile label="Body Battery" value={health?.bodyBattery} color="#10b981" delay={0.2} />
         <MetricTile label="Sleep Score" value={health?.sleepScore} color="#8b5cf6" delay={0.25} />
         <MetricTile label="Sleep" value={health?.sleepHours ? `${health.sleepHours.toFixed(1)}` : undefined} unit="h" color="#8b5cf6" delay={0.3} baseline={BASELINES.sleep.label} />
@@ -70,6 +70,11 @@ export default function ReportsPage() {
     expandedId ? { reportId: expandedId } : "skip"
   );
 
+  const weeklyContent = useQuery(
+    api.weekly.getWeeklyReportContent,
+    expandedWeeklyId ? { id: expandedWeeklyId as any } : "skip"
+  );
+
   const merged = useMemo(() => {
     const items: any[] = [];
     if (reports) {
@@ -160,7 +165,7 @@ export default function ReportsPage() {
               </div>
               <div className="prose">
                 <ReactMarkdown remarkPlugins={[remarkGfm]}>
-                  {wr.content || "No content available."}
+                  {weeklyContent?.text || wr.content || "No content available."}
                 </ReactMarkdown>
               </div>
             </CardContent>
@@ -61,8 +61,18 @@ function DriftBar({ actualWt, drift, sideColor }: { actualWt: number; drift: num
   );
 }
 
+const CURVE_RANGES = [
+  { key: "30d", label: "30D", field: "equityCurve30d" },
+  { key: "1y", label: "1Y", field: "equityCurve" },
+  { key: "all", label: "ALL", field: "equityCurveAll" },
+] as const;
+
 function StrategyCard({ s }: { s: any }) {
   const [positionsOpen, setPositionsOpen] = useState(false);
+  const [range, setRange] = useState<(typeof CURVE_RANGES)[number]["key"]>("1y");
+  const ranges = CURVE_RANGES.filter((r) => s[r.field]?.length > 1);
+  const active = ranges.find((r) => r.key === range) ?? ranges[0];
+  const curve = active ? s[active.field] : s.equityCurve;
   const positions = s.positionBreakdown?.filter((p: any) => p.notional > 0 || Math.abs(p.actualWt) > 0.1) ?? [];
 
   return (
@@ -91,9 +101,19 @@ function StrategyCard({ s }: { s: any }) {
         </div>
 
         {/* Equity curve */}
-        {s.equityCurve && s.equityCurve.length > 1 && (
+        {curve && curve.length > 1 && (
           <div style={{ marginBottom: "var(--space-lg)", marginLeft: -16, marginRight: -16 }}>
-            <LightweightChart data={s.equityCurve} height={180} />
+            {ranges.length > 1 && (
+              <div style={{ display: "flex", justifyContent: "flex-end", gap: "var(--space-xs)", marginRight: 16, marginBottom: "var(--space-xs)" }}>
+                {ranges.map((r) => (
+                  <button key={r.key} onClick={() => setRange(r.key)} className="mono" style={{
+                    background: "none", border: "none", cursor: "pointer", padding: 0,
+                    fontSize: "var(--text-xs)", color: r.key === active?.key ? "var(--accent-hex)" : "var(--muted-hex)",
+                  }}>{r.label}</button>
+                ))}
+              </div>
+            )}
+            <LightweightChart data={curve} height={180} />
           </div>
         )}
 
@@ -246,8 +266,8 @@ export default function TradingPage() {
     return sum;
   }, 0);
   const totalPositions = live.reduce((sum, s) => sum + (s.positions ?? 0), 0);
-  const liveSparkData = live.length > 0 && live[0].equityCurve ? live[0].equityCurve : null;
-  const paperSparkData = paper.length > 0 && paper[0].equityCurve ? paper[0].equityCurve : null;
+  const liveSparkData = live.length > 0 ? live[0].equityCurve30d ?? live[0].equityCurve ?? null : null;
+  const paperSparkData = paper.length > 0 ? paper[0].equityCurve30d ?? paper[0].equityCurve ?? null : null;
 
   return (
     <div>
@@ -1,30 +1,54 @@
-import { mutation, query } from "./_generated/server";
-import { v } from "convex/values";
+import { mutation, query, MutationCtx } from "./_generated/server";
+import { v, Infer } from "convex/values";
+
+const briefFields = {
+  date: v.string(),
+  domain: v.string(),
+  metrics: v.optional(v.any()),
+  planToday: v.optional(v.any()),
+  actual: v.optional(v.any()),
+  delta: v.optional(v.any()),
+  adjustment: v.optional(v.any()),
+  alert: v.optional(v.string()),
+};
+const briefValidator = v.object(briefFields);
+type DailyBrief = Infer<typeof briefValidator>;
+
+async function upsertDailyBriefRow(ctx: MutationCtx, args: DailyBrief) {
+  const existing = await ctx.db
+    .query("dailyBriefs")
+    .withIndex("by_domain_date", (q) =>
+      q.eq("domain", args.domain).eq("date", args.date)
+    )
+    .first();
+  const data = { ...args, updatedAt: Date.now() };
+  if (existing) {
+    await ctx.db.patch(existing._id, data);
+    return existing._id;
+  }
+  return await ctx.db.insert("dailyBriefs", data);
+}
 
 export const upsertDailyBrief = mutation({
-  args: {
-    date: v.string(),
-    domain: v.string(),
-    metrics: v.optional(v.any()),
-    planToday: v.optional(v.any()),
-    actual: v.optional(v.any()),
-    delta: v.optional(v.any()),
-    adjustment: v.optional(v.any()),
-    alert: v.optional(v.string()),
+  args: briefFields,
+  handler: async (ctx, args) => {
+    await upsertDailyBriefRow(ctx, args);
   },
+});
+
+export const upsertDailyBriefs = mutation({
+  args: { rows: v.array(briefValidator) },
   handler: async (ctx, args) => {
-    const existing = await ctx.db
-      .query("dailyBriefs")
-      .withIndex("by_domain_date", (q) =>
-        q.eq("domain", args.domain).eq("date", args.date)
-      )
-      .first();
-    const data = { ...args, updatedAt: Date.now() };
-    if (existing) {
-      await ctx.db.patch(existing._id, data);
-    } else {
-      await ctx.db.insert("dailyBriefs", data);
+    const results = [];
+    for (const row of args.rows) {
+      try {
+        const id = await upsertDailyBriefRow(ctx, row);
+        results.push({ ok: true, id });
+      } catch (e) {
+        results.push({ ok: false, error: String(e) });
+      }
     }
+    return results;
   },
 });
 
@@ -0,0 +1,74 @@
+import { mutation, query, MutationCtx, QueryCtx } from "./_generated/server";
+import { v, Infer } from "convex/values";
+
+// Content-addressed pieces of long text (e.g. report bodies). A document
+// stores the ordered list of chunk hashes; identical chunks are stored once.
+const chunkFields = {
+  hash: v.string(),
+  text: v.string(),
+};
+export const chunkValidator = v.object(chunkFields);
+type Chunk = Infer<typeof chunkValidator>;
+
+async function putChunkRow(ctx: MutationCtx, args: Chunk) {
+  const existing = await ctx.db
+    .query("reportChunks")
+    .withIndex("by_hash", (q) => q.eq("hash", args.hash))
+    .first();
+  if (existing) return existing._id;
+  return await ctx.db.insert("reportChunks", args);
+}
+
+// Store `rows`, one {ok, id} / {ok: false, error} result each, in order.
+// Modules whose documents reference chunks wrap this in their own mutation.
+export async function putChunkRows(ctx: MutationCtx, rows: Chunk[]) {
+  const results = [];
+  for (const row of rows) {
+    try {
+      const id = await putChunkRow(ctx, row);
+      results.push({ ok: true, id });
+    } catch (e) {
+      results.push({ ok: false, error: String(e) });
+    }
+  }
+  return results;
+}
+
+export const putChunks = mutation({
+  args: { rows: v.array(chunkValidator) },
+  handler: async (ctx, args) => {
+    return await putChunkRows(ctx, args.rows);
+  },
+});
+
+// The subset of `hashes` not stored yet, so clients upload only those.
+export const missingChunks = query({
+  args: { hashes: v.array(v.string()) },
+  handler: async (ctx, args) => {
+    const missing = [];
+    for (const hash of args.hashes) {
+      const existing = await ctx.db
+        .query("reportChunks")
+        .withIndex("by_hash", (q) => q.eq("hash", hash))
+        .first();
+      if (!existing) missing.push(hash);
+    }
+    return missing;
+  },
+});
+
+// Reassemble text from its chunk hashes. `complete` is false while some
+// chunks have not arrived yet; the query re-runs once they do.
+export async function loadChunkedText(ctx: QueryCtx, hashes: string[]) {
+  let text = "";
+  let complete = true;
+  for (const hash of hashes) {
+    const chunk = await ctx.db
+      .query("reportChunks")
+      .withIndex("by_hash", (q) => q.eq("hash", hash))
+      .first();
+    if (chunk) text += chunk.text;
+    else complete = false;
+  }
+  return { text, complete };
+}
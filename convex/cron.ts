@@ -1,30 +1,95 @@
-import { mutation, query } from "./_generated/server";
-import { v } from "convex/values";
+import { mutation, query, MutationCtx } from "./_generated/server";
+import { v, Infer } from "convex/values";
+
+const cronJobFields = {
+  jobId: v.string(),
+  name: v.string(),
+  schedule: v.string(),
+  enabled: v.boolean(),
+  lastStatus: v.optional(v.string()),
+  lastRunAt: v.optional(v.number()),
+  lastDurationMs: v.optional(v.number()),
+  lastError: v.optional(v.string()),
+  consecutiveErrors: v.optional(v.number()),
+  nextRunAt: v.optional(v.number()),
+};
+const cronJobValidator = v.object(cronJobFields);
+type CronJob = Infer<typeof cronJobValidator>;
+
+// Only the fields that changed since the last upload; `unset` names fields
+// to clear.
+const cronJobPatchValidator = v.object({
+  ...cronJobFields,
+  name: v.optional(v.string()),
+  schedule: v.optional(v.string()),
+  enabled: v.optional(v.boolean()),
+  unset: v.optional(v.array(v.string())),
+});
+type CronJobPatch = Infer<typeof cronJobPatchValidator>;
+
+async function upsertCronJobRow(ctx: MutationCtx, args: CronJob) {
+  const existing = await ctx.db
+    .query("cronJobs")
+    .withIndex("by_jobId", (q) => q.eq("jobId", args.jobId))
+    .first();
+  const data = { ...args, updatedAt: Date.now() };
+  if (existing) {
+    await ctx.db.patch(existing._id, data);
+    return existing._id;
+  }
+  return await ctx.db.insert("cronJobs", data);
+}
+
+async function patchCronJobRow(ctx: MutationCtx, args: CronJobPatch) {
+  const { unset, ...fields } = args;
+  const existing = await ctx.db
+    .query("cronJobs")
+    .withIndex("by_jobId", (q) => q.eq("jobId", args.jobId))
+    .first();
+  if (!existing) {
+    throw new Error(`cron job ${args.jobId} not found`);
+  }
+  const cleared = Object.fromEntries((unset ?? []).map((f) => [f, undefined]));
+  await ctx.db.patch(existing._id, { ...cleared, ...fields, updatedAt: Date.now() });
+  return existing._id;
+}
 
 export const upsertCronJob = mutation({
-  args: {
-    jobId: v.string(),
-    name: v.string(),
-    schedule: v.string(),
-    enabled: v.boolean(),
-    lastStatus: v.optional(v.string()),
-    lastRunAt: v.optional(v.number()),
-    lastDurationMs: v.optional(v.number()),
-    lastError: v.optional(v.string()),
-    consecutiveErrors: v.optional(v.number()),
-    nextRunAt: v.optional(v.number()),
+  args: cronJobFields,
+  handler: async (ctx, args) => {
+    await upsertCronJobRow(ctx, args);
   },
+});
+
+export const upsertCronJobs = mutation({
+  args: { rows: v.array(cronJobValidator) },
+  handler: async (ctx, args) => {
+    const results = [];
+    for (const row of args.rows) {
+      try {
+        const id = await upsertCronJobRow(ctx, row);
+        results.push({ ok: true, id });
+      } catch (e) {
+        results.push({ ok: false, error: String(e) });
+      }
+    }
+    return results;
+  },
+});
+
+export const patchCronJobs = mutation({
+  args: { rows: v.array(cronJobPatchValidator) },
   handler: async (ctx, args) => {
-    const existing = await ctx.db
-      .query("cronJobs")
-      .withIndex("by_jobId", (q) => q.eq("jobId", args.jobId))
-      .first();
-    const data = { ...args, updatedAt: Date.now() };
-    if (existing) {
-      await ctx.db.patch(existing._id, data);
-    } else {
-      await ctx.db.insert("cronJobs", data);
+    const results = [];
+    for (const row of args.rows) {
+      try {
+        const id = await patchCronJobRow(ctx, row);
+        results.push({ ok: true, id });
+      } catch (e) {
+        results.push({ ok: false, error: String(e) });
+      }
     }
+    return results;
   },
 });
 
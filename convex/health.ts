@@ -1,32 +1,117 @@
-import { mutation, query } from "./_generated/server";
-import { v } from "convex/values";
+import { mutation, query, MutationCtx } from "./_generated/server";
+import { v, Infer } from "convex/values";
+
+const healthFields = {
+  date: v.string(),
+  hrv: v.optional(v.number()),
+  sleepScore: v.optional(v.number()),
+  sleepHours: v.optional(v.number()),
+  stress: v.optional(v.number()),
+  bodyBattery: v.optional(v.number()),
+  bodyBatteryHigh: v.optional(v.number()),
+  bodyBatteryLow: v.optional(v.number()),
+  restingHR: v.optional(v.number()),
+  steps: v.optional(v.number()),
+  activeCalories: v.optional(v.number()),
+  trainingReadiness: v.optional(v.number()),
+};
+const healthValidator = v.object(healthFields);
+type HealthSnapshot = Infer<typeof healthValidator>;
+
+async function upsertHealthRow(ctx: MutationCtx, args: HealthSnapshot) {
+  const existing = await ctx.db
+    .query("healthSnapshots")
+    .withIndex("by_date", (q) => q.eq("date", args.date))
+    .first();
+  const data = { ...args, updatedAt: Date.now() };
+  if (existing) {
+    await ctx.db.patch(existing._id, data);
+    return existing._id;
+  }
+  return await ctx.db.insert("healthSnapshots", data);
+}
 
 export const upsertHealth = mutation({
-  args: {
-    date: v.string(),
-    hrv: v.optional(v.number()),
-    sleepScore: v.optional(v.number()),
-    sleepHours: v.optional(v.number()),
-    stress: v.optional(v.number()),
-    bodyBattery: v.optional(v.number()),
-    bodyBatteryHigh: v.optional(v.number()),
-    bodyBatteryLow: v.optional(v.number()),
-    restingHR: v.optional(v.number()),
-    steps: v.optional(v.number()),
-    activeCalories: v.optional(v.number()),
-    trainingReadiness: v.optional(v.number()),
+  args: healthFields,
+  handler: async (ctx, args) => {
+    await upsertHealthRow(ctx, args);
   },
+});
+
+export const upsertHealthSnapshots = mutation({
+  args: { rows: v.array(healthValidator) },
   handler: async (ctx, args) => {
-    const existing = await ctx.db
-      .query("healthSnapshots")
-      .withIndex("by_date", (q) => q.eq("date", args.date))
-      .first();
-    const data = { ...args, updatedAt: Date.now() };
-    if (existing) {
-      await ctx.db.patch(existing._id, data);
-    } else {
-      await ctx.db.insert("healthSnapshots", data);
+    const results = [];
+    for (const row of args.rows) {
+      try {
+        const id = await upsertHealthRow(ctx, row);
+        results.push({ ok: true, id });
+      } catch (e) {
+        results.push({ ok: false, error: String(e) });
+      }
+    }
+    return results;
+  },
+});
+
+// Rolling per-metric aggregates computed by the sync script from its local
+// history, so the dashboard reads one small doc per metric instead of
+// scanning snapshots. z is the day's value against the 90-day baseline, z7
+// the 7-day mean against it; zHistory holds the last 30 days of z.
+const healthAggregateFields = {
+  metric: v.string(),
+  date: v.string(),
+  value: v.optional(v.float64()),
+  mean7: v.optional(v.float64()),
+  std7: v.optional(v.float64()),
+  n7: v.number(),
+  mean30: v.optional(v.float64()),
+  std30: v.optional(v.float64()),
+  n30: v.number(),
+  mean90: v.optional(v.float64()),
+  std90: v.optional(v.float64()),
+  n90: v.number(),
+  prevMean7: v.optional(v.float64()),
+  z: v.optional(v.float64()),
+  z7: v.optional(v.float64()),
+  zHistory: v.array(v.object({ date: v.string(), value: v.float64() })),
+};
+const healthAggregateValidator = v.object(healthAggregateFields);
+type HealthAggregate = Infer<typeof healthAggregateValidator>;
+
+async function upsertHealthAggregateRow(ctx: MutationCtx, args: HealthAggregate) {
+  const existing = await ctx.db
+    .query("healthAggregates")
+    .withIndex("by_metric", (q) => q.eq("metric", args.metric))
+    .first();
+  const data = { ...args, updatedAt: Date.now() };
+  if (existing) {
+    // Replace, not patch: a stat that no longer applies must disappear.
+    await ctx.db.replace(existing._id, data);
+    return existing._id;
+  }
+  return await ctx.db.insert("healthAggregates", data);
+}
+
+export const upsertHealthAggregates = mutation({
+  args: { rows: v.array(healthAggregateValidator) },
+  handler: async (ctx, args) => {
+    const results = [];
+    for (const row of args.rows) {
+      try {
+        const id = await upsertHealthAggregateRow(ctx, row);
+        results.push({ ok: true, id });
+      } catch (e) {
+        results.push({ ok: false, error: String(e) });
+      }
     }
+    return results;
+  },
+});
+
+export const getHealthAggregates = query({
+  handler: async (ctx) => {
+    return await ctx.db.query("healthAggregates").collect();
   },
 });
 
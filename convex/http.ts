@@ -1,4 +1,4 @@
-import { httpRouter } from "convex/server";
+import { httpRouter, FunctionReference } from "convex/server";
 import { httpAction } from "./_generated/server";
 import { api } from "./_generated/api";
 
@@ -91,6 +91,132 @@ http.route({
   }),
 });
 
+// --- Bulk ingestion ---------------------------------------------------------
+//
+// POST /api/ingest takes a gzip- or deflate-compressed NDJSON stream of
+// upserts, one per line:
+//   {"fn": "health:upsertHealthSnapshots", "row": {...}}   one row of a bulk mutation
+//   {"fn": "tes:upsertTes", "args": {...}}                 a single mutation
+// Consecutive rows for the same bulk mutation are applied together in
+// groups of INGEST_GROUP_ROWS. Lines are applied in order and the reply has
+// one {ok, error?} per line, so a sync client can retry just the failures.
+
+type Mutation = FunctionReference<"mutation">;
+
+const INGEST_BULK: Record<string, Mutation> = {
+  "health:upsertHealthSnapshots": api.health.upsertHealthSnapshots,
+  "health:upsertHealthAggregates": api.health.upsertHealthAggregates,
+  "trading:upsertTrades": api.trading.upsertTrades,
+  "meals:syncMealLogs": api.meals.syncMealLogs,
+  "briefs:upsertDailyBriefs": api.briefs.upsertDailyBriefs,
+  "cron:upsertCronJobs": api.cron.upsertCronJobs,
+  "cron:patchCronJobs": api.cron.patchCronJobs,
+  "chunks:putChunks": api.chunks.putChunks,
+  "weekly:putReportChunks": api.weekly.putReportChunks,
+  "weekly:upsertWeeklyReports": api.weekly.upsertWeeklyReports,
+  "reports:upsertReports": api.reports.upsertReports,
+};
+
+const INGEST_SINGLE: Record<string, Mutation> = {
+  "tes:upsertTes": api.tes.upsertTes,
+  "ziolo:upsertZiolo": api.ziolo.upsertZiolo,
+  "trading:upsertStrategy": api.trading.upsertStrategy,
+  "trading:patchStrategy": api.trading.patchStrategy,
+  "trading:appendEquityPoints": api.trading.appendEquityPoints,
+  "meals:upsertMealPlan": api.meals.upsertMealPlan,
+  "meals:upsertDailyMeals": api.meals.upsertDailyMeals,
+  "activities:upsertActivity": api.activities.upsertActivity,
+};
+
+const INGEST_GROUP_ROWS = 200;
+const INGEST_ENCODINGS = ["gzip", "deflate"];
+
+type IngestLine = { fn: string; row?: unknown; args?: unknown };
+type IngestResult = { ok: boolean; error?: string };
+
+async function readNdjson(request: Request): Promise<string> {
+  const encoding = (request.headers.get("Content-Encoding") ?? "").toLowerCase();
+  if (!encoding || encoding === "identity") return await request.text();
+  if (!request.body) return "";
+  const stream = request.body.pipeThrough(
+    new DecompressionStream(encoding as CompressionFormat)
+  );
+  return await new Response(stream).text();
+}
+
+http.route({
+  path: "/api/ingest",
+  method: "POST",
+  handler: httpAction(async (ctx, request) => {
+    if (!checkAuth(request)) {
+      return new Response(JSON.stringify({ error: "unauthorized" }), { status: 401 });
+    }
+    const encoding = (request.headers.get("Content-Encoding") ?? "").toLowerCase();
+    if (encoding && encoding !== "identity" && !INGEST_ENCODINGS.includes(encoding)) {
+      return new Response(
+        JSON.stringify({ error: `unsupported Content-Encoding: ${encoding}` }),
+        { status: 415 }
+      );
+    }
+    let lines: IngestLine[];
+    try {
+      lines = (await readNdjson(request))
+        .split("\n")
+        .filter((line) => line.trim())
+        .map((line) => JSON.parse(line));
+    } catch (e) {
+      return new Response(JSON.stringify({ error: `bad NDJSON: ${e}` }), { status: 400 });
+    }
+
+    const results: IngestResult[] = [];
+    let i = 0;
+    while (i < lines.length) {
+      const { fn } = lines[i];
+      const bulk = lines[i].row !== undefined ? INGEST_BULK[fn] : undefined;
+      if (bulk) {
+        const rows: unknown[] = [];
+        while (
+          i < lines.length &&
+          lines[i].fn === fn &&
+          lines[i].row !== undefined &&
+          rows.length < INGEST_GROUP_ROWS
+        ) {
+          rows.push(lines[i++].row);
+        }
+        try {
+          const out: IngestResult[] = await ctx.runMutation(bulk, { rows });
+          for (let j = 0; j < rows.length; j++) {
+            results.push(
+              out[j]
+                ? { ok: out[j].ok, error: out[j].error }
+                : { ok: false, error: "missing result" }
+            );
+          }
+        } catch (e) {
+          results.push(...rows.map(() => ({ ok: false, error: String(e) })));
+        }
+        continue;
+      }
+      const line = lines[i++];
+      const single = line.args !== undefined ? INGEST_SINGLE[fn] : undefined;
+      if (!single) {
+        results.push({ ok: false, error: `not ingestible: ${fn}` });
+        continue;
+      }
+      try {
+        await ctx.runMutation(single, line.args as any);
+        results.push({ ok: true });
+      } catch (e) {
+        results.push({ ok: false, error: String(e) });
+      }
+    }
+    return new Response(JSON.stringify({ results }), {
+      status: 200,
+      headers: { "Content-Type": "application/json" },
+    });
+  }),
+});
+
 // CORS preflight
 http.route({
   path: "/api/feed/push",
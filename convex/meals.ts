@@ -1,34 +1,57 @@
-import { mutation, query } from "./_generated/server";
-import { v } from "convex/values";
+import { mutation, query, MutationCtx } from "./_generated/server";
+import { v, Infer } from "convex/values";
+
+const mealLogDayValidator = v.object({
+  date: v.string(),
+  meals: v.array(v.object({
+    mealType: v.string(),
+    name: v.string(),
+    kcal: v.number(),
+    protein: v.number(),
+    carbs: v.number(),
+    fat: v.number(),
+    satFat: v.optional(v.number()),
+    fiber: v.optional(v.number()),
+  })),
+});
+type MealLogDay = Infer<typeof mealLogDayValidator>;
+
+async function syncMealLogDay(ctx: MutationCtx, args: MealLogDay) {
+  // Delete existing entries for this date
+  const existing = await ctx.db
+    .query("mealLog")
+    .withIndex("by_date", (q) => q.eq("date", args.date))
+    .collect();
+  for (const e of existing) {
+    await ctx.db.delete(e._id);
+  }
+  // Insert new
+  const now = Date.now();
+  for (const m of args.meals) {
+    await ctx.db.insert("mealLog", { date: args.date, ...m, updatedAt: now });
+  }
+}
 
 export const syncMealLog = mutation({
-  args: {
-    date: v.string(),
-    meals: v.array(v.object({
-      mealType: v.string(),
-      name: v.string(),
-      kcal: v.number(),
-      protein: v.number(),
-      carbs: v.number(),
-      fat: v.number(),
-      satFat: v.optional(v.number()),
-      fiber: v.optional(v.number()),
-    })),
+  args: mealLogDayValidator.fields,
+  handler: async (ctx, args) => {
+    await syncMealLogDay(ctx, args);
   },
+});
+
+export const syncMealLogs = mutation({
+  args: { rows: v.array(mealLogDayValidator) },
   handler: async (ctx, args) => {
-    // Delete existing entries for this date
-    const existing = await ctx.db
-      .query("mealLog")
-      .withIndex("by_date", (q) => q.eq("date", args.date))
-      .collect();
-    for (const e of existing) {
-      await ctx.db.delete(e._id);
-    }
-    // Insert new
-    const now = Date.now();
-    for (const m of args.meals) {
-      await ctx.db.insert("mealLog", { date: args.date, ...m, updatedAt: now });
+    const results = [];
+    for (const row of args.rows) {
+      try {
+        await syncMealLogDay(ctx, row);
+        results.push({ ok: true });
+      } catch (e) {
+        results.push({ ok: false, error: String(e) });
+      }
     }
+    return results;
   },
 });
 
@@ -1,30 +1,54 @@
-import { mutation, query } from "./_generated/server";
-import { v } from "convex/values";
+import { mutation, query, MutationCtx } from "./_generated/server";
+import { v, Infer } from "convex/values";
+
+const reportFields = {
+  reportId: v.string(),
+  agent: v.string(),
+  reportType: v.string(),
+  date: v.string(),
+  title: v.string(),
+  summary: v.string(),
+  content: v.string(),
+  contentOverflow: v.optional(v.string()),
+  metrics: v.optional(v.any()),
+  deliveredTo: v.array(v.string()),
+};
+const reportValidator = v.object(reportFields);
+type Report = Infer<typeof reportValidator>;
+
+async function upsertReportRow(ctx: MutationCtx, args: Report) {
+  const existing = await ctx.db
+    .query("reports")
+    .withIndex("by_reportId", (q) => q.eq("reportId", args.reportId))
+    .first();
+  const data = { ...args, createdAt: Date.now() };
+  if (existing) {
+    await ctx.db.patch(existing._id, data);
+    return existing._id;
+  }
+  return await ctx.db.insert("reports", data);
+}
 
 export const upsertReport = mutation({
-  args: {
-    reportId: v.string(),
-    agent: v.string(),
-    reportType: v.string(),
-    date: v.string(),
-    title: v.string(),
-    summary: v.string(),
-    content: v.string(),
-    contentOverflow: v.optional(v.string()),
-    metrics: v.optional(v.any()),
-    deliveredTo: v.array(v.string()),
+  args: reportFields,
+  handler: async (ctx, args) => {
+    await upsertReportRow(ctx, args);
   },
+});
+
+export const upsertReports = mutation({
+  args: { rows: v.array(reportValidator) },
   handler: async (ctx, args) => {
-    const existing = await ctx.db
-      .query("reports")
-      .withIndex("by_reportId", (q) => q.eq("reportId", args.reportId))
-      .first();
-    const data = { ...args, createdAt: Date.now() };
-    if (existing) {
-      await ctx.db.patch(existing._id, data);
-    } else {
-      await ctx.db.insert("reports", data);
+    const results = [];
+    for (const row of args.rows) {
+      try {
+        const id = await upsertReportRow(ctx, row);
+        results.push({ ok: true, id });
+      } catch (e) {
+        results.push({ ok: false, error: String(e) });
+      }
     }
+    return results;
   },
 });
 
@@ -18,6 +18,26 @@ export default defineSchema({
     updatedAt: v.number(),
   }).index("by_date", ["date"]),
 
+  healthAggregates: defineTable({
+    metric: v.string(),
+    date: v.string(),
+    value: v.optional(v.float64()),
+    mean7: v.optional(v.float64()),
+    std7: v.optional(v.float64()),
+    n7: v.number(),
+    mean30: v.optional(v.float64()),
+    std30: v.optional(v.float64()),
+    n30: v.number(),
+    mean90: v.optional(v.float64()),
+    std90: v.optional(v.float64()),
+    n90: v.number(),
+    prevMean7: v.optional(v.float64()),
+    z: v.optional(v.float64()),
+    z7: v.optional(v.float64()),
+    zHistory: v.array(v.object({ date: v.string(), value: v.float64() })),
+    updatedAt: v.number(),
+  }).index("by_metric", ["metric"]),
+
   activities: defineTable({
     date: v.string(),
     type: v.string(),
@@ -67,7 +87,11 @@ export default defineSchema({
     winRate: v.optional(v.float64()),
     positions: v.optional(v.float64()),
     netExposure: v.optional(v.string()),
+    // Chart views downsampled by the sync: last 30 days in full, last year
+    // daily and all-time weekly. The full series is in equityPoints.
+    equityCurve30d: v.optional(v.array(v.object({ date: v.string(), value: v.float64() }))),
     equityCurve: v.optional(v.array(v.object({ date: v.string(), value: v.float64() }))),
+    equityCurveAll: v.optional(v.array(v.object({ date: v.string(), value: v.float64() }))),
     positionBreakdown: v.optional(v.array(v.object({
       symbol: v.string(),
       targetWt: v.optional(v.float64()),
@@ -81,6 +105,13 @@ export default defineSchema({
     updatedAt: v.float64(),
   }).index("by_strategyId", ["strategyId"]),
 
+  // Append-only daily equity per strategy, at full resolution.
+  equityPoints: defineTable({
+    strategyId: v.string(),
+    date: v.string(),
+    value: v.float64(),
+  }).index("by_strategy_date", ["strategyId", "date"]),
+
   cronJobs: defineTable({
     jobId: v.string(),
     name: v.string(),
@@ -150,11 +181,18 @@ export default defineSchema({
     summary: v.optional(v.string()),
     sourcePath: v.optional(v.string()),
     content: v.optional(v.string()),
+    // Long content is stored as reportChunks hashes instead of `content`.
+    contentChunks: v.optional(v.array(v.string())),
     updatedAt: v.number(),
   })
     .index("by_domain_date", ["domain", "reportDate"])
     .index("by_reportDate", ["reportDate"]),
 
+  reportChunks: defineTable({
+    hash: v.string(),
+    text: v.string(),
+  }).index("by_hash", ["hash"]),
+
   tradeLog: defineTable({
     strategyId: v.string(),
     date: v.string(),
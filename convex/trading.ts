@@ -1,36 +1,42 @@
-import { mutation, query } from "./_generated/server";
-import { v } from "convex/values";
+import { mutation, query, MutationCtx } from "./_generated/server";
+import { v, Infer } from "convex/values";
+
+const equityPointValidator = v.object({ date: v.string(), value: v.float64() });
+
+const strategyFields = {
+  strategyId: v.string(),
+  name: v.string(),
+  mode: v.string(),
+  exchange: v.string(),
+  equity: v.optional(v.float64()),
+  pnl: v.optional(v.float64()),
+  pnlPct: v.optional(v.float64()),
+  return1d: v.optional(v.float64()),
+  return7d: v.optional(v.float64()),
+  return30d: v.optional(v.float64()),
+  returnItd: v.optional(v.float64()),
+  sharpe: v.optional(v.float64()),
+  maxDrawdown: v.optional(v.float64()),
+  winRate: v.optional(v.float64()),
+  positions: v.optional(v.float64()),
+  netExposure: v.optional(v.string()),
+  equityCurve30d: v.optional(v.array(equityPointValidator)),
+  equityCurve: v.optional(v.array(equityPointValidator)),
+  equityCurveAll: v.optional(v.array(equityPointValidator)),
+  positionBreakdown: v.optional(v.array(v.object({
+    symbol: v.string(),
+    targetWt: v.optional(v.float64()),
+    actualWt: v.optional(v.float64()),
+    drift: v.optional(v.float64()),
+    notional: v.optional(v.float64()),
+    unrealizedPnl: v.optional(v.float64()),
+    side: v.optional(v.string()),
+  }))),
+  reportDate: v.string(),
+};
 
 export const upsertStrategy = mutation({
-  args: {
-    strategyId: v.string(),
-    name: v.string(),
-    mode: v.string(),
-    exchange: v.string(),
-    equity: v.optional(v.float64()),
-    pnl: v.optional(v.float64()),
-    pnlPct: v.optional(v.float64()),
-    return1d: v.optional(v.float64()),
-    return7d: v.optional(v.float64()),
-    return30d: v.optional(v.float64()),
-    returnItd: v.optional(v.float64()),
-    sharpe: v.optional(v.float64()),
-    maxDrawdown: v.optional(v.float64()),
-    winRate: v.optional(v.float64()),
-    positions: v.optional(v.float64()),
-    netExposure: v.optional(v.string()),
-    equityCurve: v.optional(v.array(v.object({ date: v.string(), value: v.float64() }))),
-    positionBreakdown: v.optional(v.array(v.object({
-      symbol: v.string(),
-      targetWt: v.optional(v.float64()),
-      actualWt: v.optional(v.float64()),
-      drift: v.optional(v.float64()),
-      notional: v.optional(v.float64()),
-      unrealizedPnl: v.optional(v.float64()),
-      side: v.optional(v.string()),
-    }))),
-    reportDate: v.string(),
-  },
+  args: strategyFields,
   handler: async (ctx, args) => {
     const existing = await ctx.db
       .query("tradingStrategies")
@@ -45,6 +51,93 @@ export const upsertStrategy = mutation({
   },
 });
 
+// Only the fields that changed since the last upload; `unset` names fields
+// to clear. The sync falls back to upsertStrategy for documents it has not
+// sent before.
+export const patchStrategy = mutation({
+  args: {
+    ...strategyFields,
+    name: v.optional(v.string()),
+    mode: v.optional(v.string()),
+    exchange: v.optional(v.string()),
+    reportDate: v.optional(v.string()),
+    unset: v.optional(v.array(v.string())),
+  },
+  handler: async (ctx, args) => {
+    const { unset, ...fields } = args;
+    const existing = await ctx.db
+      .query("tradingStrategies")
+      .withIndex("by_strategyId", (q) => q.eq("strategyId", args.strategyId))
+      .first();
+    if (!existing) {
+      throw new Error(`strategy ${args.strategyId} not found`);
+    }
+    const cleared = Object.fromEntries((unset ?? []).map((f) => [f, undefined]));
+    await ctx.db.patch(existing._id, { ...cleared, ...fields, updatedAt: Date.now() });
+  },
+});
+
+// Append-only equity time series. The sync sends only points from the last
+// uploaded date on; with `replace` the payload is the full curve and any
+// stored point not in it is dropped. Charts read the downsampled curves on
+// the strategy document; this table keeps the full series.
+export const appendEquityPoints = mutation({
+  args: {
+    strategyId: v.string(),
+    points: v.array(equityPointValidator),
+    replace: v.optional(v.boolean()),
+  },
+  handler: async (ctx, args) => {
+    const dates = args.points.map((p) => p.date).sort();
+    const existing = args.replace
+      ? await ctx.db
+          .query("equityPoints")
+          .withIndex("by_strategy_date", (q) => q.eq("strategyId", args.strategyId))
+          .collect()
+      : dates.length
+        ? await ctx.db
+            .query("equityPoints")
+            .withIndex("by_strategy_date", (q) =>
+              q.eq("strategyId", args.strategyId).gte("date", dates[0])
+            )
+            .collect()
+        : [];
+    const byDate = new Map(existing.map((p) => [p.date, p]));
+    for (const point of args.points) {
+      const current = byDate.get(point.date);
+      if (!current) {
+        await ctx.db.insert("equityPoints", {
+          strategyId: args.strategyId,
+          ...point,
+        });
+      } else if (current.value !== point.value) {
+        await ctx.db.patch(current._id, { value: point.value });
+      }
+    }
+    if (args.replace) {
+      const keep = new Set(dates);
+      for (const p of existing) {
+        if (!keep.has(p.date)) await ctx.db.delete(p._id);
+      }
+    }
+    return args.points.length;
+  },
+});
+
+export const getEquityPoints = query({
+  args: { strategyId: v.string(), since: v.optional(v.string()) },
+  handler: async (ctx, args) => {
+    return await ctx.db
+      .query("equityPoints")
+      .withIndex("by_strategy_date", (q) =>
+        args.since
+          ? q.eq("strategyId", args.strategyId).gte("date", args.since)
+          : q.eq("strategyId", args.strategyId)
+      )
+      .collect();
+  },
+});
+
 export const getStrategies = query({
   handler: async (ctx) => {
     const all = await ctx.db.query("tradingStrategies").collect();
@@ -55,33 +148,59 @@ export const getStrategies = query({
   },
 });
 
+const tradeFields = {
+  strategyId: v.string(),
+  date: v.string(),
+  timestamp: v.string(),
+  symbol: v.string(),
+  side: v.string(),
+  quantity: v.float64(),
+  price: v.float64(),
+  notional: v.optional(v.float64()),
+  fee: v.optional(v.float64()),
+  status: v.string(),
+};
+const tradeValidator = v.object(tradeFields);
+type Trade = Infer<typeof tradeValidator>;
+
+async function upsertTradeRow(ctx: MutationCtx, args: Trade) {
+  // Dedup by strategy+date+symbol+side
+  const existing = await ctx.db
+    .query("tradeLog")
+    .withIndex("by_strategy_date", (q) => q.eq("strategyId", args.strategyId).eq("date", args.date))
+    .collect();
+  const dup = existing.find(
+    (t) => t.symbol === args.symbol && t.side === args.side && Math.abs(t.quantity - args.quantity) < 0.0000001
+  );
+  if (dup) {
+    await ctx.db.patch(dup._id, { ...args, updatedAt: Date.now() });
+    return dup._id;
+  }
+  return await ctx.db.insert("tradeLog", { ...args, updatedAt: Date.now() });
+}
+
 export const upsertTrade = mutation({
-  args: {
-    strategyId: v.string(),
-    date: v.string(),
-    timestamp: v.string(),
-    symbol: v.string(),
-    side: v.string(),
-    quantity: v.float64(),
-    price: v.float64(),
-    notional: v.optional(v.float64()),
-    fee: v.optional(v.float64()),
-    status: v.string(),
+  args: tradeFields,
+  handler: async (ctx, args) => {
+    await upsertTradeRow(ctx, args);
   },
+});
+
+// Bulk variant used by the sync script — one round trip per batch of fills.
+// Returns one result per row, in order.
+export const upsertTrades = mutation({
+  args: { rows: v.array(tradeValidator) },
   handler: async (ctx, args) => {
-    // Dedup by strategy+date+symbol+side
-    const existing = await ctx.db
-      .query("tradeLog")
-      .withIndex("by_strategy_date", (q) => q.eq("strategyId", args.strategyId).eq("date", args.date))
-      .collect();
-    const dup = existing.find(
-      (t) => t.symbol === args.symbol && t.side === args.side && Math.abs(t.quantity - args.quantity) < 0.0000001
-    );
-    if (dup) {
-      await ctx.db.patch(dup._id, { ...args, updatedAt: Date.now() });
-    } else {
-      await ctx.db.insert("tradeLog", { ...args, updatedAt: Date.now() });
+    const results = [];
+    for (const row of args.rows) {
+      try {
+        const id = await upsertTradeRow(ctx, row);
+        results.push({ ok: true, id });
+      } catch (e) {
+        results.push({ ok: false, error: String(e) });
+      }
     }
+    return results;
   },
 });
 
@@ -1,28 +1,70 @@
-import { mutation, query } from "./_generated/server";
-import { v } from "convex/values";
+import { mutation, query, MutationCtx } from "./_generated/server";
+import { paginationOptsValidator } from "convex/server";
+import { v, Infer } from "convex/values";
+import { chunkValidator, loadChunkedText, putChunkRows } from "./chunks";
+
+const weeklyReportFields = {
+  domain: v.string(),
+  reportDate: v.string(),
+  title: v.string(),
+  summary: v.optional(v.string()),
+  sourcePath: v.optional(v.string()),
+  content: v.optional(v.string()),
+  contentChunks: v.optional(v.array(v.string())),
+};
+const weeklyReportValidator = v.object(weeklyReportFields);
+type WeeklyReport = Infer<typeof weeklyReportValidator>;
+
+async function upsertWeeklyReportRow(ctx: MutationCtx, args: WeeklyReport) {
+  const existing = await ctx.db
+    .query("weeklyReports")
+    .withIndex("by_domain_date", (q) =>
+      q.eq("domain", args.domain).eq("reportDate", args.reportDate)
+    )
+    .first();
+  const data = { ...args, updatedAt: Date.now() };
+  if (existing) {
+    // A report moves between inline and chunked content as it grows;
+    // clear whichever form the new version does not use.
+    await ctx.db.patch(existing._id, {
+      content: undefined,
+      contentChunks: undefined,
+      ...data,
+    });
+    return existing._id;
+  }
+  return await ctx.db.insert("weeklyReports", data);
+}
 
 export const upsertWeeklyReport = mutation({
-  args: {
-    domain: v.string(),
-    reportDate: v.string(),
-    title: v.string(),
-    summary: v.optional(v.string()),
-    sourcePath: v.optional(v.string()),
-    content: v.optional(v.string()),
+  args: weeklyReportFields,
+  handler: async (ctx, args) => {
+    await upsertWeeklyReportRow(ctx, args);
   },
+});
+
+// Content chunks of weekly reports. Living in this module puts them on the
+// same ordered sync lane as the reports, so a report's chunks land first.
+export const putReportChunks = mutation({
+  args: { rows: v.array(chunkValidator) },
   handler: async (ctx, args) => {
-    const existing = await ctx.db
-      .query("weeklyReports")
-      .withIndex("by_domain_date", (q) =>
-        q.eq("domain", args.domain).eq("reportDate", args.reportDate)
-      )
-      .first();
-    const data = { ...args, updatedAt: Date.now() };
-    if (existing) {
-      await ctx.db.patch(existing._id, data);
-    } else {
-      await ctx.db.insert("weeklyReports", data);
+    return await putChunkRows(ctx, args.rows);
+  },
+});
+
+export const upsertWeeklyReports = mutation({
+  args: { rows: v.array(weeklyReportValidator) },
+  handler: async (ctx, args) => {
+    const results = [];
+    for (const row of args.rows) {
+      try {
+        const id = await upsertWeeklyReportRow(ctx, row);
+        results.push({ ok: true, id });
+      } catch (e) {
+        results.push({ ok: false, error: String(e) });
+      }
     }
+    return results;
   },
 });
 
@@ -44,9 +86,45 @@ export const getWeeklyReports = query({
   },
 });
 
+// Oldest first, one page at a time; for migrations and other full scans.
+export const listWeeklyReportsPage = query({
+  args: { paginationOpts: paginationOptsValidator },
+  handler: async (ctx, args) => {
+    const result = await ctx.db
+      .query("weeklyReports")
+      .order("asc")
+      .paginate(args.paginationOpts);
+    // Migrations copy the body, so hand out chunked reports reassembled.
+    const page = await Promise.all(
+      result.page.map(async (report) =>
+        report.contentChunks
+          ? {
+              ...report,
+              content: (await loadChunkedText(ctx, report.contentChunks)).text,
+            }
+          : report
+      )
+    );
+    return { ...result, page };
+  },
+});
+
 export const getWeeklyReport = query({
   args: { id: v.id("weeklyReports") },
   handler: async (ctx, args) => {
     return await ctx.db.get(args.id);
   },
 });
+
+// Full report body, reassembled from chunks when it was stored chunked.
+export const getWeeklyReportContent = query({
+  args: { id: v.id("weeklyReports") },
+  handler: async (ctx, args) => {
+    const report = await ctx.db.get(args.id);
+    if (!report) return null;
+    if (!report.contentChunks) {
+      return { text: report.content ?? "", complete: true };
+    }
+    return await loadChunkedText(ctx, report.contentChunks);
+  },
+});
@@ -0,0 +1,738 @@
+#!/usr/bin/env python3
+"""Benchmark sync-to-convex.py against synthetic fixtures.
+
+Builds a quark.db, a quantbox-live git repo and a trade_history tree at a
+few scales, then times every syncer (cold and with warm change-detection
+state) plus a full ``main()`` run against an in-process sink that stands in
+for Convex and the API bridge. Results can be saved as a baseline and later
+runs compared against it.
+
+    python3 scripts/bench-sync.py --scales small,medium --save-baseline
+    python3 scripts/bench-sync.py --compare
+"""
+
+import io
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import threading
+import subprocess
+import contextlib
+import importlib.util
+import http.server
+from datetime import date, timedelta
+
+_spec = importlib.util.spec_from_file_location(
+    "sync_to_convex", os.path.join(os.path.dirname(__file__), "sync-to-convex.py")
+)
+sync = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sync)
+
+BASELINE_PATH = os.path.join(sync.WORKSPACE, "data", "mc_bench_baseline.json")
+
+# name -> years of history; artifacts and trade days scale with it.
+SCALES = {"small": 1, "medium": 3, "large": 5}
+
+SYNCERS = [
+    sync.sync_health,
+    sync.sync_tes,
+    sync.sync_weed,
+    sync.sync_trading,
+    sync.sync_meal_log,
+    sync.sync_meals,
+    sync.sync_chef_daily_brief,
+    sync.sync_cron,
+    sync.sync_trade_log,
+    sync.sync_activities,
+    sync.sync_daily_briefs,
+    sync.sync_weekly_reports,
+]
+
+DOMAINS = ["chef", "coach", "marco", "qq"]
+MEAL_TYPES = ["breakfast", "lunch", "dinner"]
+PAPER_STRATEGIES = ["carver_trend_n10", "momentum_x", "mean_rev"]
+
+
+# --- Fixtures ---------------------------------------------------------------
+
+
+def _build_quark(path: str, days: int, today: date, rnd: random.Random):
+    db = sqlite3.connect(path)
+    db.executescript(
+        """
+        CREATE TABLE character(key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE xp_log(id INTEGER PRIMARY KEY, date TEXT, xp INTEGER, reason TEXT);
+        CREATE TABLE weed_log(id INTEGER PRIMARY KEY, date TEXT, used INTEGER);
+        CREATE TABLE meals(id INTEGER PRIMARY KEY, date TEXT, meal_type TEXT, name TEXT,
+            kcal REAL, protein REAL, carbs REAL, fat REAL, sat_fat REAL, fiber REAL);
+        CREATE TABLE weekly_plans(id INTEGER PRIMARY KEY, domain TEXT, week_start TEXT,
+            plan TEXT, summary TEXT);
+        CREATE TABLE daily_briefs(id INTEGER PRIMARY KEY, domain TEXT, date TEXT,
+            metrics TEXT, plan_today TEXT, actual TEXT, delta TEXT, adjustment TEXT,
+            alert TEXT);
+        CREATE TABLE weekly_reports(id INTEGER PRIMARY KEY, domain TEXT, week_start TEXT,
+            title TEXT, summary TEXT, content TEXT);
+        """
+    )
+    db.executemany(
+        "INSERT INTO character VALUES (?, ?)",
+        [
+            ("overall_level", str(days // 30)),
+            ("total_xp", str(days * 40)),
+            ("badges_earned", json.dumps([f"badge_{i}" for i in range(days // 90)])),
+        ],
+    )
+    for i in range(days):
+        d = (today - timedelta(days=days - 1 - i)).isoformat()
+        db.executemany(
+            "INSERT INTO xp_log(date, xp, reason) VALUES (?, ?, ?)",
+            [(d, rnd.randint(5, 50), "habit") for _ in range(rnd.randint(2, 6))],
+        )
+        db.execute(
+            "INSERT INTO weed_log(date, used) VALUES (?, ?)", (d, rnd.random() < 0.2)
+        )
+        meals = []
+        for mt in MEAL_TYPES:
+            kcal = rnd.randint(300, 900)
+            meals.append({"type": mt, "name": f"{mt} {i % 17}", "kcal": kcal})
+            db.execute(
+                "INSERT INTO meals(date, meal_type, name, kcal, protein, carbs, fat,"
+                " sat_fat, fiber) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (d, mt, f"{mt} {i % 17}", kcal, kcal / 20, kcal / 8, kcal / 30, 4, 6),
+            )
+        totals = {"kcal": sum(m["kcal"] for m in meals)}
+        for domain in DOMAINS:
+            db.execute(
+                "INSERT INTO daily_briefs(domain, date, metrics, plan_today, actual,"
+                " delta, adjustment, alert) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    domain,
+                    d,
+                    json.dumps({"score": rnd.randint(40, 100)}),
+                    json.dumps({"meals": meals, "totals": totals}),
+                    json.dumps({"kcal": totals["kcal"] - rnd.randint(-200, 200)}),
+                    json.dumps({"kcal": rnd.randint(-200, 200)}),
+                    json.dumps({"reason": "synthetic"}),
+                    None,
+                ),
+            )
+        if i % 7 == 0:
+            plan = {
+                day: {"meals": meals, "totals": totals}
+                for day in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+            }
+            db.execute(
+                "INSERT INTO weekly_plans(domain, week_start, plan, summary)"
+                " VALUES ('chef', ?, ?, 'synthetic plan')",
+                (d, json.dumps(plan)),
+            )
+            for domain in DOMAINS:
+                body = "\n".join(
+                    f"- {domain} note {k}: {rnd.random():.6f}"
+                    for k in range(rnd.randint(50, 250))
+                )
+                db.execute(
+                    "INSERT INTO weekly_reports(domain, week_start, title, summary,"
+                    " content) VALUES (?, ?, ?, ?, ?)",
+                    (domain, d, f"{domain} week {d}", "synthetic", f"# {d}\n{body}"),
+                )
+    db.commit()
+    db.close()
+
+
+_CARVER_MD = """# Carver Trend v1 — {date}
+| Portfolio (post) | ${equity:,.2f} |
+| PnL | ${pnl:,.2f} ({pct:+.2f}%) |
+| Sharpe | {sharpe:.2f} |
+| Max Drawdown | -{dd:.1f}% |
+
+{curve}
+
+## Position Reconciliation
+| Symbol | Target Wt | Actual Wt | Drift | Notional | Unrealized PnL |
+|---|---|---|---|---|---|
+| BTC | 40.0% | 39.0% | -1.0% | $4,000 | $120 |
+| ETH | 30.0% | 31.0% | 1.0% | $3,100 | -$40 |
+"""
+
+
+def _fast_import(repo: str, days: int, today: date, rnd: random.Random):
+    """Write the three quantbox-live branches with one ``git fast-import``."""
+    out = io.BytesIO()
+
+    def blob(path: str, data: bytes):
+        out.write(b"M 100644 inline %s\ndata %d\n" % (path.encode(), len(data)))
+        out.write(data + b"\n")
+
+    def commit(ref: str, files):
+        out.write(b"commit %s\n" % ref.encode())
+        out.write(b"committer bench <bench@localhost> 1700000000 +0000\n")
+        out.write(b"data 5\nbench\n")
+        for path, data in files:
+            blob(path, data)
+        out.write(b"\n")
+
+    equity = 10000.0
+    carver = []
+    for i in range(min(days, 30)):
+        d = (today - timedelta(days=min(days, 30) - 1 - i)).isoformat()
+        equity *= 1 + rnd.gauss(0.0005, 0.01)
+        curve = "\n".join(
+            f"  {(today - timedelta(days=k)).isoformat()} | ${equity - k * 10:,.0f}"
+            for k in range(10, 0, -1)
+        )
+        md = _CARVER_MD.format(
+            date=d,
+            equity=equity,
+            pnl=equity - 10000,
+            pct=(equity / 10000 - 1) * 100,
+            sharpe=rnd.uniform(0.5, 2),
+            dd=rnd.uniform(1, 10),
+            curve=curve,
+        )
+        carver.append((f"reports/{d}.md", md.encode()))
+    commit("refs/heads/main", carver)
+
+    artifacts = []
+    value = 1000.0
+    for i in range(days):
+        d = (today - timedelta(days=days - i)).isoformat()
+        value *= 1 + rnd.gauss(0.0003, 0.012)
+        payload = {
+            "report_date": d,
+            "payload": {
+                "portfolio_value": round(value, 2),
+                "periods": {"CTD": {"pnl_usdc": round(value - 1000, 2), "twr_pct": 1}},
+                "risk": {"portfolio": {"sharpe_ratio": 1.1, "max_drawdown": -0.1}},
+                "asset_allocation": {"holdings": [1, 2, 3], "invested_pct": 80},
+            },
+        }
+        artifacts.append(
+            (f"performance/artifacts/{d}/artifact.json", json.dumps(payload).encode())
+        )
+    commit("refs/heads/quantlab-binance", artifacts)
+
+    paper = []
+    for i in range(min(days, 90)):
+        d = (today - timedelta(days=min(days, 90) - i)).isoformat()
+        for sid in PAPER_STRATEGIES:
+            perf = {
+                "equity_usdc": 10000 + i * 3,
+                "cumulative_pnl_usdc": i * 3,
+                "periods": {"1D": {"return_pct": rnd.gauss(0, 1)}},
+                "risk_metrics": {"sharpe": 1, "max_drawdown": -0.05, "win_rate": 0.5},
+                "equity_curve": [
+                    {
+                        "date": (today - timedelta(days=k)).isoformat(),
+                        "equity": 10000 + k,
+                    }
+                    for k in range(i, -1, -1)
+                ],
+            }
+            paper.append(
+                (f"reports/{d}/performance_{sid}.json", json.dumps(perf).encode())
+            )
+    commit("refs/heads/paper", paper)
+
+    subprocess.run(
+        ["git", "-C", repo, "fast-import", "--quiet"],
+        input=out.getvalue(),
+        check=True,
+    )
+    for branch in ("main", "quantlab-binance", "paper"):
+        subprocess.run(
+            [
+                "git",
+                "-C",
+                repo,
+                "update-ref",
+                f"refs/remotes/origin/{branch}",
+                f"refs/heads/{branch}",
+            ],
+            check=True,
+        )
+    subprocess.run(["git", "-C", repo, "checkout", "-q", "-f", "main"], check=True)
+
+
+def build_fixtures(root: str, years: int, seed: int = 42) -> dict:
+    """Create a synthetic home + workspace under ``root`` and return its paths."""
+    rnd = random.Random(seed)
+    days = years * 365
+    today = date.today()
+    home = os.path.join(root, "home")
+    data = os.path.join(root, "workspace", "data")
+    repo = os.path.join(home, ".openclaw", "repos", "quantbox-live")
+    os.makedirs(data, exist_ok=True)
+    os.makedirs(os.path.join(home, ".openclaw", "cron"), exist_ok=True)
+
+    _build_quark(os.path.join(data, "quark.db"), days, today, rnd)
+
+    subprocess.run(["git", "init", "-q", "-b", "main", repo], check=True)
+    _fast_import(repo, days, today, rnd)
+
+    for i in range(days):
+        d = (today - timedelta(days=i)).isoformat()
+        day_dir = os.path.join(repo, "reports", d)
+        os.makedirs(day_dir, exist_ok=True)
+        trades = [
+            {
+                "status": "FILLED",
+                "symbol": f"SYM{j}",
+                "action": rnd.choice(["BUY", "SELL"]),
+                "quantity": rnd.randint(1, 50),
+                "executed_price": round(rnd.uniform(5, 500), 2),
+                "fee": 0.1,
+            }
+            for j in range(rnd.randint(5, 20))
+        ]
+        with open(os.path.join(day_dir, "trade_history.json"), "w") as f:
+            json.dump({"timestamp": f"{d}T01:00:00Z", "trades": trades}, f)
+
+    jobs = [
+        {
+            "id": f"job-{i}",
+            "name": f"job {i}",
+            "enabled": True,
+            "schedule": {"kind": "every", "everyMs": 3600000 * (i + 1)},
+            "state": {"lastStatus": "ok", "lastRunAtMs": 1700000000000 + i},
+        }
+        for i in range(25)
+    ]
+    with open(os.path.join(home, ".openclaw", "cron", "jobs.json"), "w") as f:
+        json.dump({"version": 1, "jobs": jobs}, f)
+
+    return {"home": home, "data": data, "days": days}
+
+
+def _garmin_payloads(today: date) -> dict:
+    week = [(today - timedelta(days=k)).isoformat() for k in range(6, -1, -1)]
+    return {
+        "/garmin/today": {
+            "date": week[-1],
+            "last_sync": f"{week[-1]}T06:00:00",
+            "daily": {"totalSteps": 8000},
+        },
+        "/garmin/data": {
+            "daily": [
+                {
+                    "calendarDate": d,
+                    "totalSteps": 7000 + i * 100,
+                    "restingHeartRate": 52,
+                }
+                for i, d in enumerate(week)
+            ],
+            "sleep": [
+                {"dailySleepDTO": {"calendarDate": d, "sleepTimeSeconds": 27000}}
+                for d in week
+            ],
+            "hrv": [
+                {"hrvSummary": {"calendarDate": d, "lastNightAvg": 60}} for d in week
+            ],
+            "training_readiness": [{"calendarDate": d, "score": 70} for d in week],
+        },
+        "/garmin/activities": [
+            {
+                "activityName": f"Run {i}",
+                "activityType": {"typeKey": "running"},
+                "startTimeLocal": f"{d} 07:00:00",
+                "duration": 1800,
+                "calories": 400,
+                "distance": 5000,
+            }
+            for i, d in enumerate(week)
+        ],
+    }
+
+
+# --- Sink -------------------------------------------------------------------
+
+
+class Sink(http.server.ThreadingHTTPServer):
+    """Accepts every Convex mutation and serves canned API-bridge responses."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SinkHandler)
+        self.garmin = _garmin_payloads(date.today())
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.mutations = 0
+            self.rows = 0
+            self.bytes = 0
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {"mutations": self.mutations, "rows": self.rows, "bytes": self.bytes}
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _SinkHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, obj):
+        body = json.dumps(obj).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(self.server.garmin.get(self.path.split("?")[0]))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/api/ingest":
+            lines = gzip.decompress(body).splitlines()
+            with self.server.lock:
+                self.server.mutations += 1
+                self.server.rows += len(lines)
+                self.server.bytes += len(body)
+            return self._reply({"results": [{"ok": True}] * len(lines)})
+        args = json.loads(body).get("args", {})
+        rows = args.get("rows")
+        with self.server.lock:
+            self.server.mutations += 1
+            self.server.rows += len(rows) if rows is not None else 1
+            self.server.bytes += len(body)
+        if rows is not None:
+            value = [{"ok": True, "id": f"bench:{i}"} for i in range(len(rows))]
+        elif "hashes" in args:
+            value = args["hashes"]  # chunks:missingChunks — the sink keeps none
+        else:
+            value = "bench:0"
+        self._reply({"status": "success", "value": value})
+
+
+# --- Runner -----------------------------------------------------------------
+
+
+def _point_sync_at(fx: dict, sink: Sink):
+    os.environ["HOME"] = fx["home"]
+    sync.CONVEX_URL = sink.url
+    sync.API_BRIDGE_URL = sink.url
+    sync.QUARK_DB = os.path.join(fx["data"], "quark.db")
+    sync.STATE_PATH = os.path.join(fx["data"], "mc_sync_state.db")
+    sync.LEGACY_STATE_PATH = os.path.join(fx["data"], "mc_sync_state.json")
+    sync.PARSE_CACHE_PATH = os.path.join(fx["data"], "mc_parse_cache.json")
+    sync.METRICS_PATH = os.path.join(fx["data"], "mc_sync_metrics.json")
+    sync.METRICS_PROM_PATH = os.path.join(fx["data"], "mc_sync.prom")
+    sync.OUTBOX_PATH = os.path.join(fx["data"], "mc_outbox.db")
+
+
+def _fresh_caches(fx: dict):
+    """Drop everything a cold run should not inherit."""
+    if sync._state_store is not None:
+        sync._state_store.close()
+        sync._state_store = None
+    for d in sync.deployments():
+        d.close()
+    paths = [sync.STATE_PATH] + [d.outbox_path for d in sync.deployments()]
+    for p in paths:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(p + suffix):
+                os.remove(p + suffix)
+    sync._parse_cache = sync.ParseCache()
+
+
+def _measure(sink: Sink, fn, verbose: bool) -> dict:
+    """Time ``fn`` and count what it sent to ``sink``.
+
+    ``exit`` is the code ``fn`` exited with, 0 if it returned; main() exits
+    2 when a run's status is not ok.
+    """
+    sink.reset()
+    out = sys.stdout if verbose else io.StringIO()
+    started = time.perf_counter()
+    code = 0
+    try:
+        with contextlib.redirect_stdout(out):
+            fn()
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    finally:
+        sync.reset_quark_snapshot()
+        sync.API_BRIDGE.reset()
+    return {
+        "seconds": round(time.perf_counter() - started, 4),
+        "exit": code,
+        **sink.snapshot(),
+    }
+
+
+def _run_flushed(fn, state: dict):
+    """Run one syncer with the outboxes draining alongside, like main() does."""
+    flushers = [sync.OutboxFlusher(d).start() for d in sync.deployments()]
+    try:
+        fn(state)
+    finally:
+        for flusher in flushers:
+            flusher.stop()
+
+
+def _best(runs) -> dict:
+    """Fastest of ``runs``; the counters are identical across repeats."""
+    return min(runs, key=lambda r: r["seconds"])
+
+
+def bench_scale(
+    fx: dict, sink: Sink, repeat: int, workers: int, verbose: bool, fanout: int = 1
+):
+    _point_sync_at(fx, sink)
+    # Fan-out: N named deployments that all land on the sink.
+    targets = [f"d{i}={sink.url}" for i in range(fanout)] if fanout > 1 else []
+    sync.configure_deployments(",".join(targets))
+    results = {"syncers": {}, "main": {}}
+
+    for fn in SYNCERS:
+        cold, warm = [], []
+        for _ in range(repeat):
+            _fresh_caches(fx)
+            state = {}
+            cold.append(_measure(sink, lambda: _run_flushed(fn, state), verbose))
+            warm.append(_measure(sink, lambda: _run_flushed(fn, state), verbose))
+        results["syncers"][fn.__name__] = {"cold": _best(cold), "warm": _best(warm)}
+
+    argv = sys.argv
+    sys.argv = ["sync-to-convex.py", "--workers", str(workers)]
+    for target in targets:
+        sys.argv += ["--deployment", target]
+    try:
+        cold, warm = [], []
+        for _ in range(repeat):
+            _fresh_caches(fx)
+            cold.append(_measure(sink, sync.main, verbose))
+            warm.append(_measure(sink, sync.main, verbose))
+        results["main"] = {"cold": _best(cold), "warm": _best(warm)}
+    finally:
+        sys.argv = argv
+    return results
+
+
+def check_mid_run_write(fx: dict, sink: Sink) -> list:
+    """Problems if a quark.db write landing mid-run is never sent.
+
+    Another syncer takes the run's backup of quark.db, an agent then adds a
+    weekly report, and the weekly syncer runs on the backup. The row it
+    could not see must go out on the next run instead of being skipped as
+    unchanged.
+    """
+    _point_sync_at(fx, sink)
+    sync.configure_deployments("")
+    _fresh_caches(fx)
+    state = {}
+    db = sqlite3.connect(sync.QUARK_DB)
+    try:
+        _measure(sink, lambda: _run_flushed(sync.sync_weekly_reports, state), False)
+
+        def write_mid_run():
+            sync.quark_snapshot().execute("SELECT 1")
+            db.execute(
+                "INSERT INTO weekly_reports(domain, week_start, title, summary,"
+                " content) VALUES ('bench', '2099-01-05', 'late', 'late', '# late')"
+            )
+            db.commit()
+            _run_flushed(sync.sync_weekly_reports, state)
+
+        _measure(sink, write_mid_run, False)
+        after = _measure(
+            sink, lambda: _run_flushed(sync.sync_weekly_reports, state), False
+        )
+    finally:
+        db.execute("DELETE FROM weekly_reports WHERE domain = 'bench'")
+        db.commit()
+        db.close()
+    if not after["rows"]:
+        return ["weekly report written mid-run was never sent"]
+    return []
+
+
+def _fmt_bytes(n: int) -> str:
+    for unit in ("B", "K", "M"):
+        if n < 1024:
+            return f"{n:.0f}{unit}"
+        n /= 1024
+    return f"{n:.1f}G"
+
+
+def print_scale(name: str, years: int, res: dict):
+    print(f"📏 {name} ({years}y history)")
+    print(
+        f"  {'':24} {'cold s':>8} {'muts':>5} {'sent':>7}   {'warm s':>8} {'muts':>5} {'sent':>7}"
+    )
+    entries = list(res["syncers"].items()) + [("main()", res["main"])]
+    for label, r in entries:
+        c, w = r["cold"], r["warm"]
+        codes = {c.get("exit", 0), w.get("exit", 0)} - {0}
+        print(
+            f"  {label:24} {c['seconds']:8.3f} {c['mutations']:5d} {_fmt_bytes(c['bytes']):>7}"
+            f"   {w['seconds']:8.3f} {w['mutations']:5d} {_fmt_bytes(w['bytes']):>7}"
+            + (f"   ⚠ exit {','.join(map(str, sorted(codes)))}" if codes else "")
+        )
+    print()
+
+
+def compare(results: dict, baseline: dict, tolerance: float, floor: float) -> list:
+    """Regressions of ``results`` against ``baseline`` as printable lines.
+
+    Wall time regresses when it exceeds the baseline by more than
+    ``tolerance`` (relative) and ``floor`` seconds; mutation counts and bytes
+    sent regress on any relative increase beyond ``tolerance``.
+    """
+    problems = []
+    for scale, res in results.items():
+        base = baseline.get(scale)
+        if not base:
+            continue
+        entries = dict(res["syncers"], **{"main()": res["main"]})
+        base_entries = dict(base["syncers"], **{"main()": base["main"]})
+        for label, r in entries.items():
+            for phase in ("cold", "warm"):
+                b = (base_entries.get(label) or {}).get(phase)
+                if not b:
+                    continue
+                cur = r[phase]
+                if (
+                    cur["seconds"] > b["seconds"] * (1 + tolerance)
+                    and cur["seconds"] - b["seconds"] > floor
+                ):
+                    problems.append(
+                        f"{scale} {label} {phase}: {b['seconds']:.3f}s → {cur['seconds']:.3f}s"
+                    )
+                for metric in ("mutations", "bytes"):
+                    if cur[metric] > b[metric] * (1 + tolerance):
+                        problems.append(
+                            f"{scale} {label} {phase}: {metric} {b[metric]} → {cur[metric]}"
+                        )
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Convex sync.")
+    parser.add_argument(
+        "--scales",
+        default="small,medium",
+        help=f"Comma-separated subset of {','.join(SCALES)} (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per measurement; the fastest is kept (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=sync.SYNC_WORKERS,
+        help="Worker count for the main() run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_PATH,
+        help="Baseline file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Write results as the baseline"
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare against the baseline; exit 1 on regressions",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative slack before a change counts as a regression (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--keep", metavar="DIR", help="Build fixtures in DIR and keep them"
+    )
+    parser.add_argument(
+        "--deployments",
+        type=int,
+        default=1,
+        help="Fan out to this many deployments (default: %(default)s)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show syncer output")
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    root = args.keep or tempfile.mkdtemp(prefix="mc-bench-")
+    home = os.environ.get("HOME")
+    sink = Sink()
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+    results = {}
+    status = 0
+    try:
+        for name in scales:
+            years = SCALES[name]
+            started = time.monotonic()
+            fx = build_fixtures(os.path.join(root, name), years)
+            print(
+                f"🧪 {name}: built {fx['days']} days of fixtures in "
+                f"{time.monotonic() - started:.1f}s"
+            )
+            results[name] = bench_scale(
+                fx, sink, args.repeat, args.workers, args.verbose, args.deployments
+            )
+            print_scale(name, years, results[name])
+            for line in check_mid_run_write(fx, sink):
+                print(f"  ✗ {line}")
+                status = 1
+    finally:
+        sink.shutdown()
+        sync.HTTP.close()
+        if home is not None:
+            os.environ["HOME"] = home
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if args.compare:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ No usable baseline at {args.baseline}: {e}")
+            baseline = {}
+        problems = compare(results, baseline, args.tolerance, floor=0.02)
+        for line in problems:
+            print(f"  ✗ {line}")
+        if problems:
+            print(f"❌ {len(problems)} regression(s) vs {args.baseline}")
+            status = 1
+        elif baseline:
+            print(f"✅ No regressions vs {args.baseline}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
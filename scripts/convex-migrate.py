@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Resumable Convex table migrations: paginated reads, batched bulk writes.
+
+A migration reads its source with a paginated query (``{paginationOpts}`` in,
+``{page, isDone, continueCursor}`` out), maps each document through
+``transform`` and writes the results with a ``{rows: [...]}`` bulk mutation.
+The next page is read while the current one is written, and each page's
+batches go out concurrently. After every page the cursor and counters are
+checkpointed in the sync state store, per migration and target deployment,
+so an interrupted run picks up where it stopped and pointing ``CONVEX_URL``
+elsewhere starts afresh. Migration scripts load this file and call ``Migration(...).main()``:
+
+    migrate.Migration(
+        "weekly-to-reports",
+        source="weekly:listWeeklyReportsPage",
+        target="reports:upsertReports",
+        transform=to_report,
+    ).main()
+"""
+
+import os
+import sys
+import time
+import argparse
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+# Reuse the sync script's pooled HTTP client, retries and state store.
+_spec = importlib.util.spec_from_file_location(
+    "sync_to_convex", os.path.join(os.path.dirname(__file__), "sync-to-convex.py")
+)
+sync = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sync)
+
+PAGE_SIZE = int(os.environ.get("MC_MIGRATE_PAGE_SIZE", "500"))
+BATCH_SIZE = int(os.environ.get("MC_MIGRATE_BATCH_SIZE", "100"))
+WORKERS = int(os.environ.get("MC_MIGRATE_WORKERS", "4"))
+RETRIES = int(os.environ.get("MC_MIGRATE_RETRIES", "5"))
+MAX_LOGGED_ERRORS = 50
+
+
+def convex_call(kind: str, fn_name: str, args: dict):
+    """Run a Convex query or mutation and return its value; raise on errors."""
+    url = f"{sync.CONVEX_URL}/api/{kind}"
+    payload = {"path": fn_name, "args": args, "format": "json"}
+    result = sync.http_json("POST", url, payload, timeout=30, retries=RETRIES)
+    if result.get("status") != "success":
+        raise RuntimeError(f"{fn_name}: {result.get('errorMessage', result)}")
+    return result.get("value")
+
+
+class Migration:
+    """One source-to-target table migration with a persisted checkpoint.
+
+    ``transform`` maps a source document to a target row, or None to drop
+    it; ``key`` names a row in error reports. Rows the target rejects are
+    counted and logged in the checkpoint rather than stopping the run.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source: str,
+        target: str,
+        transform,
+        key=None,
+        page_size: int = PAGE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        workers: int = WORKERS,
+    ):
+        self.name = name
+        self.source = source
+        self.target = target
+        self.transform = transform
+        self.key = key or (lambda row: "?")
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.workers = workers
+
+    @property
+    def _key(self) -> str:
+        return f"{self.name}@{sync.CONVEX_URL}"
+
+    def checkpoint(self) -> dict:
+        """The saved checkpoint for this migration against ``CONVEX_URL``."""
+        return sync.state_store().get("migrations", self._key) or {}
+
+    def _save(self, cp: dict):
+        sync.state_store().save("migrations", {self._key: cp})
+
+    def _read(self, cursor):
+        opts = {"numItems": self.page_size, "cursor": cursor}
+        return convex_call("query", self.source, {"paginationOpts": opts})
+
+    def _write(self, rows: list):
+        results = convex_call("mutation", self.target, {"rows": rows}) or []
+        errors = [
+            {"key": self.key(row), "error": str(res.get("error"))[:200]}
+            for row, res in zip(rows, results)
+            if not res.get("ok")
+        ]
+        errors += [
+            {"key": self.key(row), "error": "no result"} for row in rows[len(results) :]
+        ]
+        return len(rows) - len(errors), errors
+
+    def run(self, restart: bool = False) -> dict:
+        """Migrate from the checkpoint (or the start) to the end of the source.
+
+        Returns the final checkpoint. Raises if a page cannot be read or
+        written; everything before that page stays checkpointed.
+        """
+        cp = {} if restart else self.checkpoint()
+        if cp.get("done"):
+            print(
+                f"✅ {self.name} already complete on {sync.CONVEX_URL} "
+                f"({cp['written']} rows) — --restart to redo"
+            )
+            return cp
+        cp = {
+            "cursor": cp.get("cursor"),
+            "pages": cp.get("pages", 0),
+            "read": cp.get("read", 0),
+            "written": cp.get("written", 0),
+            "failed": cp.get("failed", 0),
+            "errors": cp.get("errors", []),
+            "done": False,
+        }
+        if cp["pages"]:
+            print(
+                f"↪ Resuming {self.name} after page {cp['pages']} ({cp['read']} read)"
+            )
+
+        started = time.monotonic()
+        session = 0
+        reader = ThreadPoolExecutor(1)
+        writers = ThreadPoolExecutor(self.workers)
+        try:
+            next_page = reader.submit(self._read, cp["cursor"])
+            while True:
+                sync.RETRIES.reset()
+                page = next_page.result()
+                if not page["isDone"]:
+                    next_page = reader.submit(self._read, page["continueCursor"])
+
+                rows = [r for r in map(self.transform, page["page"]) if r is not None]
+                batches = [
+                    rows[i : i + self.batch_size]
+                    for i in range(0, len(rows), self.batch_size)
+                ]
+                for ok, errors in writers.map(self._write, batches):
+                    cp["written"] += ok
+                    cp["failed"] += len(errors)
+                    cp["errors"] = (cp["errors"] + errors)[-MAX_LOGGED_ERRORS:]
+
+                cp["cursor"] = page["continueCursor"]
+                cp["pages"] += 1
+                cp["read"] += len(page["page"])
+                cp["done"] = bool(page["isDone"])
+                cp["updatedAt"] = time.time()
+                self._save(cp)
+
+                session += len(page["page"])
+                elapsed = time.monotonic() - started
+                failed = f", {cp['failed']} failed" if cp["failed"] else ""
+                print(
+                    f"  ▸ page {cp['pages']}: {cp['read']} read, {cp['written']} written"
+                    f"{failed} — {session / max(elapsed, 1e-9):.0f} rows/s"
+                )
+                if cp["done"]:
+                    return cp
+        finally:
+            reader.shutdown(cancel_futures=True)
+            writers.shutdown(cancel_futures=True)
+
+    def main(self, argv=None):
+        parser = argparse.ArgumentParser(
+            description=f"Migrate {self.source} -> {self.target}."
+        )
+        parser.add_argument(
+            "--restart", action="store_true", help="Ignore the saved checkpoint"
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=self.page_size,
+            help="Source documents per page (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=self.batch_size,
+            help="Rows per bulk mutation (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=self.workers,
+            help="Concurrent bulk mutations (default: %(default)s)",
+        )
+        args = parser.parse_args(argv)
+        self.page_size = args.page_size
+        self.batch_size = args.batch_size
+        self.workers = args.workers
+
+        print(f"🚚 Migration {self.name}: {self.source} -> {self.target}")
+        print(f"   Convex: {sync.CONVEX_URL}")
+        started = time.monotonic()
+        try:
+            cp = self.run(restart=args.restart)
+        except Exception as e:
+            cp = self.checkpoint()
+            print(
+                f"⛔ Stopped after page {cp.get('pages', 0)} "
+                f"({cp.get('read', 0)} read): {e} — rerun to resume"
+            )
+            sys.exit(1)
+        finally:
+            sync.HTTP.close()
+
+        elapsed = time.monotonic() - started
+        print(f"🔌 HTTP: {sync.HTTP.report()}")
+        for err in cp.get("errors", [])[-10:]:
+            print(f"  ⚠ {err['key']}: {err['error']}")
+        failed = f", {cp['failed']} failed" if cp.get("failed") else ""
+        print(
+            f"✅ Migration complete: {cp['written']} written{failed} "
+            f"from {cp['read']} documents ({elapsed:.1f}s)"
+        )
+        if cp.get("failed"):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    sys.exit("Load this from a migration script, e.g. migrate-weekly-to-reports.py")
@@ -0,0 +1,722 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Convex HTTP API, for offline load and latency tests.
+
+Speaks the ``/api/mutation`` and ``/api/query`` JSON protocol for the
+functions the sync and migration scripts call, plus the compressed NDJSON
+``/api/ingest`` HTTP action, keeping documents in memory
+with the indexes declared in ``convex/schema.ts``. Latency, jitter, error
+rate and a request rate limit can be dialled in to exercise retries,
+batching and concurrency:
+
+    python3 scripts/convex-standin.py --port 3210 --latency 40 --jitter 20 \\
+        --error-rate 0.02 --rate-limit 50
+    CONVEX_URL=http://127.0.0.1:3210 python3 scripts/sync-to-convex.py
+
+``GET /_standin/stats`` reports request counters and table sizes,
+``GET /_standin/tables/<name>`` dumps a table and ``POST /_standin/reset``
+clears everything.
+"""
+
+import sys
+import gzip
+import json
+import zlib
+import time
+import random
+import argparse
+import threading
+import http.server
+from collections import Counter
+
+# table -> {index name: fields}, mirroring convex/schema.ts.
+INDEXES = {
+    "healthSnapshots": {"by_date": ["date"]},
+    "healthAggregates": {"by_metric": ["metric"]},
+    "activities": {"by_date": ["date"]},
+    "tesCharacter": {},
+    "zioloTracker": {},
+    "tradingStrategies": {"by_strategyId": ["strategyId"]},
+    "equityPoints": {"by_strategy_date": ["strategyId", "date"]},
+    "cronJobs": {"by_jobId": ["jobId"]},
+    "mealLog": {"by_date": ["date"]},
+    "mealPlan": {"by_weekLabel": ["weekLabel"]},
+    "agentStatus": {"by_agentId": ["agentId"]},
+    "weeklyReports": {
+        "by_domain_date": ["domain", "reportDate"],
+        "by_reportDate": ["reportDate"],
+    },
+    "reportChunks": {"by_hash": ["hash"]},
+    "tradeLog": {
+        "by_date": ["date"],
+        "by_strategy_date": ["strategyId", "date"],
+    },
+    "dailyAdjustedMeals": {
+        "by_date": ["date"],
+        "by_domain_date": ["domain", "date"],
+    },
+    "dailyBriefs": {
+        "by_date": ["date"],
+        "by_domain_date": ["domain", "date"],
+    },
+    "feedItems": {
+        "by_createdAt": ["createdAt"],
+        "by_category": ["category", "createdAt"],
+        "by_read": ["read", "createdAt"],
+    },
+    "reports": {
+        "by_reportId": ["reportId"],
+        "by_agent_date": ["agent", "date"],
+        "by_type_date": ["reportType", "date"],
+        "by_date": ["date"],
+    },
+}
+
+
+class FunctionError(Exception):
+    """Raised by a handler; reported as ``{"status": "error"}`` like Convex."""
+
+
+class Store:
+    """In-memory tables with prefix-lookup indexes.
+
+    Each index keeps one map per prefix length, so ``q.eq("a", x)`` and
+    ``q.eq("a", x).eq("b", y)`` are both a single dict lookup.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.tables = {name: {} for name in INDEXES}
+            self.indexes = {
+                (table, name): [{} for _ in fields]
+                for table, idx in INDEXES.items()
+                for name, fields in idx.items()
+            }
+            self.next_id = 0
+
+    def _index_keys(self, table: str, doc: dict):
+        for name, fields in INDEXES[table].items():
+            key = tuple(doc.get(f) for f in fields)
+            for n, prefix_map in enumerate(self.indexes[(table, name)]):
+                yield prefix_map, key[: n + 1]
+
+    def _link(self, table: str, doc: dict):
+        for prefix_map, key in self._index_keys(table, doc):
+            prefix_map.setdefault(key, {})[doc["_id"]] = None
+
+    def _unlink(self, table: str, doc: dict):
+        for prefix_map, key in self._index_keys(table, doc):
+            ids = prefix_map.get(key)
+            if ids is not None:
+                ids.pop(doc["_id"], None)
+                if not ids:
+                    del prefix_map[key]
+
+    def insert(self, table: str, fields: dict) -> str:
+        self.next_id += 1
+        doc = dict(fields)
+        doc["_id"] = f"{table}:{self.next_id}"
+        doc["_creationTime"] = time.time() * 1000
+        self.tables[table][doc["_id"]] = doc
+        self._link(table, doc)
+        return doc["_id"]
+
+    def patch(self, doc_id: str, fields: dict):
+        table = doc_id.split(":", 1)[0]
+        doc = self.tables[table][doc_id]
+        self._unlink(table, doc)
+        doc.update(fields)
+        self._link(table, doc)
+
+    def replace(self, doc_id: str, fields: dict):
+        table = doc_id.split(":", 1)[0]
+        doc = self.tables[table][doc_id]
+        self._unlink(table, doc)
+        system = {k: doc[k] for k in ("_id", "_creationTime")}
+        doc.clear()
+        doc.update(fields, **system)
+        self._link(table, doc)
+
+    def delete(self, doc_id: str):
+        table = doc_id.split(":", 1)[0]
+        doc = self.tables[table].pop(doc_id)
+        self._unlink(table, doc)
+
+    def query(self, table: str, index=None, *values, desc=False) -> list:
+        """Documents of ``table`` matching an index prefix, in index order."""
+        if index is None:
+            docs = list(self.tables[table].values())
+            return docs[::-1] if desc else docs
+        fields = INDEXES[table][index]
+        if values:
+            ids = self.indexes[(table, index)][len(values) - 1].get(tuple(values), {})
+            docs = [self.tables[table][i] for i in ids]
+        else:
+            docs = list(self.tables[table].values())
+        docs.sort(
+            # Missing fields sort first, as undefined does in Convex.
+            key=lambda d: tuple((d.get(f) is not None, d.get(f)) for f in fields)
+            + (d["_creationTime"],),
+            reverse=desc,
+        )
+        return docs
+
+    def first(self, table: str, index=None, *values):
+        docs = self.query(table, index, *values)
+        return docs[0] if docs else None
+
+    def upsert(self, table: str, index, values, data: dict) -> str:
+        """Patch the first document matching ``index == values`` or insert."""
+        existing = self.first(table, index, *values) if index else self.first(table)
+        if existing:
+            self.patch(existing["_id"], data)
+            return existing["_id"]
+        return self.insert(table, data)
+
+
+# --- Functions --------------------------------------------------------------
+
+
+def _now_ms() -> float:
+    return time.time() * 1000
+
+
+def _require(args: dict, *names):
+    missing = [n for n in names if n not in args]
+    if missing:
+        raise FunctionError(f"ArgumentValidationError: missing {', '.join(missing)}")
+
+
+def _keyed(table: str, index: str):
+    """Upsert handler for ``table`` keyed by ``index``, like upsertXRow."""
+    fields = INDEXES[table][index]
+
+    def handler(store: Store, args: dict):
+        _require(args, *fields)
+        data = dict(args, updatedAt=_now_ms())
+        return store.upsert(table, index, [args[f] for f in fields], data)
+
+    return handler
+
+
+def _replacer(table: str, index: str):
+    """Like ``_keyed``, but an existing document is replaced, not patched."""
+    fields = INDEXES[table][index]
+
+    def handler(store: Store, args: dict):
+        _require(args, *fields)
+        data = dict(args, updatedAt=_now_ms())
+        existing = store.first(table, index, *[args[f] for f in fields])
+        if existing:
+            store.replace(existing["_id"], data)
+            return existing["_id"]
+        return store.insert(table, data)
+
+    return handler
+
+
+def _patcher(table: str, index: str):
+    """Patch handler: changed fields plus ``unset``; the document must exist."""
+    fields = INDEXES[table][index]
+
+    def handler(store: Store, args: dict):
+        _require(args, *fields)
+        data = dict(args, updatedAt=_now_ms())
+        unset = data.pop("unset", None) or []
+        existing = store.first(table, index, *[args[f] for f in fields])
+        if existing is None:
+            raise FunctionError(f"{table} {args[fields[0]]} not found")
+        for field in unset:
+            existing.pop(field, None)
+        store.patch(existing["_id"], data)
+        return existing["_id"]
+
+    return handler
+
+
+def _singleton(table: str):
+    def handler(store: Store, args: dict):
+        store.upsert(table, None, [], dict(args, updatedAt=_now_ms()))
+
+    return handler
+
+
+def _bulk(handler):
+    """The ``{rows: [...]}`` variant: one ``{ok, id}`` or ``{ok, error}`` per row."""
+
+    def bulk(store: Store, args: dict):
+        _require(args, "rows")
+        results = []
+        for row in args["rows"]:
+            try:
+                doc_id = handler(store, row)
+                results.append({"ok": True, "id": doc_id})
+            except FunctionError as e:
+                results.append({"ok": False, "error": str(e)})
+        return results
+
+    return bulk
+
+
+def _upsert_trade(store: Store, args: dict):
+    _require(args, "strategyId", "date", "symbol", "side", "quantity")
+    existing = store.query(
+        "tradeLog", "by_strategy_date", args["strategyId"], args["date"]
+    )
+    for t in existing:
+        if (
+            t["symbol"] == args["symbol"]
+            and t["side"] == args["side"]
+            and abs(t["quantity"] - args["quantity"]) < 0.0000001
+        ):
+            store.patch(t["_id"], dict(args, updatedAt=_now_ms()))
+            return t["_id"]
+    return store.insert("tradeLog", dict(args, updatedAt=_now_ms()))
+
+
+def _append_equity_points(store: Store, args: dict):
+    _require(args, "strategyId", "points")
+    sid = args["strategyId"]
+    existing = {
+        p["date"]: p for p in store.query("equityPoints", "by_strategy_date", sid)
+    }
+    for point in args["points"]:
+        current = existing.get(point["date"])
+        if current is None:
+            store.insert("equityPoints", dict(point, strategyId=sid))
+        elif current["value"] != point["value"]:
+            store.patch(current["_id"], {"value": point["value"]})
+    if args.get("replace"):
+        keep = {p["date"] for p in args["points"]}
+        for date, doc in existing.items():
+            if date not in keep:
+                store.delete(doc["_id"])
+    return len(args["points"])
+
+
+def _sync_meal_log_day(store: Store, args: dict):
+    _require(args, "date", "meals")
+    for doc in store.query("mealLog", "by_date", args["date"]):
+        store.delete(doc["_id"])
+    now = _now_ms()
+    for meal in args["meals"]:
+        store.insert("mealLog", dict(meal, date=args["date"], updatedAt=now))
+
+
+def _insert_activity(store: Store, args: dict):
+    _require(args, "date", "type", "name")
+    store.insert("activities", args)
+
+
+def _upsert_report(store: Store, args: dict):
+    _require(args, "reportId")
+    return store.upsert(
+        "reports", "by_reportId", [args["reportId"]], dict(args, createdAt=_now_ms())
+    )
+
+
+def _upsert_weekly_report(store: Store, args: dict):
+    _require(args, "domain", "reportDate")
+    existing = store.first(
+        "weeklyReports", "by_domain_date", args["domain"], args["reportDate"]
+    )
+    data = dict(args, updatedAt=_now_ms())
+    if existing:
+        existing.pop("content", None)
+        existing.pop("contentChunks", None)
+        store.patch(existing["_id"], data)
+        return existing["_id"]
+    return store.insert("weeklyReports", data)
+
+
+def _put_chunk(store: Store, args: dict):
+    _require(args, "hash", "text")
+    existing = store.first("reportChunks", "by_hash", args["hash"])
+    return existing["_id"] if existing else store.insert("reportChunks", args)
+
+
+def _missing_chunks(store: Store, args: dict):
+    return [h for h in args["hashes"] if not store.first("reportChunks", "by_hash", h)]
+
+
+def _get_weekly_report_content(store: Store, args: dict):
+    report = store.tables["weeklyReports"].get(args.get("id"))
+    if report is None:
+        return None
+    return _load_chunked_text(store, report)
+
+
+def _with_weekly_content(store: Store, report: dict):
+    if "contentChunks" not in report:
+        return report
+    return dict(report, content=_load_chunked_text(store, report)["text"])
+
+
+def _load_chunked_text(store: Store, report: dict):
+    if "contentChunks" not in report:
+        return {"text": report.get("content", ""), "complete": True}
+    chunks = [
+        store.first("reportChunks", "by_hash", h) for h in report["contentChunks"]
+    ]
+    return {
+        "text": "".join(c["text"] for c in chunks if c),
+        "complete": all(chunks),
+    }
+
+
+def _get_weekly_reports(store: Store, args: dict):
+    if args.get("domain"):
+        return store.query("weeklyReports", "by_domain_date", args["domain"], desc=True)
+    return store.query("weeklyReports", "by_reportDate", desc=True)
+
+
+def _paginate(table: str, expand=None):
+    """A ``.order("asc").paginate()`` query; the cursor is the last doc's id.
+
+    ``expand`` maps each page document before it is returned.
+    """
+
+    def handler(store: Store, args: dict):
+        _require(args, "paginationOpts")
+        opts = args["paginationOpts"]
+        after = int(opts["cursor"]) if opts.get("cursor") else 0
+        docs = [d for d in store.query(table) if int(d["_id"].split(":")[1]) > after]
+        page = docs[: opts["numItems"]]
+        cursor = page[-1]["_id"].split(":")[1] if page else str(after)
+        return {
+            "page": [expand(store, d) for d in page] if expand else page,
+            "isDone": len(page) == len(docs),
+            "continueCursor": cursor,
+        }
+
+    return handler
+
+
+MUTATIONS = {
+    "health:upsertHealth": _keyed("healthSnapshots", "by_date"),
+    "activities:upsertActivity": _insert_activity,
+    "tes:upsertTes": _singleton("tesCharacter"),
+    "ziolo:upsertZiolo": _singleton("zioloTracker"),
+    "trading:upsertStrategy": _keyed("tradingStrategies", "by_strategyId"),
+    "trading:patchStrategy": _patcher("tradingStrategies", "by_strategyId"),
+    "trading:appendEquityPoints": _append_equity_points,
+    "trading:upsertTrade": _upsert_trade,
+    "meals:syncMealLog": _sync_meal_log_day,
+    "meals:upsertMealPlan": _keyed("mealPlan", "by_weekLabel"),
+    "meals:upsertDailyMeals": _keyed("dailyAdjustedMeals", "by_domain_date"),
+    "briefs:upsertDailyBrief": _keyed("dailyBriefs", "by_domain_date"),
+    "cron:upsertCronJob": _keyed("cronJobs", "by_jobId"),
+    "weekly:upsertWeeklyReport": _upsert_weekly_report,
+    "chunks:putChunk": _put_chunk,
+    "reports:upsertReport": _upsert_report,
+}
+MUTATIONS.update(
+    {
+        "health:upsertHealthSnapshots": _bulk(MUTATIONS["health:upsertHealth"]),
+        "health:upsertHealthAggregates": _bulk(
+            _replacer("healthAggregates", "by_metric")
+        ),
+        "trading:upsertTrades": _bulk(MUTATIONS["trading:upsertTrade"]),
+        "meals:syncMealLogs": _bulk(MUTATIONS["meals:syncMealLog"]),
+        "briefs:upsertDailyBriefs": _bulk(MUTATIONS["briefs:upsertDailyBrief"]),
+        "cron:upsertCronJobs": _bulk(MUTATIONS["cron:upsertCronJob"]),
+        "cron:patchCronJobs": _bulk(_patcher("cronJobs", "by_jobId")),
+        "weekly:upsertWeeklyReports": _bulk(MUTATIONS["weekly:upsertWeeklyReport"]),
+        "reports:upsertReports": _bulk(MUTATIONS["reports:upsertReport"]),
+        "chunks:putChunks": _bulk(MUTATIONS.pop("chunks:putChunk")),
+        "weekly:putReportChunks": _bulk(_put_chunk),
+    }
+)
+
+QUERIES = {
+    "weekly:getWeeklyReports": _get_weekly_reports,
+    "weekly:listWeeklyReportsPage": _paginate("weeklyReports", _with_weekly_content),
+    "weekly:getWeeklyReportContent": _get_weekly_report_content,
+    "chunks:missingChunks": _missing_chunks,
+    "cron:getCronJobs": lambda store, args: store.query("cronJobs"),
+    "health:getHealthAggregates": lambda store, args: store.query("healthAggregates"),
+    "trading:getStrategy": lambda store, args: store.first(
+        "tradingStrategies", "by_strategyId", args.get("strategyId")
+    ),
+    "reports:getReport": lambda store, args: store.first(
+        "reports", "by_reportId", args.get("reportId")
+    ),
+}
+
+
+INGEST_GROUP_ROWS = 200
+
+
+def _apply_ingest(store: Store, lines: list) -> list:
+    """Apply ``/api/ingest`` lines like ``convex/http.ts``; one result each."""
+    results = []
+    i = 0
+    while i < len(lines):
+        fn = lines[i].get("fn")
+        handler = MUTATIONS.get(fn)
+        if handler and "row" in lines[i]:
+            rows = []
+            while (
+                i < len(lines)
+                and lines[i].get("fn") == fn
+                and "row" in lines[i]
+                and len(rows) < INGEST_GROUP_ROWS
+            ):
+                rows.append(lines[i]["row"])
+                i += 1
+            try:
+                out = handler(store, {"rows": rows})
+                results += [{"ok": r["ok"], "error": r.get("error")} for r in out]
+            except FunctionError as e:
+                results += [{"ok": False, "error": str(e)}] * len(rows)
+            continue
+        line = lines[i]
+        i += 1
+        if handler is None or "args" not in line:
+            results.append({"ok": False, "error": f"not ingestible: {fn}"})
+            continue
+        try:
+            handler(store, line["args"])
+            results.append({"ok": True})
+        except FunctionError as e:
+            results.append({"ok": False, "error": str(e)})
+    return results
+
+
+# --- Fault injection --------------------------------------------------------
+
+
+class Faults:
+    """Latency, jitter, random failures and a token-bucket rate limit."""
+
+    def __init__(
+        self,
+        latency_ms=0.0,
+        jitter_ms=0.0,
+        error_rate=0.0,
+        rate_limit=0.0,
+        burst=None,
+        seed=None,
+    ):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.burst = burst or max(rate_limit, 1)
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+
+    def admit(self) -> bool:
+        """Take a rate-limit token; False means answer 429."""
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._refilled) * self.rate_limit
+            )
+            self._refilled = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def delay(self):
+        with self._lock:
+            extra = self._rnd.uniform(0, self.jitter) if self.jitter else 0.0
+        if self.latency or extra:
+            time.sleep(self.latency + extra)
+
+    def fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._rnd.random() < self.error_rate
+
+
+# --- Server -----------------------------------------------------------------
+
+
+class StandinServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, faults: Faults, verbose: bool = False):
+        super().__init__(address, _Handler)
+        self.store = Store()
+        self.faults = faults
+        self.verbose = verbose
+        self.stats = Counter()
+        self.stats_lock = threading.Lock()
+
+    def count(self, **deltas):
+        with self.stats_lock:
+            self.stats.update(deltas)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _reply(self, code: int, obj, headers=None):
+        body = json.dumps(obj).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        store = self.server.store
+        if self.path == "/_standin/stats":
+            with store.lock:
+                tables = {t: len(docs) for t, docs in store.tables.items() if docs}
+            with self.server.stats_lock:
+                stats = dict(self.server.stats)
+            return self._reply(200, {"requests": stats, "tables": tables})
+        if self.path.startswith("/_standin/tables/"):
+            table = self.path.rsplit("/", 1)[-1]
+            if table not in store.tables:
+                return self._reply(404, {"error": f"unknown table {table}"})
+            with store.lock:
+                return self._reply(200, store.query(table))
+        self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/_standin/reset":
+            self.server.store.reset()
+            with self.server.stats_lock:
+                self.server.stats.clear()
+            return self._reply(200, {"ok": True})
+        ingest = self.path == "/api/ingest"
+        registry = {"/api/mutation": MUTATIONS, "/api/query": QUERIES}.get(self.path)
+        if registry is None and not ingest:
+            return self._reply(404, {"error": "not found"})
+
+        faults = self.server.faults
+        self.server.count(requests=1, bytes_in=len(body))
+        if not faults.admit():
+            self.server.count(rate_limited=1)
+            return self._reply(
+                429,
+                {"code": "RateLimited", "message": "Too many requests"},
+                headers={"Retry-After": "1"},
+            )
+        faults.delay()
+        if faults.fail():
+            self.server.count(injected_errors=1)
+            return self._reply(
+                503, {"code": "InternalServerError", "message": "Injected failure"}
+            )
+
+        if ingest:
+            return self._ingest(body)
+        try:
+            payload = json.loads(body)
+            name, args = payload["path"], payload.get("args") or {}
+        except (ValueError, KeyError, TypeError):
+            return self._reply(400, {"code": "BadJsonBody", "message": "bad request"})
+        handler = registry.get(name)
+        if handler is None:
+            self.server.count(unknown_functions=1)
+            return self._reply(
+                404,
+                {"code": "FunctionNotFound", "message": f"Could not find {name}"},
+            )
+        try:
+            with self.server.store.lock:
+                value = handler(self.server.store, args)
+        except FunctionError as e:
+            self.server.count(function_errors=1)
+            return self._reply(
+                200, {"status": "error", "errorMessage": str(e), "logLines": []}
+            )
+        self.server.count(**{name: 1, "rows": len(args.get("rows") or [None])})
+        self._reply(200, {"status": "success", "value": value, "logLines": []})
+
+    def _ingest(self, body: bytes):
+        encoding = self.headers.get("Content-Encoding", "identity").lower()
+        decode = {"gzip": gzip.decompress, "deflate": zlib.decompress}
+        if encoding != "identity" and encoding not in decode:
+            return self._reply(
+                415, {"error": f"unsupported Content-Encoding: {encoding}"}
+            )
+        try:
+            if encoding in decode:
+                body = decode[encoding](body)
+            lines = [
+                json.loads(line) for line in body.decode().splitlines() if line.strip()
+            ]
+        except (OSError, EOFError, zlib.error, ValueError) as e:
+            return self._reply(400, {"error": f"bad NDJSON: {e}"})
+        with self.server.store.lock:
+            results = _apply_ingest(self.server.store, lines)
+        counts = Counter(line.get("fn") for line in lines)
+        self.server.count(**counts, rows=len(lines), ingest_lines=len(lines))
+        self._reply(200, {"results": results})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Convex stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3210)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Base latency per request (ms)"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Extra random latency, 0..N ms"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with HTTP 503",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="Requests per second before answering 429 (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--burst", type=float, help="Rate-limit bucket size (default: one second)"
+    )
+    parser.add_argument("--seed", type=int, help="Seed for jitter and failures")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    faults = Faults(
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        seed=args.seed,
+    )
+    server = StandinServer((args.host, args.port), faults, verbose=args.verbose)
+    print(f"🧪 Convex stand-in on http://{args.host}:{server.server_address[1]}")
+    print(
+        f"   latency={args.latency:g}ms jitter={args.jitter:g}ms "
+        f"errors={args.error_rate:g} rate_limit={args.rate_limit:g}/s"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Stopping")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
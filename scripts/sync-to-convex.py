@@ -1,69 +1,1583 @@
 #!/usr/bin/env python3
 """Sync Garmin, TES, and weed data to Convex."""
 
+import io
 import os
+import sys
+import gzip
 import json
+import time
+import random
 import hashlib
 import argparse
-import urllib.request
+import threading
+import http.client
+import urllib.parse
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
 CONVEX_URL = os.environ.get(
     "CONVEX_URL", "https://giant-eel-625.eu-west-1.convex.cloud"
 )
+# HTTP actions live on the deployment's .convex.site host.
+CONVEX_SITE_URL = os.environ.get("CONVEX_SITE_URL", "")
+# Fan-out: "name=url,name=url" writes every pass to each of these instead.
+DEPLOYMENTS = os.environ.get("MC_DEPLOYMENTS", "")
 API_BRIDGE_URL = os.environ.get("API_BRIDGE_URL", "http://api-bridge:8080")
 API_BRIDGE_TOKEN = os.environ.get("API_BRIDGE_TOKEN", "")
 REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 WORKSPACE = os.path.join(REPO_DIR, ".openclaw", "workspace")
-STATE_PATH = os.path.join(WORKSPACE, "data", "mc_sync_state.json")
+STATE_PATH = os.environ.get(
+    "MC_STATE_PATH", os.path.join(WORKSPACE, "data", "mc_sync_state.db")
+)
+# JSON files the state store replaced; imported once into a new store.
+LEGACY_STATE_PATH = os.path.join(WORKSPACE, "data", "mc_sync_state.json")
+PARSE_CACHE_PATH = os.path.join(WORKSPACE, "data", "mc_parse_cache.json")
+QUARK_DB = os.path.join(WORKSPACE, "data", "quark.db")
+PARSE_CACHE_MAX = int(os.environ.get("MC_PARSE_CACHE_MAX", "20000"))
+PARSE_CACHE_TTL = float(os.environ.get("MC_PARSE_CACHE_TTL_DAYS", "30")) * 86400
+WATCH_DEBOUNCE = float(os.environ.get("MC_WATCH_DEBOUNCE", "2"))
+WATCH_POLL_INTERVAL = float(os.environ.get("MC_WATCH_POLL_INTERVAL", "5"))
+WATCH_FULL_INTERVAL = float(os.environ.get("MC_WATCH_FULL_INTERVAL", "900"))
+SYNC_WORKERS = int(os.environ.get("MC_SYNC_WORKERS", "6"))
+BATCH_MAX_ROWS = int(os.environ.get("MC_BATCH_MAX_ROWS", "200"))
+BATCH_MAX_BYTES = int(os.environ.get("MC_BATCH_MAX_BYTES", str(512 * 1024)))
+HTTP_POOL_SIZE = int(os.environ.get("MC_HTTP_POOL_SIZE", "8"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("MC_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_RETRIES = int(os.environ.get("MC_HTTP_RETRIES", "2"))
+HTTP_RETRY_BUDGET = int(os.environ.get("MC_HTTP_RETRY_BUDGET", "20"))
+RETRY_BACKOFF = float(os.environ.get("MC_RETRY_BACKOFF", "0.5"))
+RETRY_BACKOFF_MAX = float(os.environ.get("MC_RETRY_BACKOFF_MAX", "8"))
+BREAKER_THRESHOLD = int(os.environ.get("MC_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("MC_BREAKER_COOLDOWN", "30"))
+PROBE_TIMEOUT = float(os.environ.get("MC_PROBE_TIMEOUT", "3"))
+OUTBOX_PATH = os.environ.get(
+    "MC_OUTBOX_PATH", os.path.join(WORKSPACE, "data", "mc_outbox.db")
+)
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("MC_OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_LANES = int(os.environ.get("MC_OUTBOX_LANES", "4"))
+INGEST = os.environ.get("MC_INGEST", "1") != "0"
+INGEST_MAX_ROWS = int(os.environ.get("MC_INGEST_MAX_ROWS", "2000"))
+INGEST_MAX_BYTES = int(os.environ.get("MC_INGEST_MAX_BYTES", str(4 * 1024 * 1024)))
+EQUITY_CHART_POINTS = int(os.environ.get("MC_EQUITY_CHART_POINTS", "300"))
+CHUNK_MIN = int(os.environ.get("MC_CHUNK_MIN", "1024"))
+CHUNK_MAX = int(os.environ.get("MC_CHUNK_MAX", "8192"))
+PATCH_BASELINE_TTL = float(os.environ.get("MC_PATCH_BASELINE_TTL_HOURS", "24")) * 3600
+HEALTH_HISTORY_DAYS = int(os.environ.get("MC_HEALTH_HISTORY_DAYS", "400"))
+HEALTH_METRICS = (
+    "hrv",
+    "sleepScore",
+    "sleepHours",
+    "stress",
+    "restingHR",
+    "bodyBattery",
+)
+HEALTH_WINDOWS = (7, 30, 90)
+HEALTH_Z_DAYS = 30
+METRICS_PATH = os.environ.get(
+    "MC_METRICS_PATH", os.path.join(WORKSPACE, "data", "mc_sync_metrics.json")
+)
+METRICS_PROM_PATH = os.environ.get(
+    "MC_METRICS_PROM_PATH", os.path.join(WORKSPACE, "data", "mc_sync.prom")
+)
 
 
-def convex_mutation(fn_name: str, args: dict):
-    url = f"{CONVEX_URL}/api/mutation"
-    payload = json.dumps({"path": fn_name, "args": args, "format": "json"}).encode()
-    req = urllib.request.Request(
-        url, data=payload, headers={"Content-Type": "application/json"}
+class HTTPPool:
+    """Keep-alive HTTP/1.1 connections, pooled per (scheme, host, port).
+
+    At most ``size`` connections per host are open at once; idle ones are
+    reused by the next request. A request that fails because the server
+    dropped an idle connection is retried once on a fresh one.
+    """
+
+    def __init__(
+        self, size: int = HTTP_POOL_SIZE, connect_timeout=HTTP_CONNECT_TIMEOUT
+    ):
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self.requests = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._slots = {}
+
+    def _slot(self, key):
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(self.size)
+                self._idle[key] = []
+            return self._slots[key]
+
+    def _checkout(self, key, timeout):
+        with self._lock:
+            if self._idle[key]:
+                return self._idle[key].pop(), True
+        scheme, host, port = key
+        cls = (
+            http.client.HTTPSConnection
+            if scheme == "https"
+            else http.client.HTTPConnection
+        )
+        conn = cls(host, port, timeout=min(self.connect_timeout, timeout))
+        conn.connect()
+        return conn, False
+
+    def request(self, method: str, url: str, body=None, headers=None, timeout=15):
+        """Send one request and return ``(status, body_bytes)``."""
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        with self._slot(key):
+            for attempt in range(2):
+                conn, reused = self._checkout(key, timeout)
+                try:
+                    conn.sock.settimeout(timeout)
+                    conn.request(method, path, body=body, headers=headers or {})
+                    resp = conn.getresponse()
+                    data = resp.read()
+                except (ConnectionError, http.client.BadStatusLine):
+                    conn.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+                with self._lock:
+                    self.requests += 1
+                    self.reused += reused
+                    if resp.will_close:
+                        conn.close()
+                    else:
+                        self._idle[key].append(conn)
+                return resp.status, data
+
+    def close(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+                conns.clear()
+
+    def report(self) -> str:
+        rate = self.reused / self.requests * 100 if self.requests else 0.0
+        return f"{self.requests} requests, {self.reused} on reused connections ({rate:.0f}%)"
+
+
+HTTP = HTTPPool()
+
+
+class SyncMetrics:
+    """Per-syncer counters and timings for one sync pass.
+
+    Work is attributed to the syncer the calling thread is running (see
+    ``syncer``); anything recorded outside one lands under ``"-"``.
+    ``fetching`` blocks time reads from upstream sources — the API bridge,
+    git, quark.db and report files — so wall time can be split into
+    fetching versus parsing and sending.
+    """
+
+    COUNTERS = (
+        "mutations_attempted",
+        "mutations_succeeded",
+        "mutations_failed",
+        "rows_succeeded",
+        "rows_failed",
+        "rows_skipped",
+        "bytes_sent",
     )
-    try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            result = json.loads(resp.read())
-            if result.get("status") == "error":
-                print(
-                    f"  ⚠ Convex error for {fn_name}: {result.get('errorMessage', '')[:100]}"
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._syncers = {}
+            self.started = time.time()
+            self.status = "ok"
+            self.problems = []
+            self.outbox = {}
+
+    def _entry(self, name=None):
+        name = name or getattr(self._local, "name", None) or "-"
+        entry = self._syncers.get(name)
+        if entry is None:
+            entry = self._syncers[name] = {
+                "status": "ok",
+                "wall_seconds": 0.0,
+                "fetch_seconds": 0.0,
+                **{c: 0 for c in self.COUNTERS},
+                "latencies": [],
+            }
+        return entry
+
+    def current(self):
+        """Name of the syncer the calling thread is running, if any."""
+        return getattr(self._local, "name", None)
+
+    @contextmanager
+    def attribute(self, name):
+        """Record work on this thread under syncer ``name``."""
+        prev, self._local.name = self.current(), name
+        try:
+            yield
+        finally:
+            self._local.name = prev
+
+    @contextmanager
+    def syncer(self, name: str):
+        t0 = time.monotonic()
+        status = "ok"
+        try:
+            with self.attribute(name):
+                yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            with self._lock:
+                entry = self._entry(name)
+                entry["wall_seconds"] += time.monotonic() - t0
+                entry["status"] = status
+
+    @contextmanager
+    def fetching(self):
+        depth = getattr(self._local, "fetch_depth", 0)
+        self._local.fetch_depth = depth + 1
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            self._local.fetch_depth = depth
+            if not depth:
+                self.add(fetch_seconds=time.monotonic() - t0)
+
+    def add(self, **deltas):
+        with self._lock:
+            entry = self._entry()
+            for k, v in deltas.items():
+                entry[k] += v
+
+    def latency(self, seconds: float):
+        with self._lock:
+            self._entry()["latencies"].append(seconds)
+
+    @classmethod
+    def _quantiles(cls, samples) -> dict:
+        samples = sorted(samples)
+        if not samples:
+            return {}
+        out = {
+            f"p{q * 100:g}": samples[min(int(q * len(samples)), len(samples) - 1)]
+            for q in cls.QUANTILES
+        }
+        out["max"] = samples[-1]
+        return {k: round(v, 4) for k, v in out.items()}
+
+    def summary(self) -> dict:
+        with self._lock:
+            syncers = {}
+            all_latencies = []
+            total = {"wall_seconds": 0.0, "fetch_seconds": 0.0}
+            total.update({c: 0 for c in self.COUNTERS})
+            for name, entry in sorted(self._syncers.items()):
+                data = {k: v for k, v in entry.items() if k != "latencies"}
+                data["wall_seconds"] = round(data["wall_seconds"], 4)
+                data["fetch_seconds"] = round(data["fetch_seconds"], 4)
+                data["convex_latency_seconds"] = self._quantiles(entry["latencies"])
+                syncers[name] = data
+                all_latencies += entry["latencies"]
+                for k in total:
+                    total[k] += entry[k]
+        total["wall_seconds"] = round(total["wall_seconds"], 4)
+        total["fetch_seconds"] = round(total["fetch_seconds"], 4)
+        total["convex_latency_seconds"] = self._quantiles(all_latencies)
+        return {
+            "startedAt": self.started,
+            "finishedAt": time.time(),
+            "status": self.status,
+            "problems": self.problems,
+            "outbox": self.outbox,
+            "total": total,
+            "syncers": syncers,
+        }
+
+    @classmethod
+    def _prometheus(cls, summary: dict) -> str:
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP mc_sync_{name} {help_text}")
+            lines.append(f"# TYPE mc_sync_{name} {kind}")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                label_str = f"{{{label_str}}}" if label_str else ""
+                lines.append(f"mc_sync_{name}{label_str} {value}")
+
+        syncers = summary["syncers"]
+        metric(
+            "last_run_timestamp_seconds",
+            "gauge",
+            "Unix time the last sync pass finished.",
+            [({}, summary["finishedAt"])],
+        )
+        metric(
+            "run_success",
+            "gauge",
+            "1 if the last pass ran to completion.",
+            [({}, int(summary["status"] == "ok"))],
+        )
+        per_deployment = summary["outbox"].get("deployments")
+        for key in ("pending", "dead"):
+            if key in summary["outbox"]:
+                metric(
+                    f"outbox_{key}",
+                    "gauge",
+                    f"Outbox entries {key} after the last pass.",
+                    [({"deployment": n}, o[key]) for n, o in per_deployment.items()]
+                    if per_deployment
+                    else [({}, summary["outbox"][key])],
                 )
-            return result
+        metric(
+            "syncer_success",
+            "gauge",
+            "1 if the syncer finished without raising.",
+            [({"syncer": n}, int(d["status"] == "ok")) for n, d in syncers.items()],
+        )
+        for key, help_text in (
+            ("wall_seconds", "Wall time of the syncer."),
+            ("fetch_seconds", "Time spent reading upstream sources."),
+        ):
+            metric(
+                key,
+                "gauge",
+                help_text,
+                [({"syncer": n}, d[key]) for n, d in syncers.items()],
+            )
+        for key in cls.COUNTERS:
+            metric(
+                key,
+                "gauge",
+                f"{key.replace('_', ' ').capitalize()} in the last pass.",
+                [({"syncer": n}, d[key]) for n, d in syncers.items()],
+            )
+        samples = []
+        for n, d in syncers.items():
+            for q, v in d["convex_latency_seconds"].items():
+                if q != "max":
+                    quantile = float(q[1:]) / 100
+                    samples.append(({"syncer": n, "quantile": f"{quantile:g}"}, v))
+        metric(
+            "convex_latency_seconds",
+            "summary",
+            "Convex mutation round-trip latency.",
+            samples,
+        )
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path: str = None, prom_path: str = None) -> dict:
+        """Write the JSON summary and Prometheus textfile; returns the summary."""
+        summary = self.summary()
+        for path, text in (
+            (json_path or METRICS_PATH, json.dumps(summary, indent=2)),
+            (prom_path or METRICS_PROM_PATH, self._prometheus(summary)),
+        ):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        return summary
+
+
+METRICS = SyncMetrics()
+
+
+class EndpointDown(RuntimeError):
+    """Raised without touching the network while an endpoint's circuit is open."""
+
+
+class HTTPStatusError(RuntimeError):
+    """A non-retryable HTTP error status; ``status`` holds the code."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one endpoint.
+
+    After ``threshold`` failures in a row (or a failed startup probe) the
+    circuit opens and calls fail immediately. Once ``cooldown`` seconds have
+    passed a single trial call is let through; its outcome closes the
+    circuit again or re-opens it.
+    """
+
+    def __init__(
+        self, name: str, threshold: int = BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN
+    ):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.last_error = None
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != "closed"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if (
+                self.state == "open"
+                and time.monotonic() - self._opened_at >= self.cooldown
+            ):
+                self.state = "half-open"
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def failure(self, error):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self.state == "half-open" or self.failures >= self.threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def trip(self, error):
+        with self._lock:
+            self.failures = max(self.failures, self.threshold)
+            self.last_error = error
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """Retries left for the whole pass, shared by every endpoint and thread."""
+
+    def __init__(self, size: int = HTTP_RETRY_BUDGET):
+        self.size = size
+        self.remaining = size
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def reset(self):
+        with self._lock:
+            self.remaining = self.size
+
+
+RETRIES = RetryBudget()
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+# Statuses worth retrying: the request was not (or may not have been) applied.
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+def breaker_for(url: str) -> CircuitBreaker:
+    """The circuit breaker for ``url``'s endpoint (scheme + host + port)."""
+    parts = urllib.parse.urlsplit(url)
+    name = f"{parts.scheme}://{parts.netloc}"
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with equal jitter: half fixed, half random."""
+    delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2**attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def http_json(
+    method: str,
+    url: str,
+    payload=None,
+    headers=None,
+    timeout=15,
+    retries=None,
+    data: bytes = None,
+):
+    """Request ``url`` through the shared pool and decode the JSON response.
+
+    ``payload`` is sent as JSON; ``data`` is an already encoded body that
+    ``headers`` describe. Transport errors and 429/5xx responses are retried
+    up to ``retries`` times with backoff while the pass's retry budget lasts;
+    they also count against the endpoint's circuit breaker, and an open
+    circuit raises ``EndpointDown`` straight away. Raises ``HTTPStatusError``
+    (a ``RuntimeError``) on other HTTP error statuses, like ``urlopen`` did.
+    """
+    headers = dict(headers or {})
+    body = data
+    if payload is not None:
+        body = json.dumps(payload).encode()
+        headers["Content-Type"] = "application/json"
+    retries = HTTP_RETRIES if retries is None else retries
+    breaker = breaker_for(url)
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            raise EndpointDown(f"{breaker.name} unreachable: {breaker.last_error}")
+        if body is not None:
+            METRICS.add(bytes_sent=len(body))
+        try:
+            status, reply = HTTP.request(
+                method, url, body=body, headers=headers, timeout=timeout
+            )
+        except (OSError, http.client.HTTPException) as e:
+            error = e
+        else:
+            if status not in RETRY_STATUSES and status < 500:
+                breaker.success()
+                if status >= 400:
+                    raise HTTPStatusError(
+                        status, f"HTTP {status}: {reply[:200].decode(errors='replace')}"
+                    )
+                return json.loads(reply)
+            error = RuntimeError(
+                f"HTTP {status}: {reply[:200].decode(errors='replace')}"
+            )
+        breaker.failure(error)
+        if attempt == retries or breaker.is_open or not RETRIES.take():
+            raise error
+        time.sleep(_backoff(attempt))
+
+
+def probe_endpoint(name: str, url: str) -> bool:
+    """Check ``url`` answers at all; trips its breaker if it does not.
+
+    Any HTTP response below 500 counts as reachable — the point is to find
+    out in ``PROBE_TIMEOUT`` seconds instead of one request timeout per row.
+    """
+    breaker = breaker_for(url)
+    try:
+        status, _ = HTTP.request("GET", url, timeout=PROBE_TIMEOUT)
+        if status >= 500:
+            raise RuntimeError(f"HTTP {status}")
+    except Exception as e:
+        breaker.trip(e)
+        print(f"🩺 {name} unreachable ({url}): {e}")
+        return False
+    breaker.success()
+    return True
+
+
+def convex_mutation(
+    fn_name: str, args: dict, deployment: "Deployment" = None, rows: int = 1
+):
+    """Run a Convex mutation; returns the response, or None if it failed.
+
+    ``rows`` is how many rows the call counts as in the metrics. Callers of
+    bulk mutations pass 0 and count rows from the per-row results.
+    """
+    url = f"{(deployment or deployments()[0]).url}/api/mutation"
+    payload = {"path": fn_name, "args": args, "format": "json"}
+    METRICS.add(mutations_attempted=1)
+    t0 = time.monotonic()
+    try:
+        result = http_json("POST", url, payload, timeout=15)
+        METRICS.latency(time.monotonic() - t0)
+        if result.get("status") == "error":
+            print(
+                f"  ⚠ Convex error for {fn_name}: {result.get('errorMessage', '')[:100]}"
+            )
+            METRICS.add(mutations_failed=1, rows_failed=rows)
+        else:
+            METRICS.add(mutations_succeeded=1, rows_succeeded=rows)
+        return result
+    except EndpointDown:
+        # Let the syncer abort: its state is discarded and it retries next run.
+        METRICS.add(mutations_failed=1, rows_failed=rows)
+        raise
     except Exception as e:
         print(f"  ⚠ Failed {fn_name}: {e}")
+        METRICS.add(mutations_failed=1, rows_failed=rows)
         return None
 
 
-def fetch_api_bridge(path: str):
-    url = f"{API_BRIDGE_URL}{path}"
-    req = urllib.request.Request(url, headers={"X-API-Bridge-Token": API_BRIDGE_TOKEN})
+def convex_query(fn_name: str, args: dict, deployment: "Deployment" = None):
+    """Run a Convex query; returns its value, or None if it failed."""
+    url = f"{(deployment or deployments()[0]).url}/api/query"
+    payload = {"path": fn_name, "args": args, "format": "json"}
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            return json.loads(resp.read())
+        result = http_json("POST", url, payload, timeout=15)
+    except EndpointDown:
+        raise
     except Exception as e:
-        print(f"  ⚠ API Bridge error {path}: {e}")
+        print(f"  ⚠ Failed {fn_name}: {e}")
         return None
+    if result.get("status") == "error":
+        print(f"  ⚠ Convex error for {fn_name}: {result.get('errorMessage', '')[:100]}")
+        return None
+    return result.get("value")
+
+
+def convex_ingest(entries, deployment: "Deployment" = None) -> list:
+    """Apply outbox ``entries`` through the ``/api/ingest`` HTTP action.
+
+    Entries go out as one gzip-compressed NDJSON body — bulk rows as
+    ``{"fn", "row"}`` lines, single mutations as ``{"fn", "args"}`` — and
+    come back as one ``{"ok", "error"}`` per entry. Raises like ``http_json``
+    if the request itself fails.
+    """
+    lines = [
+        f'{{"fn":{json.dumps(e["fn"])},"{"row" if e["bulk"] else "args"}":{e["args"]}}}'
+        for e in entries
+    ]
+    body = gzip.compress("\n".join(lines).encode(), compresslevel=6)
+    headers = {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"}
+    result = http_json(
+        "POST",
+        f"{(deployment or deployments()[0]).site_url}/api/ingest",
+        headers=headers,
+        data=body,
+        timeout=60,
+    )
+    results = result.get("results") if isinstance(result, dict) else None
+    if not isinstance(results, list):
+        raise RuntimeError(f"ingest: unexpected reply {str(result)[:200]}")
+    if len(results) != len(entries):
+        print(f"  ⚠ ingest: {len(results)} results for {len(entries)} entries")
+        results = (results + [{"ok": False, "error": "missing result"}] * len(entries))[
+            : len(entries)
+        ]
+    return results
+
+
+GARMIN_HEALTH_PATHS = ("/garmin/today", "/garmin/data?days=7")
+GARMIN_BACKFILL_PATH = f"/garmin/data?days={max(HEALTH_WINDOWS)}"
+GARMIN_ACTIVITY_PATHS = ("/garmin/activities?count=10",)
+
+
+class ApiBridgeClient:
+    """Concurrent API-bridge GETs with in-flight de-duplication.
+
+    Each path is fetched at most once until ``reset``; every caller asking
+    for it shares the same future, so syncers can prefetch what they need
+    up front and the requests overlap instead of queueing. ``errors`` maps
+    the paths that failed since then to their error.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="api-bridge"
+        )
+        self._lock = threading.Lock()
+        self._futures = {}
+        self.errors = {}
+
+    @staticmethod
+    def _fetch(path: str):
+        url = f"{API_BRIDGE_URL}{path}"
+        return http_json(
+            "GET", url, headers={"X-API-Bridge-Token": API_BRIDGE_TOKEN}, timeout=30
+        )
 
+    def _submit(self, path: str):
+        with self._lock:
+            fut = self._futures.get(path)
+            if fut is None:
+                fut = self._pool.submit(self._fetch, path)
+                self._futures[path] = fut
+            return fut
 
-def _load_state():
-    if os.path.exists(STATE_PATH):
+    def prefetch(self, paths):
+        for path in paths:
+            self._submit(path)
+
+    def get(self, path: str, quiet: bool = False):
         try:
-            with open(STATE_PATH) as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+            with METRICS.fetching():
+                return self._submit(path).result()
+        except Exception as e:
+            with self._lock:
+                self.errors[path] = str(e)
+            if not quiet:
+                print(f"  ⚠ API Bridge error {path}: {e}")
+            return None
+
+    def reset(self):
+        with self._lock:
+            self._futures.clear()
+            self.errors = {}
+
+
+API_BRIDGE = ApiBridgeClient()
 
 
-def _save_state(state: dict):
-    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
-    tmp = f"{STATE_PATH}.tmp"
-    with open(tmp, "w") as f:
-        json.dump(state, f, indent=2)
-    os.replace(tmp, STATE_PATH)
+def fetch_api_bridge(path: str):
+    return API_BRIDGE.get(path)
+
+
+class Outbox:
+    """Durable, ordered queue of Convex mutations in a local SQLite file.
+
+    Entries are keyed by ``(function, key)`` for idempotency: queuing a key
+    that is still pending replaces it and moves it to the back, so only the
+    newest version of a document goes out. ``OutboxFlusher`` drains entries
+    in queue order; whatever it cannot deliver stays on disk for the next
+    run. Entries that keep failing are parked as dead after
+    ``OUTBOX_MAX_ATTEMPTS`` attempts; they stay on disk, count against the
+    run status, and ``revive`` (``--retry-dead``) queues them again. Change
+    detection treats queued rows as sent, so nothing else would resend them.
+    """
+
+    def __init__(self, path: str = None, max_attempts: int = None):
+        import sqlite3
+        import zlib
+
+        self.path = path or OUTBOX_PATH
+        self.max_attempts = max_attempts or OUTBOX_MAX_ATTEMPTS
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.create_function(
+            "lane",
+            2,
+            lambda fn, n: zlib.crc32(fn.split(":")[0].encode()) % n,
+            deterministic=True,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS outbox (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                fn TEXT NOT NULL,
+                key TEXT NOT NULL,
+                bulk INTEGER NOT NULL,
+                args TEXT NOT NULL,
+                source TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                dead INTEGER NOT NULL DEFAULT 0,
+                queued_at REAL NOT NULL,
+                UNIQUE (fn, key)
+            )"""
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._queued = threading.Condition(self._lock)
+
+    def put_many(self, fn_name: str, items, bulk: bool):
+        """Queue ``(key, args)`` pairs for ``fn_name`` in one transaction."""
+        source = METRICS.current()
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                for key, args in items:
+                    self._conn.execute(
+                        "DELETE FROM outbox WHERE fn = ? AND key = ?", (fn_name, key)
+                    )
+                    self._conn.execute(
+                        "INSERT INTO outbox (fn, key, bulk, args, source, queued_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (fn_name, key, int(bulk), json.dumps(args), source, now),
+                    )
+            self._queued.notify_all()
+
+    def after(self, seq: int, limit: int, lane: int = 0, lanes: int = 1):
+        """Live entries queued after ``seq``, oldest first.
+
+        With ``lanes`` > 1 only entries whose Convex module hashes to
+        ``lane`` are returned, so each lane sees every entry of its modules'
+        functions in order.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, fn, key, bulk, args, source FROM outbox"
+                " WHERE seq > ? AND dead = 0 AND lane(fn, ?) = ?"
+                " ORDER BY seq LIMIT ?",
+                (seq, lanes, lane, limit),
+            ).fetchall()
+        fields = ("seq", "fn", "key", "bulk", "args", "source")
+        return [dict(zip(fields, r)) for r in rows]
+
+    def wait(self, timeout: float, stop: threading.Event):
+        """Sleep until something is queued, ``stop`` is set, or ``timeout``."""
+        with self._queued:
+            if not stop.is_set():
+                self._queued.wait(timeout)
+
+    def done(self, seqs):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM outbox WHERE seq = ?", [(s,) for s in seqs]
+            )
+
+    def failed(self, seqs, error: str) -> int:
+        """Count a failed attempt for ``seqs``; returns how many went dead."""
+        with self._lock, self._conn:
+            for seq in seqs:
+                self._conn.execute(
+                    "UPDATE outbox SET attempts = attempts + 1, last_error = ?,"
+                    " dead = (attempts + 1 >= ?) WHERE seq = ?",
+                    (error[:500], self.max_attempts, seq),
+                )
+            return self._conn.execute(
+                f"SELECT count(*) FROM outbox WHERE dead = 1 AND seq IN"
+                f" ({','.join('?' * len(seqs))})",
+                list(seqs),
+            ).fetchone()[0]
+
+    def revive(self) -> int:
+        """Queue every dead entry again with a fresh attempt count."""
+        with self._lock:
+            with self._conn:
+                revived = self._conn.execute(
+                    "UPDATE outbox SET dead = 0, attempts = 0 WHERE dead = 1"
+                ).rowcount
+            self._queued.notify_all()
+        return revived
+
+    def dead_entries(self, limit: int = 3) -> list:
+        """The most recently failed dead entries: ``fn``, ``key``, ``error``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fn, key, last_error FROM outbox WHERE dead = 1"
+                " ORDER BY seq DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(zip(("fn", "key", "error"), r)) for r in rows]
+
+    def counts(self):
+        """``(pending, dead)`` entry counts."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT count(*) - coalesce(sum(dead), 0), coalesce(sum(dead), 0)"
+                " FROM outbox"
+            ).fetchone()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Deployment:
+    """A Convex deployment the sync writes to, with its own outbox.
+
+    The unnamed default is ``CONVEX_URL`` and uses the original outbox file
+    and state namespaces. Named deployments (fan-out) get a suffixed outbox
+    file and ``ns`` suffixes their change-detection namespaces, so each one
+    tracks what it has been sent and queues, retries and trips its circuit
+    breaker independently of the others.
+    """
+
+    def __init__(self, name: str = "", url: str = None, site_url: str = None):
+        self.name = name
+        self._url = url
+        self._site_url = site_url
+        self._outbox = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return self._url or CONVEX_URL
+
+    @property
+    def site_url(self) -> str:
+        """Base URL for HTTP actions: the .convex.site twin of ``url``."""
+        if self._site_url or (not self._url and CONVEX_SITE_URL):
+            return self._site_url or CONVEX_SITE_URL
+        return self.url.replace(".convex.cloud", ".convex.site")
+
+    @property
+    def label(self) -> str:
+        return self.name or "Convex"
+
+    def ns(self, namespace: str) -> str:
+        """``namespace`` of the state store as seen by this deployment."""
+        return f"{namespace}@{self.name}" if self.name else namespace
+
+    @property
+    def outbox_path(self) -> str:
+        if not self.name:
+            return OUTBOX_PATH
+        root, ext = os.path.splitext(OUTBOX_PATH)
+        return f"{root}.{self.name}{ext}"
+
+    def outbox(self) -> Outbox:
+        """This deployment's Outbox, opened on first use."""
+        with self._lock:
+            if self._outbox is None:
+                self._outbox = Outbox(self.outbox_path)
+            return self._outbox
+
+    def close(self):
+        with self._lock:
+            if self._outbox is not None:
+                self._outbox.close()
+                self._outbox = None
+
+
+_deployments = [Deployment()]
+
+
+def deployments() -> list:
+    """The deployments every pass writes to; the first is the primary."""
+    return list(_deployments)
+
+
+def configure_deployments(spec: str):
+    """Fan out to the ``name=url`` pairs in ``spec`` (comma-separated).
+
+    An empty ``spec`` keeps the single default deployment. Raises
+    ``ValueError`` on malformed or duplicate entries.
+    """
+    import re
+
+    configured = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, sep, url = part.partition("=")
+        name, url = name.strip(), url.strip().rstrip("/")
+        if not sep or not url or not re.fullmatch(r"[A-Za-z0-9_-]+", name):
+            raise ValueError(f"expected name=url, got {part!r}")
+        if any(d.name == name for d in configured):
+            raise ValueError(f"deployment {name!r} given twice")
+        configured.append(Deployment(name, url))
+    for d in _deployments:
+        d.close()
+    _deployments[:] = configured or [Deployment()]
+
+
+def outbox(deployment: Deployment = None) -> Outbox:
+    """The outbox of ``deployment``, by default the primary one."""
+    return (deployment or _deployments[0]).outbox()
+
+
+def enqueue(fn_name: str, items, bulk: bool, targets=None):
+    """Queue ``(key, args)`` pairs on each of ``targets`` (default: all)."""
+    items = list(items)
+    for d in targets or deployments():
+        d.outbox().put_many(fn_name, items, bulk=bulk)
+
+
+class OutboxFlusher:
+    """Background threads that drain the outbox while syncers are running.
+
+    Convex modules are spread over ``lanes`` threads by name hash; each lane
+    sends its entries strictly in queue order, so the functions of a module
+    (say an upsert and its patch) see its documents in the order they were
+    queued while different modules go out in parallel. With ``ingest`` on, a
+    lane sends everything it has, whatever the function, as one compressed
+    ``/api/ingest`` request; if that fails for any reason — no endpoint, an
+    error status, the ``.convex.site`` host unreachable — the flusher falls
+    back to regular mutations for the rest of the run. Otherwise consecutive entries for the same bulk mutation go out
+    together as one size-bounded ``{"rows": [...]}`` request and other
+    entries one by one. Each pass walks the queue once, so an entry that
+    fails is retried on the next pass rather than in a tight loop. An open
+    Convex circuit stops the pass and leaves the rest queued.
+    """
+
+    def __init__(
+        self, deployment: Deployment = None, lanes: int = None, ingest: bool = None
+    ):
+        self.deployment = deployment or deployments()[0]
+        self.outbox = self.deployment.outbox()
+        self.lanes = max(1, lanes or OUTBOX_LANES)
+        self.ingest = INGEST if ingest is None else ingest
+        self.sent = 0
+        self.failed = 0
+        self.dead = 0
+        self.requests = 0
+        self.error = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._threads = [
+            threading.Thread(
+                target=self._run, args=(lane,), name=f"outbox-{lane}", daemon=True
+            )
+            for lane in range(self.lanes)
+        ]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Wait until everything queued so far was tried, then stop."""
+        self._stopping.set()
+        with self.outbox._queued:
+            self.outbox._queued.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self, lane: int):
+        cursor = 0
+        while self.error is None:
+            batch = self._next_batch(lane, cursor)
+            if batch:
+                if self._flush(batch):
+                    cursor = batch[-1]["seq"]
+                continue
+            if self._stopping.is_set():
+                return
+            self.outbox.wait(0.5, self._stopping)
+
+    def _next_batch(self, lane: int, cursor: int):
+        if self.ingest:
+            entries = self.outbox.after(cursor, INGEST_MAX_ROWS, lane, self.lanes)
+            batch, size = [], 0
+            for entry in entries:
+                if batch and size + len(entry["args"]) > INGEST_MAX_BYTES:
+                    break
+                batch.append(entry)
+                size += len(entry["args"])
+            return batch
+
+        entries = self.outbox.after(cursor, BATCH_MAX_ROWS, lane, self.lanes)
+        if not entries:
+            return []
+        first = entries[0]
+        if not first["bulk"]:
+            return [first]
+        batch, size = [], 0
+        for entry in entries:
+            if entry["fn"] != first["fn"] or not entry["bulk"]:
+                break
+            if batch and size + len(entry["args"]) > BATCH_MAX_BYTES:
+                break
+            batch.append(entry)
+            size += len(entry["args"])
+        return batch
+
+    def _flush(self, batch) -> bool:
+        fn_name = batch[0]["fn"]
+        try:
+            with METRICS.attribute(batch[0]["source"]):
+                if self.ingest:
+                    results = self._ingest(batch)
+                else:
+                    results = self._send(fn_name, batch)
+        except EndpointDown as e:
+            self.error = e
+            return False
+        if results is None:
+            return False
+        ok = [e["seq"] for e, r in zip(batch, results) if r.get("ok")]
+        bad = [(e["seq"], r) for e, r in zip(batch, results) if not r.get("ok")]
+        self.outbox.done(ok)
+        dead = 0
+        if bad:
+            error = str(bad[0][1].get("error", "request failed"))
+            dead = self.outbox.failed([seq for seq, _ in bad], error)
+        with self._lock:
+            self.requests += 1
+            self.sent += len(ok)
+            self.failed += len(bad)
+            self.dead += dead
+        return True
+
+    def _ingest(self, batch):
+        """Send ``batch`` through ``/api/ingest``; one result per entry.
+
+        Returns None, leaving the batch queued, if the request fails: ingest
+        is off from then on and the lane resends the batch as mutations,
+        whose endpoint and breaker decide whether the deployment is down.
+        """
+        METRICS.add(mutations_attempted=1)
+        t0 = time.monotonic()
+        try:
+            results = convex_ingest(batch, self.deployment)
+        except Exception as e:
+            with self._lock:
+                if self.ingest:
+                    print(f"  ↩ Ingest failed ({e}) — sending mutations")
+                self.ingest = False
+            METRICS.add(mutations_failed=1)
+            return None
+        METRICS.latency(time.monotonic() - t0)
+        METRICS.add(mutations_succeeded=1)
+        for entry, r in zip(batch, results):
+            with METRICS.attribute(entry["source"]):
+                if r.get("ok"):
+                    METRICS.add(rows_succeeded=1)
+                else:
+                    print(f"  ⚠ {entry['fn']} failed: {str(r.get('error', ''))[:100]}")
+                    METRICS.add(rows_failed=1)
+        return results
+
+    def _send(self, fn_name: str, batch):
+        """One result per entry of ``batch``, in order."""
+        if not batch[0]["bulk"]:
+            result = convex_mutation(
+                fn_name, json.loads(batch[0]["args"]), self.deployment, rows=1
+            )
+            if (result or {}).get("status") == "success":
+                return [{"ok": True}]
+            return [{"ok": False, "error": (result or {}).get("errorMessage")}]
+
+        rows = [json.loads(e["args"]) for e in batch]
+        result = convex_mutation(fn_name, {"rows": rows}, self.deployment, rows=0)
+        value = (result or {}).get("value")
+        if (result or {}).get("status") != "success" or not isinstance(value, list):
+            error = (result or {}).get("errorMessage", "request failed")
+            METRICS.add(rows_failed=len(rows))
+            return [{"ok": False, "error": error}] * len(rows)
+        if len(value) != len(rows):
+            print(f"  ⚠ {fn_name}: {len(value)} results for {len(rows)} rows")
+            value = (value + [{"ok": False, "error": "missing result"}] * len(rows))[
+                : len(rows)
+            ]
+        for r in value:
+            if not r.get("ok"):
+                print(f"  ⚠ {fn_name} row failed: {str(r.get('error', ''))[:100]}")
+        ok = sum(1 for r in value if r.get("ok"))
+        METRICS.add(rows_succeeded=ok, rows_failed=len(value) - ok)
+        return value
+
+    def report(self) -> str:
+        pending, dead = self.outbox.counts()
+        parts = [f"{self.sent} sent in {self.requests} requests"]
+        if self.failed:
+            parts.append(f"{self.failed} failed")
+        parts.append(f"{pending} pending")
+        if dead:
+            parts.append(f"{dead} dead")
+        return ", ".join(parts)
+
+
+class MutationBatcher:
+    """Collect rows for a bulk mutation and hand them to the outbox.
+
+    Bulk mutations take ``{"rows": [...]}``; the flusher sends queued rows
+    in size-bounded batches. Rows are buffered in memory up to the same
+    bounds and then written to the outbox in one transaction. ``results``
+    holds one ``{"ok": bool}`` per row added, in order — ok once queued.
+    """
+
+    def __init__(self, fn_name: str, max_rows=None, max_bytes=None):
+        self.fn_name = fn_name
+        self.max_rows = max_rows or BATCH_MAX_ROWS
+        self.max_bytes = max_bytes or BATCH_MAX_BYTES
+        self.results = []
+        self.writes = 0
+        self.added = 0
+        self._rows = []
+        self._bytes = 0
+
+    @property
+    def ok(self) -> int:
+        return sum(1 for r in self.results if r.get("ok"))
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.ok
+
+    def all_ok(self, start: int, end: int) -> bool:
+        """True if rows ``start:end`` (indices returned by add) all succeeded."""
+        return all(r.get("ok") for r in self.results[start:end])
+
+    def add(self, row: dict, key: str = None, targets=None) -> int:
+        """Buffer ``row``; ``key`` is its idempotency key (default: content hash).
+
+        ``targets`` limits the deployments it goes to (default: all).
+        """
+        index = self.added
+        self.added += 1
+        size = len(json.dumps(row, default=str))
+        if self._rows and self._bytes + size > self.max_bytes:
+            self.flush()
+        self._rows.append((key or _hash_obj(row), row, targets))
+        self._bytes += size
+        if len(self._rows) >= self.max_rows:
+            self.flush()
+        return index
+
+    def flush(self):
+        if not self._rows:
+            return
+        rows, self._rows, self._bytes = self._rows, [], 0
+        self.writes += 1
+        for d in deployments():
+            items = [(k, r) for k, r, t in rows if t is None or d in t]
+            if items:
+                d.outbox().put_many(self.fn_name, items, bulk=True)
+        self.results.extend({"ok": True} for _ in rows)
+
+    def report(self) -> str:
+        failed = f", {self.failed} failed" if self.failed else ""
+        return f"{self.ok}/{len(self.results)} queued{failed}"
+
+
+class StateStore:
+    """Sync state in a local SQLite file, one row per ``(namespace, key)``.
+
+    Values are JSON. Writers touch only the keys they change, each batch in
+    one transaction, so concurrent syncers never rewrite each other's state.
+    Keys may carry a TTL; expired ones read as absent and are dropped by
+    ``compact``, which also reclaims free pages once enough pile up.
+    """
+
+    def __init__(self, path: str = None):
+        import sqlite3
+
+        self.path = path or STATE_PATH
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS state (
+                ns TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (ns, key)
+            ) WITHOUT ROWID"""
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def items(self, ns: str) -> dict:
+        """Live keys of ``ns``, least recently written first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM state WHERE ns = ?"
+                " AND (expires_at IS NULL OR expires_at > ?) ORDER BY updated_at",
+                (ns, time.time()),
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def get(self, ns: str, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state WHERE ns = ? AND key = ?"
+                " AND (expires_at IS NULL OR expires_at > ?)",
+                (ns, key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def save(self, ns: str, values: dict, removed=(), ttl: float = None):
+        """Write ``values`` and delete ``removed`` keys in one transaction."""
+        if not values and not removed:
+            return
+        now = time.time()
+        expires = now + ttl if ttl else None
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO state VALUES (?, ?, ?, ?, ?)",
+                [
+                    (ns, key, json.dumps(value, separators=(",", ":")), now, expires)
+                    for key, value in values.items()
+                ],
+            )
+            self._conn.executemany(
+                "DELETE FROM state WHERE ns = ? AND key = ?",
+                [(ns, key) for key in removed],
+            )
+
+    def touch(self, ns: str, keys, ttl: float = None):
+        """Mark ``keys`` as just used, restarting their TTL."""
+        now = time.time()
+        expires = now + ttl if ttl else None
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE state SET updated_at = ?, expires_at = ?"
+                " WHERE ns = ? AND key = ?",
+                [(now, expires, ns, key) for key in keys],
+            )
+
+    def namespaces(self) -> list:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT ns FROM state").fetchall()
+        return [ns for (ns,) in rows]
+
+    def clear(self, ns: str):
+        """Delete every key of ``ns``."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM state WHERE ns = ?", (ns,))
+
+    def compact(self, min_free: float = 0.25) -> int:
+        """Drop expired keys and vacuum if ``min_free`` of the file is unused.
+
+        Returns the number of keys dropped.
+        """
+        with self._lock:
+            with self._conn:
+                dropped = self._conn.execute(
+                    "DELETE FROM state WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+            pages = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            free = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if pages and free / pages >= min_free:
+                self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return dropped
+
+    def import_legacy(self, state_path: str, parse_cache_path: str):
+        """Move the old JSON state and parse cache into an empty store.
+
+        ``rows:<table>`` entries become namespaces of their own; the rest go
+        to ``sync``. Imported files are renamed to ``*.bak``.
+        """
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM state LIMIT 1").fetchone():
+                return
+        for path, load in (
+            (state_path, self._import_state),
+            (parse_cache_path, self._import_parse_cache),
+        ):
+            try:
+                with open(path) as f:
+                    load(json.load(f))
+            except (OSError, ValueError):
+                continue
+            os.replace(path, f"{path}.bak")
+            print(f"  📦 Imported {os.path.basename(path)} into the state store")
+
+    def _import_state(self, data: dict):
+        plain = {}
+        for key, value in data.items():
+            if key.startswith("rows:") and isinstance(value, dict):
+                self.save(key, value)
+            else:
+                plain[key] = value
+        self.save("sync", plain)
+
+    def _import_parse_cache(self, data: dict):
+        self.save("parse", data, ttl=PARSE_CACHE_TTL)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_state_store = None
+_state_store_lock = threading.Lock()
+
+
+def state_store() -> StateStore:
+    """Process-wide StateStore, opened (and migrated) on first use."""
+    global _state_store
+    with _state_store_lock:
+        if _state_store is None:
+            _state_store = StateStore()
+            _state_store.import_legacy(LEGACY_STATE_PATH, PARSE_CACHE_PATH)
+        return _state_store
+
+
+class RowHashes:
+    """Content hashes of the last queued version of each document in a table.
+
+    Keyed by the table's natural key (e.g. ``date`` for healthSnapshots) and
+    persisted per deployment in its ``rows:<table>`` namespace of the state
+    store. A document goes only to the deployments whose hash differs — the
+    outbox owns delivery from there. ``commit`` records hashes only for rows
+    that made it into the outbox and evicts keys that were not offered this
+    run, i.e. fell out of the window; only keys that changed are written.
+    """
+
+    def __init__(self, table: str):
+        self.table = table
+        self.skipped = 0
+        self._targets = deployments()
+        self._old = {
+            d.name: state_store().items(d.ns(f"rows:{table}")) for d in self._targets
+        }
+        self._new = {d.name: {} for d in self._targets}
+        self._pending = []
+
+    def _changed(self, key: str, digest: str) -> list:
+        """Deployments whose copy of ``key`` is not ``digest``."""
+        changed = []
+        for d in self._targets:
+            if self._old[d.name].get(key) == digest:
+                self._new[d.name][key] = digest
+            else:
+                changed.append(d)
+        if not changed:
+            self.skipped += 1
+            METRICS.add(rows_skipped=1)
+        return changed
+
+    def _digest(self, doc: dict):
+        return _hash_obj(doc)
+
+    def add(self, batch: "MutationBatcher", key: str, doc: dict):
+        """Queue ``doc`` on ``batch`` unless it is unchanged since last upload."""
+        digest = self._digest(doc)
+        targets = self._changed(key, digest)
+        if not targets:
+            return None
+        index = batch.add(doc, key=key, targets=targets)
+        self._pending.append((key, digest, batch, index, targets))
+        return index
+
+    def stale(self, key: str, doc: dict) -> bool:
+        """True if ``add`` or ``send`` would queue ``doc`` anywhere."""
+        digest = self._digest(doc)
+        return any(self._old[d.name].get(key) != digest for d in self._targets)
+
+    def send(self, fn_name: str, key: str, doc: dict):
+        """Queue a single ``fn_name`` mutation unless unchanged.
+
+        Returns None when skipped, True once queued.
+        """
+        digest = self._digest(doc)
+        targets = self._changed(key, digest)
+        if not targets:
+            return None
+        enqueue(fn_name, [(key, doc)], bulk=False, targets=targets)
+        for d in targets:
+            self._new[d.name][key] = digest
+        return True
+
+    ttl = None
+
+    def commit(self):
+        for key, digest, batch, index, targets in self._pending:
+            if index < len(batch.results) and batch.results[index].get("ok"):
+                for d in targets:
+                    self._new[d.name][key] = digest
+        self._pending = []
+        for d in self._targets:
+            old, new = self._old[d.name], self._new[d.name]
+            state_store().save(
+                d.ns(f"rows:{self.table}"),
+                {k: v for k, v in new.items() if old.get(k) != v},
+                removed=old.keys() - new.keys(),
+                ttl=self.ttl,
+            )
+        self._old = {name: dict(new) for name, new in self._new.items()}
+
+
+class RowPatches(RowHashes):
+    """RowHashes that hashes each field and sends only the fields that moved.
+
+    A document a deployment has no field hashes for goes out whole through
+    the upsert; after that only changed fields go to the companion ``patch``
+    mutation, with ``key_fields`` to find the document and ``unset`` naming
+    fields that disappeared. Field hashes expire after
+    ``PATCH_BASELINE_TTL``, so every document is re-sent whole now and then
+    and a patch that never landed cannot leave it stale for long.
+    """
+
+    ttl = PATCH_BASELINE_TTL
+
+    def __init__(self, table: str, key_fields):
+        super().__init__(table)
+        self.key_fields = tuple(key_fields)
+        self.patched = 0
+
+    def _digest(self, doc: dict):
+        return {field: _hash_obj(value)[:16] for field, value in doc.items()}
+
+    def _plan(self, key: str, doc: dict, digest: dict, targets):
+        """Group ``targets`` by what they need: ``[(patch row or None, [d])]``."""
+        plans = {}
+        for d in targets:
+            old = self._old[d.name].get(key)
+            row = None
+            if isinstance(old, dict):
+                row = {f: doc[f] for f in self.key_fields}
+                row.update((f, doc[f]) for f, h in digest.items() if old.get(f) != h)
+                unset = sorted(old.keys() - digest.keys())
+                if unset:
+                    row["unset"] = unset
+            plan = plans.setdefault(_hash_obj(row), (row, []))
+            plan[1].append(d)
+        return list(plans.values())
+
+    def add(self, batch, key: str, doc: dict, patches: "MutationBatcher" = None):
+        """Queue ``doc`` whole on ``batch`` or its changes on ``patches``.
+
+        Returns None when unchanged everywhere, True once queued.
+        """
+        digest = self._digest(doc)
+        targets = self._changed(key, digest)
+        if not targets:
+            return None
+        for row, ds in self._plan(key, doc, digest, targets):
+            if row is None:
+                index = batch.add(doc, key=key, targets=ds)
+                self._pending.append((key, digest, batch, index, ds))
+            else:
+                # Patches to one document must all arrive, so each gets its
+                # own outbox key instead of replacing the pending one.
+                index = patches.add(row, key=f"{key}|{_hash_obj(row)}", targets=ds)
+                self._pending.append((key, digest, patches, index, ds))
+                self.patched += 1
+        return True
+
+    def send(self, fn_name: str, key: str, doc: dict, patch_fn: str = None):
+        """Queue ``doc`` through ``fn_name`` or its changes through ``patch_fn``.
+
+        Returns None when unchanged everywhere, True once queued.
+        """
+        digest = self._digest(doc)
+        targets = self._changed(key, digest)
+        if not targets:
+            return None
+        for row, ds in self._plan(key, doc, digest, targets):
+            if row is None:
+                enqueue(fn_name, [(key, doc)], bulk=False, targets=ds)
+            else:
+                item = (f"{key}|{_hash_obj(row)}", row)
+                enqueue(patch_fn, [item], bulk=False, targets=ds)
+                self.patched += 1
+            for d in ds:
+                self._new[d.name][key] = digest
+        return True
+
+
+class DeploymentMarks:
+    """Per-deployment watermarks in the state store, kept like RowHashes.
+
+    ``marks[d.name]`` is deployment ``d``'s ``{key: mark}`` from its
+    ``d.ns(namespace)`` namespace. A syncer compares each deployment's
+    marks with what it read, queues the difference for the deployments
+    that need it and updates their marks; ``commit`` writes back only the
+    keys that changed and, given ``keep``, drops every other key.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.targets = deployments()
+        self._old = {d.name: state_store().items(d.ns(namespace)) for d in self.targets}
+        self.marks = {name: dict(old) for name, old in self._old.items()}
+
+    def commit(self, keep=None):
+        for d in self.targets:
+            old, new = self._old[d.name], self.marks[d.name]
+            if keep is not None:
+                new = {k: v for k, v in new.items() if k in keep}
+            state_store().save(
+                d.ns(self.namespace),
+                {k: v for k, v in new.items() if old.get(k) != v},
+                removed=old.keys() - new.keys(),
+            )
+            self._old[d.name] = dict(new)
+
+
+# State store namespaces tracking what each deployment has been sent, besides
+# its rows:<table> hashes; Deployment.ns suffixes them per deployment.
+DEPLOYMENT_NAMESPACES = ("trade_log", "equity_marks")
+
+
+def _load_state() -> dict:
+    return state_store().items("sync")
 
 
 def _hash_obj(obj) -> str:
@@ -79,29 +1593,481 @@ def _file_sig(path: str):
         return None
 
 
-def _changed(state: dict, key: str, sig) -> bool:
-    if state.get(key) == sig:
-        return False
-    state[key] = sig
-    return True
+class _ThreadOutput(io.TextIOBase):
+    """stdout proxy that lets each worker thread buffer its own output."""
 
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
 
-def sync_health(state: dict):
-    """Sync Garmin health data — today + 7 day history."""
-    print("📊 Syncing health data...")
+    def capture(self):
+        self._local.buf = io.StringIO()
 
-    today = fetch_api_bridge("/garmin/today")
-    last_sync = (today or {}).get("last_sync")
-    if last_sync and not _changed(state, "health", {"garmin_last_sync": last_sync}):
-        print("  ↩ Garmin unchanged — skipping")
-        return
+    def release(self) -> str:
+        buf = getattr(self._local, "buf", None)
+        self._local.buf = None
+        return buf.getvalue() if buf else ""
 
-    # Fetch 7-day data (dict with daily[], sleep[], hrv[], training_readiness etc)
-    data = fetch_api_bridge("/garmin/data?days=7")
-    if not data or not isinstance(data, dict):
-        print("  ⚠ No garmin data returned")
+    def write(self, s):
+        buf = getattr(self._local, "buf", None)
+        return (buf or self._stream).write(s)
+
+    def flush(self):
+        self._stream.flush()
+
+
+def _run_syncers(jobs, state: dict, workers: int = 1):
+    """Run syncers serially or on a thread pool.
+
+    Each syncer works on its own copy of ``state``; keys it changed are merged
+    back under a lock once it returns and written to the state store. A
+    syncer that raises has its state changes discarded so it is retried next
+    run, and never affects the others.
+    """
+    lock = threading.Lock()
+
+    def _run(fn):
+        with lock:
+            snapshot = dict(state)
+        local = dict(snapshot)
+        t0 = time.monotonic()
+        try:
+            with METRICS.syncer(fn.__name__):
+                fn(local)
+        except Exception as e:
+            print(f"  ⚠ {fn.__name__} failed: {e}")
+            return time.monotonic() - t0
+        changed = {k: v for k, v in local.items() if snapshot.get(k) != v}
+        removed = snapshot.keys() - local.keys()
+        with lock:
+            state.update(changed)
+            for k in removed:
+                state.pop(k, None)
+            state_store().save("sync", changed, removed)
+        return time.monotonic() - t0
+
+    if workers <= 1 or len(jobs) <= 1:
+        for fn in jobs:
+            _run(fn)
         return
 
+    out = _ThreadOutput(sys.stdout)
+
+    def _run_captured(fn):
+        out.capture()
+        try:
+            elapsed = _run(fn)
+        finally:
+            text = out.release()
+        return text, elapsed
+
+    real_stdout, sys.stdout = sys.stdout, out
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_captured, fn): fn for fn in jobs}
+            for fut in as_completed(futures):
+                text, elapsed = fut.result()
+                real_stdout.write(text)
+                real_stdout.write(f"  ⏱ {futures[fut].__name__} {elapsed:.1f}s\n")
+                real_stdout.flush()
+    finally:
+        sys.stdout = real_stdout
+
+
+# Tables only ever appended to: max(rowid) + count(*) is a complete fingerprint.
+# Everything else is also content-hashed, since agents update rows in place.
+QUARK_APPEND_ONLY = {"xp_log", "weed_log"}
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+class QuarkSnapshot:
+    """Consistent read-only in-memory copy of quark.db, shared by all syncers.
+
+    The live file is opened read-only just long enough for one backup, so
+    syncers never hold locks while agents write to it. The backup is only
+    taken once a syncer queries; until then ``fingerprints`` reads the live
+    file directly, so a pass where no syncer's tables changed never copies
+    the database.
+
+    A fingerprint must never be newer than the data a syncer reads, or a
+    write landing in between would be recorded as sent. Once the backup
+    exists fingerprints come from it, and ``file_sig`` is the quark.db
+    signature from before the first read, so a write during the run
+    always makes the next run look again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file_sig = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._fingerprints = {}
+
+    def _connect(self):
+        import sqlite3
+
+        if self.file_sig is None:
+            self.file_sig = _quark_file_sig()
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+
+    def _snapshot(self):
+        import sqlite3
+
+        if self._conn is None:
+            src = self._connect()
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            try:
+                src.backup(conn)
+            finally:
+                src.close()
+            conn.row_factory = sqlite3.Row
+            self._conn = conn
+        return self._conn
+
+    def execute(self, sql: str, params=()):
+        with METRICS.fetching(), self._lock:
+            return _Rows(self._snapshot().execute(sql, params).fetchall())
+
+    @staticmethod
+    def _fingerprint(conn, table: str):
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+        ).fetchone()
+        if not exists:
+            return None
+        count, max_rowid = conn.execute(
+            f'SELECT count(*), max(rowid) FROM "{table}"'
+        ).fetchone()
+        fp = f"{count}:{max_rowid}"
+        if table not in QUARK_APPEND_ONLY:
+            h = hashlib.sha256()
+            for row in conn.execute(f'SELECT * FROM "{table}"'):
+                h.update(repr(tuple(row)).encode())
+            fp += f":{h.hexdigest()[:16]}"
+        return fp
+
+    def fingerprints(self, tables) -> dict:
+        """Fingerprints of ``tables``, read in one transaction.
+
+        They come from the backup once it was taken and from the live file
+        before that. Each is computed at most once per snapshot. Only tables
+        that are not append-only have their rows hashed, since agents
+        update those in place.
+        """
+        with METRICS.fetching(), self._lock:
+            missing = [t for t in tables if t not in self._fingerprints]
+            if missing and self._conn is not None:
+                for table in missing:
+                    self._fingerprints[table] = self._fingerprint(self._conn, table)
+            elif missing:
+                conn = self._connect()
+                try:
+                    conn.execute("BEGIN")
+                    for table in missing:
+                        self._fingerprints[table] = self._fingerprint(conn, table)
+                finally:
+                    conn.close()
+            return {t: self._fingerprints[t] for t in tables}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+
+
+_quark = None
+_quark_lock = threading.Lock()
+
+
+def _quark_file_sig():
+    sigs = []
+    for path in (QUARK_DB, f"{QUARK_DB}-wal"):
+        try:
+            st = os.stat(path)
+            sigs.append([st.st_mtime_ns, st.st_size])
+        except OSError:
+            sigs.append(None)
+    return sigs
+
+
+def quark_snapshot():
+    """The run's QuarkSnapshot, taken on first use; None if quark.db is missing."""
+    global _quark
+    with _quark_lock:
+        if _quark is None and os.path.exists(QUARK_DB):
+            _quark = QuarkSnapshot(QUARK_DB)
+        return _quark
+
+
+def reset_quark_snapshot():
+    global _quark
+    with _quark_lock:
+        if _quark is not None:
+            _quark.close()
+        _quark = None
+
+
+# --- Syncer registry ---------------------------------------------------------
+
+
+class SyncInput:
+    """A source a syncer reads, fingerprinted to tell whether it moved.
+
+    ``fingerprint`` gets the previous fingerprint so it can return it as-is
+    when a cheap check shows nothing changed; None means "cannot tell" and
+    always runs the syncer. ``watch`` lists ``(directory, names, recursive)``
+    targets for ``SourceWatcher``.
+    """
+
+    def key(self) -> str:
+        raise NotImplementedError
+
+    def fingerprint(self, prev):
+        raise NotImplementedError
+
+    def differs(self, prev, cur) -> bool:
+        return prev != cur
+
+    def watch(self):
+        return []
+
+
+class FileInput(SyncInput):
+    def __init__(self, path: str):
+        self.path = path
+
+    def key(self):
+        return f"file:{self.path}"
+
+    def fingerprint(self, prev):
+        return _file_sig(os.path.expanduser(self.path)) or "missing"
+
+    def watch(self):
+        path = os.path.expanduser(self.path)
+        return [(os.path.dirname(path), {os.path.basename(path)}, False)]
+
+
+class DirectoryInput(SyncInput):
+    """Files in a directory (and its direct subdirectories if ``recursive``).
+
+    Only files named in ``names`` or ending in ``suffix`` count.
+    """
+
+    def __init__(self, path: str, names=None, suffix=None, recursive=False):
+        self.path = path
+        self.names = set(names) if names else None
+        self.suffix = suffix
+        self.recursive = recursive
+
+    def key(self):
+        return f"dir:{self.path}"
+
+    def _wanted(self, name: str) -> bool:
+        if self.names is not None and name not in self.names:
+            return False
+        return not self.suffix or name.endswith(self.suffix)
+
+    def fingerprint(self, prev):
+        sigs = []
+        dirs = [("", os.path.expanduser(self.path))]
+        while dirs:
+            prefix, path = dirs.pop()
+            try:
+                with os.scandir(path) as it:
+                    for e in it:
+                        rel = f"{prefix}{e.name}"
+                        if e.is_dir():
+                            if self.recursive and not prefix:
+                                dirs.append((f"{rel}/", e.path))
+                        elif self._wanted(e.name):
+                            st = e.stat()
+                            sigs.append((rel, st.st_size, st.st_mtime_ns))
+            except OSError:
+                continue
+        return _hash_obj(sorted(sigs))
+
+    def watch(self):
+        return [(os.path.expanduser(self.path), self.names, self.recursive)]
+
+
+class QuarkTables(SyncInput):
+    """Tables in quark.db; they are only fingerprinted once the file moved.
+
+    The file check is a stat of quark.db and its WAL. Only when it moved are
+    the tables themselves read: ``count(*)`` and ``max(rowid)``, plus a row
+    hash for tables edited in place.
+    """
+
+    def __init__(self, *tables: str):
+        self.tables = tables
+
+    def key(self):
+        return f"quark:{','.join(self.tables)}"
+
+    def fingerprint(self, prev):
+        file_sig = _quark_file_sig()
+        if prev and prev.get("file") == file_sig:
+            return prev
+        snap = quark_snapshot()
+        if not snap:
+            return {"file": file_sig, "tables": {}}
+        fps = snap.fingerprints(self.tables)
+        return {"file": snap.file_sig, "tables": fps}
+
+    def differs(self, prev, cur):
+        return (prev or {}).get("tables") != cur["tables"]
+
+    def watch(self):
+        return [(os.path.dirname(QUARK_DB), {"quark.db", "quark.db-wal"}, False)]
+
+
+class GitRefs(SyncInput):
+    """Commit ids of ``refs`` (e.g. ``origin/main``) in ``repo``."""
+
+    def __init__(self, repo: str, *refs: str):
+        self.repo = repo
+        self.refs = refs
+
+    def key(self):
+        return f"git:{self.repo}:{','.join(self.refs)}"
+
+    def fingerprint(self, prev):
+        import subprocess
+
+        full = [f"refs/remotes/{r}" for r in self.refs]
+        try:
+            with METRICS.fetching():
+                out = subprocess.run(
+                    ["git", "-C", os.path.expanduser(self.repo), "for-each-ref"]
+                    + ["--format=%(refname) %(objectname)"]
+                    + full,
+                    capture_output=True,
+                    text=True,
+                    timeout=10,
+                )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if out.returncode != 0:
+            return None
+        revs = dict(line.split() for line in out.stdout.splitlines() if line)
+        return {r: revs.get(f, "") for r, f in zip(self.refs, full)}
+
+    def watch(self):
+        git_dir = os.path.join(os.path.expanduser(self.repo), ".git")
+        remotes = {}
+        for ref in self.refs:
+            remote, _, name = ref.partition("/")
+            remotes.setdefault(remote, set()).add(name)
+        return [
+            (os.path.join(git_dir, "refs", "remotes", remote), names, False)
+            for remote, names in remotes.items()
+        ] + [(git_dir, {"packed-refs"}, False)]
+
+
+class ApiInput(SyncInput):
+    """An API-bridge endpoint: ``field`` of the response, or all of it.
+
+    The response comes from ``API_BRIDGE``, so the syncer's own request for
+    the same path is served from the run's cache.
+    """
+
+    def __init__(self, path: str, field: str = None):
+        self.path = path
+        self.field = field
+
+    def key(self):
+        return f"api:{self.path}"
+
+    def fingerprint(self, prev):
+        # Errors are left for the syncer to report.
+        data = API_BRIDGE.get(self.path, quiet=True)
+        if data is None:
+            return None
+        if self.field:
+            return data.get(self.field) if isinstance(data, dict) else None
+        return _hash_obj(data)
+
+
+class Today(SyncInput):
+    """The local date, for syncers whose output moves with the calendar."""
+
+    def key(self):
+        return "today"
+
+    def fingerprint(self, prev):
+        return datetime.now().strftime("%Y-%m-%d")
+
+
+class Syncer:
+    def __init__(self, name: str, fn, inputs, aliases=()):
+        self.name = name
+        self.fn = fn
+        self.inputs = inputs
+        self.aliases = aliases
+
+    def inputs_changed(self, state: dict) -> bool:
+        """Fingerprint every input; True if any moved since the last run.
+
+        The new fingerprints go into the syncer's state, so they are only
+        kept if the syncer finishes.
+        """
+        key = f"inputs:{self.name}"
+        prev = state.get(key) or {}
+        cur = {}
+        changed = not self.inputs
+        for inp in self.inputs:
+            k = inp.key()
+            fp = inp.fingerprint(prev.get(k))
+            cur[k] = fp
+            if fp is None or k not in prev or inp.differs(prev[k], fp):
+                changed = True
+        state[key] = cur
+        return changed
+
+
+SYNCERS = {}
+
+
+def syncer(name: str, *inputs: SyncInput, aliases=()):
+    """Register a ``sync_*`` function under ``name`` (for ``--only``).
+
+    The returned function first fingerprints ``inputs`` and skips the
+    syncer when none changed; one without inputs always runs.
+    """
+
+    def register(fn):
+        import functools
+
+        spec = Syncer(name, fn, inputs, aliases)
+
+        @functools.wraps(fn)
+        def run(state: dict):
+            if not spec.inputs_changed(state):
+                print(f"↩ {name}: inputs unchanged — skipping")
+                return
+            return fn(state)
+
+        run.syncer = spec
+        SYNCERS[name] = run
+        return run
+
+    return register
+
+
+QUANTBOX_REPO = "~/.openclaw/repos/quantbox-live"
+
+
+def _garmin_days(data: dict) -> list:
+    """One healthSnapshots row per date in a ``/garmin/data`` response."""
     daily_list = data.get("daily", [])
     sleep_list = data.get("sleep", [])
     hrv_list = data.get("hrv", [])
@@ -153,7 +2119,7 @@ def sync_health(state: dict):
         )
     )
 
-    count = 0
+    days = []
     for date in all_dates:
         day = daily_by_date.get(date, {})
         sleep = sleep_by_date.get(date, {})
@@ -172,12 +2138,165 @@ def sync_health(state: dict):
             "activeCalories": day.get("activeKilocalories"),
             "trainingReadiness": tr_by_date.get(date),
         }
-        args = {k: v for k, v in args.items() if v is not None}
-        if "date" in args:
-            convex_mutation("health:upsertHealth", args)
-            count += 1
+        days.append({k: v for k, v in args.items() if v is not None})
+    return days
+
+
+def rolling_stats(values, window: int):
+    """Trailing ``window``-day mean, standard deviation and count per day.
+
+    ``values`` holds one number per consecutive day, None where the day is
+    missing; each window averages the days it has. Computed from running
+    sums — vectorised with NumPy when it is installed — so every day costs
+    the same whatever the window. Returns ``(means, stds, counts)`` with
+    None for empty windows; the standard deviation is the population one.
+    """
+    n = len(values)
+    # Sums of squares of raw readings (HR ~50, steps ~8000) cancel badly in
+    # the variance; offsetting by one reading keeps a flat series at 0.
+    shift = next((v for v in values if v is not None), 0.0)
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        x = np.array([np.nan if v is None else v for v in values], dtype=float)
+        valid = ~np.isnan(x)
+        x = np.where(valid, x - shift, 0.0)
+        c1 = np.concatenate(([0.0], np.cumsum(x)))
+        c2 = np.concatenate(([0.0], np.cumsum(x * x)))
+        cn = np.concatenate(([0], np.cumsum(valid)))
+        hi = np.arange(1, n + 1)
+        lo = np.maximum(hi - window, 0)
+        counts = cn[hi] - cn[lo]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = (c1[hi] - c1[lo]) / counts
+            stds = np.sqrt(np.maximum((c2[hi] - c2[lo]) / counts - means * means, 0))
+            means += shift
+        counts = counts.tolist()
+        means, stds = means.tolist(), stds.tolist()
+    else:
+        c1, c2, cn = [0.0], [0.0], [0]
+        for v in values:
+            d = 0.0 if v is None else v - shift
+            c1.append(c1[-1] + d)
+            c2.append(c2[-1] + d * d)
+            cn.append(cn[-1] + (v is not None))
+        counts, means, stds = [], [], []
+        for hi in range(1, n + 1):
+            lo = max(hi - window, 0)
+            k = cn[hi] - cn[lo]
+            mean = (c1[hi] - c1[lo]) / k if k else None
+            counts.append(k)
+            means.append(mean)
+            stds.append(
+                max((c2[hi] - c2[lo]) / k - mean * mean, 0) ** 0.5 if k else None
+            )
+            if k:
+                means[-1] += shift
+    return (
+        [m if k else None for m, k in zip(means, counts)],
+        [s if k else None for s, k in zip(stds, counts)],
+        counts,
+    )
 
-    print(f"  ✓ Synced {count} daily snapshots")
+
+def _zscore(value, mean, std):
+    if value is None or mean is None or not std:
+        return None
+    return round((value - mean) / std, 2)
+
+
+def health_aggregates(history: dict, as_of: str) -> list:
+    """Rolling aggregates of each ``HEALTH_METRICS`` as of ``as_of``.
+
+    ``history`` maps dates to ``{metric: value}``. Each document carries the
+    mean, standard deviation and day count over ``HEALTH_WINDOWS``, the
+    previous week's mean, z-scores of the day's value and of the 7-day mean
+    against the longest window (the baseline), and the day's z-score for the
+    last ``HEALTH_Z_DAYS`` days.
+    """
+    base = max(HEALTH_WINDOWS)
+    end = datetime.strptime(as_of, "%Y-%m-%d")
+    span = base + HEALTH_Z_DAYS
+    dates = [
+        (end - timedelta(days=span - 1 - i)).strftime("%Y-%m-%d") for i in range(span)
+    ]
+    docs = []
+    for metric in HEALTH_METRICS:
+        values = [(history.get(d) or {}).get(metric) for d in dates]
+        if not any(v is not None for v in values[-base:]):
+            continue
+        stats = {w: rolling_stats(values, w) for w in HEALTH_WINDOWS}
+        means, stds, _ = stats[base]
+        doc = {"metric": metric, "date": as_of}
+        if values[-1] is not None:
+            doc["value"] = values[-1]
+        for w, (w_means, w_stds, w_counts) in stats.items():
+            if w_counts[-1]:
+                doc[f"mean{w}"] = round(w_means[-1], 2)
+                doc[f"std{w}"] = round(w_stds[-1], 2)
+            doc[f"n{w}"] = w_counts[-1]
+        week = stats.get(7)
+        if week and week[0][-8] is not None:
+            doc["prevMean7"] = round(week[0][-8], 2)
+        z = _zscore(values[-1], means[-1], stds[-1])
+        if z is not None:
+            doc["z"] = z
+        if week:
+            z7 = _zscore(week[0][-1], means[-1], stds[-1])
+            if z7 is not None:
+                doc["z7"] = z7
+        doc["zHistory"] = [
+            {"date": d, "value": z}
+            for d, v, m, sd in zip(
+                dates[-HEALTH_Z_DAYS:],
+                values[-HEALTH_Z_DAYS:],
+                means[-HEALTH_Z_DAYS:],
+                stds[-HEALTH_Z_DAYS:],
+            )
+            if (z := _zscore(v, m, sd)) is not None
+        ]
+        docs.append(doc)
+    return docs
+
+
+def _record_health_history(days) -> dict:
+    """Merge daily rows into the local metric history; returns all of it.
+
+    Only days whose metrics changed are written, each kept for
+    ``HEALTH_HISTORY_DAYS``.
+    """
+    seen = {}
+    for day in days:
+        metrics = seen.setdefault(day["date"], {})
+        metrics.update((m, day[m]) for m in HEALTH_METRICS if m in day)
+    history = state_store().items("health")
+    changed = {}
+    for date, metrics in seen.items():
+        if metrics and history.get(date) != metrics:
+            changed[date] = history[date] = metrics
+    state_store().save("health", changed, ttl=HEALTH_HISTORY_DAYS * 86400)
+    return history
+
+
+@syncer("health", ApiInput("/garmin/today", "last_sync"))
+def sync_health(state: dict):
+    """Sync Garmin health data — today + 7 day history, plus rolling aggregates."""
+    print("📊 Syncing health data...")
+
+    # Both requests go out together; /garmin/data is wasted only on a skip.
+    API_BRIDGE.prefetch(GARMIN_HEALTH_PATHS)
+    today = fetch_api_bridge("/garmin/today")
+
+    # Fetch 7-day data (dict with daily[], sleep[], hrv[], training_readiness etc)
+    data = fetch_api_bridge("/garmin/data?days=7")
+    if not data or not isinstance(data, dict):
+        print("  ⚠ No garmin data returned")
+        return
+
+    days = _garmin_days(data)
 
     # Also fetch today's live data
     if today:
@@ -205,28 +2324,51 @@ def sync_health(state: dict):
             "trainingReadiness": tr.get("score") if isinstance(tr, dict) else None,
         }
         args = {k: v for k, v in args.items() if v is not None}
-        convex_mutation("health:upsertHealth", args)
+        days.append(args)
         print(
             f"  ✓ Today: HRV={args.get('hrv')}, Sleep={args.get('sleepScore')}, BB={args.get('bodyBattery')}, TR={args.get('trainingReadiness')}"
         )
 
+    batch = MutationBatcher("health:upsertHealthSnapshots")
+    rows = RowHashes("healthSnapshots")
+    for args in days:
+        rows.add(batch, args["date"], args)
+    batch.flush()
+    rows.commit()
+    print(f"  ✓ Synced daily snapshots: {batch.report()}, {rows.skipped} unchanged")
+
+    # Rolling aggregates come from the local history, which each run extends
+    # by the days it saw. Until it covers the baseline window, try once a
+    # day to fill it from a longer bridge request.
+    history = _record_health_history(days)
+    as_of = max(history) if history else None
+    if len(history) < max(HEALTH_WINDOWS) and state.get("health_backfill") != as_of:
+        backfill = fetch_api_bridge(GARMIN_BACKFILL_PATH)
+        if isinstance(backfill, dict):
+            history = _record_health_history(_garmin_days(backfill))
+        state["health_backfill"] = as_of
+    if not as_of:
+        return
+    batch = MutationBatcher("health:upsertHealthAggregates")
+    rows = RowHashes("healthAggregates")
+    for doc in health_aggregates(history, as_of):
+        rows.add(batch, doc["metric"], doc)
+    batch.flush()
+    rows.commit()
+    print(
+        f"  ✓ Health aggregates ({len(history)} days of history): "
+        f"{batch.report()}, {rows.skipped} unchanged"
+    )
+
 
+@syncer("tes", QuarkTables("character", "xp_log"))
 def sync_tes(state: dict):
     print("🧬 Syncing TES character...")
-    import sqlite3
-
-    db_path = f"{WORKSPACE}/data/quark.db"
-    if not os.path.exists(db_path):
+    if not os.path.exists(QUARK_DB):
         print("  ⚠ quark.db not found")
         return
 
-    sig = _file_sig(db_path)
-    if sig and not _changed(state, "tes", sig):
-        print("  ↩ TES unchanged — skipping")
-        return
-
-    db = sqlite3.connect(db_path)
-    db.row_factory = sqlite3.Row
+    db = quark_snapshot()
 
     # Read character table (key/value)
     char_rows = db.execute("SELECT key, value FROM character").fetchall()
@@ -265,31 +2407,28 @@ def sync_tes(state: dict):
             args["xp"] = 0
             args["totalXp"] = 0
 
-    convex_mutation("tes:upsertTes", args)
+    rows = RowHashes("tesCharacter")
+    sent = rows.send("tes:upsertTes", "character", args)
+    rows.commit()
+    if sent is None:
+        print("  ↩ TES content unchanged — not sent")
+        return
     print(
         f"  ✓ Level {args['level']}, XP {args['xp']}, {len(args.get('badges', []))} badges"
     )
-    db.close()
 
 
+# The streak counts days since last use, so it moves daily on its own.
+@syncer("weed", QuarkTables("weed_log"), Today(), aliases=("ziolo",))
 def sync_weed(state: dict):
     print("🌿 Syncing weed tracker...")
-    import sqlite3
-
-    db_path = f"{WORKSPACE}/data/quark.db"
-    if not os.path.exists(db_path):
+    if not os.path.exists(QUARK_DB):
         print("  ⚠ quark.db not found")
         return
 
-    sig = _file_sig(db_path)
-    if sig and not _changed(state, "weed", sig):
-        print("  ↩ Weed unchanged — skipping")
-        return
-
-    db = sqlite3.connect(db_path)
-    db.row_factory = sqlite3.Row
-
     now = datetime.now()
+    db = quark_snapshot()
+
     current_month = now.strftime("%Y-%m")
     current_year = now.strftime("%Y")
 
@@ -325,42 +2464,577 @@ def sync_weed(state: dict):
         "yearlyUseDays": yearly_use,
         "yearlyGoal": 96,
     }
-    convex_mutation("ziolo:upsertZiolo", args)
+    rows = RowHashes("zioloTracker")
+    sent = rows.send("ziolo:upsertZiolo", "tracker", args)
+    rows.commit()
+    if sent is None:
+        print("  ↩ Weed tracker content unchanged — not sent")
+        return
     print(
         f"  ✓ Streak: {current_streak}d, Monthly: {monthly_use}/8, Yearly: {yearly_use}/96"
     )
-    db.close()
 
 
+class GitObjectReader:
+    """Read git objects through one long-lived ``git cat-file --batch`` process.
+
+    Tree listings and blob reads are a request/response on the process's
+    pipes instead of a ``git show`` / ``git ls-tree`` spawn each. If the
+    process cannot answer — it died, or replied with a header it should
+    not have — the reader stops using it and ``rev``, ``blob`` and
+    ``ls_tree`` fall back to running git once per call.
+    """
+
+    def __init__(self, repo: str):
+        import subprocess
+
+        self.repo = repo
+        self._proc = subprocess.Popen(
+            ["git", "-C", repo, "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._broken = False
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read(self, spec: str):
+        """Return ``(oid, type, data)`` for a revision spec, or None if missing.
+
+        Raises KeyError if the batch process cannot answer for ``spec``.
+        """
+        if "\n" in spec:
+            raise KeyError(spec)
+        with METRICS.fetching(), self._lock:
+            if self._broken:
+                raise KeyError(spec)
+            try:
+                self._proc.stdin.write(spec.encode() + b"\n")
+                self._proc.stdin.flush()
+                header = self._proc.stdout.readline().decode(errors="replace")
+            except (OSError, ValueError):
+                header = ""
+            header = header.rstrip("\n")
+            # "<spec> missing" / "<spec> ambiguous"; the spec may hold spaces.
+            if header.endswith((" missing", " ambiguous")):
+                return None
+            parts = header.split(" ")
+            if len(parts) != 3 or not parts[2].isdigit():
+                # Whatever follows is out of step with our requests.
+                self._broken = True
+                raise KeyError(f"{spec}: unexpected cat-file reply {header!r}")
+            oid, obj_type, size = parts
+            data = self._proc.stdout.read(int(size))
+            self._proc.stdout.read(1)
+        return oid, obj_type, data
+
+    def _git(self, *args):
+        """Output of one ``git`` run in the repo, or None if it failed."""
+        import subprocess
+
+        try:
+            with METRICS.fetching():
+                out = subprocess.run(
+                    ["git", "-C", self.repo, *args],
+                    capture_output=True,
+                    timeout=30,
+                )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return out.stdout if out.returncode == 0 else None
+
+    def rev(self, ref: str) -> str:
+        try:
+            obj = self.read(ref)
+        except KeyError:
+            out = self._git("rev-parse", "--verify", "--quiet", ref)
+            return out.decode().strip() if out else ""
+        return obj[0] if obj else ""
+
+    def blob(self, spec: str):
+        try:
+            obj = self.read(spec)
+        except KeyError:
+            return self._git("show", spec)
+        return obj[2] if obj and obj[1] == "blob" else None
+
+    def ls_tree(self, treeish: str, path: str = ""):
+        """Recursively list blobs under ``treeish:path`` as ``(path, oid)``."""
+        path = path.rstrip("/")
+        try:
+            return self._ls_tree_batch(treeish, path)
+        except KeyError:
+            return self._ls_tree_git(treeish, path)
+
+    def _ls_tree_batch(self, treeish: str, path: str):
+        obj = self.read(f"{treeish}:{path}")
+        if not obj or obj[1] != "tree":
+            return []
+        files = []
+        stack = [(path, obj[2])]
+        oid_len = len(obj[0]) // 2
+        while stack:
+            prefix, data = stack.pop()
+            i = 0
+            while i < len(data):
+                sp = data.index(b" ", i)
+                nul = data.index(b"\0", sp)
+                mode = data[i:sp]
+                name = data[sp + 1 : nul].decode()
+                oid = data[nul + 1 : nul + 1 + oid_len].hex()
+                i = nul + 1 + oid_len
+                full = f"{prefix}/{name}" if prefix else name
+                if mode == b"40000":
+                    sub = self.read(oid)
+                    if sub:
+                        stack.append((full, sub[2]))
+                else:
+                    files.append((full, oid))
+        return sorted(files)
+
+    def _ls_tree_git(self, treeish: str, path: str):
+        out = self._git(
+            "ls-tree", "-r", "-z", treeish, "--", f"{path}/" if path else "."
+        )
+        files = []
+        for entry in (out or b"").split(b"\0"):
+            if entry:
+                meta, name = entry.decode().split("\t", 1)
+                mode, obj_type, oid = meta.split()
+                if obj_type == "blob":
+                    files.append((name, oid))
+        return sorted(files)
+
+    def close(self):
+        if self._proc.poll() is None:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+            self._proc.wait()
+
+
+@syncer(
+    "trading",
+    GitRefs(QUANTBOX_REPO, "origin/main", "origin/quantlab-binance", "origin/paper"),
+    DirectoryInput(os.path.join(QUANTBOX_REPO, "reports"), suffix=".md"),
+)
 def sync_trading(state: dict):
     """Sync trading strategies from quantbox-live repo."""
-    import re
-    import subprocess
-
     print("📈 Syncing trading strategies...")
-    repo = os.path.expanduser("~/.openclaw/repos/quantbox-live")
+    repo = os.path.expanduser(QUANTBOX_REPO)
     if not os.path.isdir(repo):
         print("  ⚠ quantbox-live repo not found")
         return
 
-    def _git_rev(ref: str) -> str:
-        r = subprocess.run(
-            ["git", "-C", repo, "rev-parse", ref],
-            capture_output=True,
-            text=True,
-        )
-        return r.stdout.strip() if r.returncode == 0 else ""
+    with GitObjectReader(repo) as git:
+        _sync_trading(state, repo, git)
+
+
+class ParseCache:
+    """Persistent cache of parsed results, keyed by content address.
+
+    Keys are git blob ids (plus whatever else the parse depends on) or, for
+    working-tree files, size + mtime. Entries live in the ``parse`` namespace
+    of the state store with a TTL that restarts whenever they are used; in
+    memory they are kept in recency order and the least recently used are
+    evicted beyond ``max_entries``. ``save`` writes only what changed.
+    """
+
+    def __init__(
+        self,
+        store: StateStore = None,
+        max_entries: int = PARSE_CACHE_MAX,
+        ttl: float = PARSE_CACHE_TTL,
+    ):
+        from collections import OrderedDict
+
+        self.store = store or state_store()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict(self.store.items("parse"))
+        self._added = set()
+        self._used = set()
+        self._evicted = set()
+
+    def get(self, key: str, compute):
+        """Cached value for ``key``, computing (and storing) it on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._used.add(key)
+                self.hits += 1
+                return self._entries[key]
+        value = compute()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            self._added.add(key)
+            self._evicted.discard(key)
+            while len(self._entries) > self.max_entries:
+                old, _ = self._entries.popitem(last=False)
+                self._added.discard(old)
+                self._evicted.add(old)
+        return value
+
+    def save(self):
+        with self._lock:
+            added = {k: self._entries[k] for k in self._added}
+            self.store.save("parse", added, removed=self._evicted, ttl=self.ttl)
+            self.store.touch(
+                "parse", self._used - self._added - self._evicted, self.ttl
+            )
+            self._added, self._used, self._evicted = set(), set(), set()
+
+
+_parse_cache = None
+_parse_cache_lock = threading.Lock()
+
+
+def parse_cache() -> ParseCache:
+    """Process-wide ParseCache, loaded from the state store on first use."""
+    global _parse_cache
+    with _parse_cache_lock:
+        if _parse_cache is None:
+            _parse_cache = ParseCache()
+        return _parse_cache
+
+
+def _parse_carver_report(md: str, report_date: str) -> dict:
+    """Parse a Carver Trend v1 markdown report into a strategy document."""
+    import re
+
+    def extract_val(pattern, text, as_float=True):
+        m = re.search(pattern, text)
+        if m:
+            v = (
+                m.group(1)
+                .replace(",", "")
+                .replace("$", "")
+                .replace("+", "")
+                .replace("%", "")
+                .strip()
+            )
+            if v == "—" or v == "":
+                return None
+            return float(v) if as_float else v
+        return None
+
+    equity = extract_val(r"Portfolio \(post\)\s*\|\s*\$?([\d,.]+)", md)
+    pnl_match = re.search(r"PnL\s*\|\s*\$?([-\d,.]+)\s*\(([-+\d.]+)%\)", md)
+    pnl = float(pnl_match.group(1).replace(",", "")) if pnl_match else None
+    pnl_pct = float(pnl_match.group(2)) if pnl_match else None
+    net_exp = extract_val(r"Net exposure\s*\|\s*([-+\d.%]+)", md, as_float=False)
+    positions = extract_val(r"Positions\s*\|\s*(\d+)", md)
+
+    r1d = extract_val(r"1 Day\s*\|\s*([-+\d.]+)%", md)
+    r7d = extract_val(r"7 Day\s*\|\s*([-+\d.]+)%", md)
+    r30d = extract_val(r"30 Day\s*\|\s*([-+\d.]+)%", md)
+    ritd = extract_val(r"Inception\s*\|\s*([-+\d.]+)%", md)
+
+    sharpe = extract_val(r"Sharpe\s*\|\s*([-\d.]+)", md)
+    max_dd = extract_val(r"Max Drawdown\s*\|\s*([-\d.]+)%", md)
+    win_rate = extract_val(r"Win Rate\s*\|\s*([\d.]+)%", md)
+
+    # Parse equity curve
+    eq_curve = []
+    for line in md.split("\n"):
+        m = re.match(r"\s+(\d{4}-\d{2}-\d{2})\s+\|+\s+\$?([\d,.]+)", line)
+        if m:
+            eq_curve.append(
+                {
+                    "date": m.group(1),
+                    "value": float(m.group(2).replace(",", "")),
+                }
+            )
 
-    revs = {
-        "main": _git_rev("origin/main"),
-        "binance": _git_rev("origin/quantlab-binance"),
-        "paper": _git_rev("origin/paper"),
+    # Parse position breakdown table
+    # | Symbol | Target Wt | Actual Wt | Drift | Notional | Unrealized PnL |
+    pos_breakdown = []
+    in_pos_table = False
+    for line in md.split("\n"):
+        if "Position Reconciliation" in line or (
+            "Symbol" in line and "Target Wt" in line
+        ):
+            in_pos_table = True
+            continue
+        if in_pos_table:
+            # skip header separator
+            if re.match(r"^\|[\s:|-]+\|", line):
+                continue
+            # stop at next section
+            if line.startswith("#") or (line.strip() and not line.startswith("|")):
+                break
+            pos_m = re.match(
+                r"\|\s*([A-Z]+)\s*\|\s*([-+\d.]+)%\s*\|\s*([-+\d.]+)%\s*\|\s*([-+\d.]+)%\s*\|\s*\$?([-\d,.]+)\s*\|\s*\$?([-\d,.]+)\s*\|",
+                line,
+            )
+            if pos_m:
+                actual_wt = float(pos_m.group(3))
+                pos_breakdown.append(
+                    {
+                        "symbol": pos_m.group(1),
+                        "targetWt": float(pos_m.group(2)),
+                        "actualWt": actual_wt,
+                        "drift": float(pos_m.group(4)),
+                        "notional": float(pos_m.group(5).replace(",", "")),
+                        "unrealizedPnl": float(pos_m.group(6).replace(",", "")),
+                        "side": "short"
+                        if actual_wt < 0
+                        else "long"
+                        if actual_wt > 0
+                        else "flat",
+                    }
+                )
+
+    return {
+        "strategyId": "carver_trend_v1",
+        "name": "Carver Trend v1",
+        "mode": "live",
+        "exchange": "Hyperliquid",
+        "equity": equity,
+        "pnl": pnl,
+        "pnlPct": pnl_pct,
+        "return1d": r1d,
+        "return7d": r7d,
+        "return30d": r30d,
+        "returnItd": ritd,
+        "sharpe": sharpe,
+        "maxDrawdown": abs(max_dd) if max_dd else None,
+        "winRate": win_rate,
+        "positions": positions,
+        "netExposure": str(net_exp) if net_exp else None,
+        "equityCurve": eq_curve if eq_curve else None,
+        "positionBreakdown": pos_breakdown if pos_breakdown else None,
+        "reportDate": report_date,
     }
-    if any(revs.values()) and not _changed(state, "trading", revs):
-        print("  ↩ Trading unchanged — skipping")
-        return
+
+
+def _read_text(path: str) -> str:
+    with METRICS.fetching(), open(path) as f:
+        return f.read()
+
+
+def _parse_binance_point(raw: bytes):
+    """``[report_date, portfolio_value]`` from a binance artifact, or None."""
+    ad = json.loads(raw)
+    rd_af = ad.get("report_date", "")
+    pv = ad.get("payload", {}).get("portfolio_value")
+    return [rd_af, pv] if rd_af and pv else None
+
+
+def _parse_binance_artifact(raw: bytes) -> dict:
+    """Strategy document (minus equity curve) from the latest binance artifact."""
+    data = json.loads(raw)
+    p = data.get("payload", {})
+    periods = p.get("periods", {})
+    risk = p.get("risk", {}).get("portfolio", {})
+    rd = data.get("report_date", "")
+    return {
+        "strategyId": "binance_crypto_trend",
+        "name": "CryptoTrend + Momentum",
+        "mode": "live",
+        "exchange": "Binance",
+        "equity": p.get("portfolio_value"),
+        "pnl": periods.get("CTD", {}).get("pnl_usdc"),
+        "pnlPct": periods.get("CTD", {}).get("pnl_pct"),
+        "return1d": periods.get("1D", {}).get("twr_pct"),
+        "return7d": periods.get("7D", {}).get("twr_pct"),
+        "return30d": periods.get("30D", {}).get("twr_pct"),
+        "returnItd": periods.get("CTD", {}).get("twr_pct"),
+        "sharpe": risk.get("sharpe_ratio"),
+        "maxDrawdown": abs(risk.get("max_drawdown", 0))
+        if risk.get("max_drawdown")
+        else None,
+        "winRate": None,
+        "positions": len(p.get("asset_allocation", {}).get("holdings", [])),
+        "netExposure": f"{p.get('asset_allocation', {}).get('invested_pct', 0)}%",
+        "reportDate": rd,
+    }
+
+
+def _parse_paper_performance(raw: bytes, sid: str, latest_date: str) -> dict:
+    """Strategy document from a paper ``performance_<sid>.json`` report."""
+    d = json.loads(raw)
+    periods = d.get("periods", {})
+    risk = d.get("risk_metrics", {})
+    eq_curve = d.get("equity_curve", [])
+
+    # Build equity curve for chart
+    chart_data = None
+    if eq_curve and len(eq_curve) > 1:
+        chart_data = [{"date": p["date"], "value": p["equity"]} for p in eq_curve]
+
+    return {
+        "strategyId": f"paper_{sid}",
+        "name": sid.replace("_", " ").title(),
+        "mode": "paper",
+        "exchange": "Paper",
+        "equity": d.get("equity_usdc"),
+        "pnl": d.get("cumulative_pnl_usdc"),
+        "pnlPct": (d.get("cumulative_pnl_usdc", 0) / 10000 * 100)
+        if d.get("cumulative_pnl_usdc")
+        else None,
+        "reportDate": latest_date,
+        "return1d": periods.get("1D", {}).get("return_pct"),
+        "return7d": periods.get("7D", {}).get("return_pct"),
+        "return30d": periods.get("30D", {}).get("return_pct"),
+        "returnItd": periods.get("ITD", {}).get("return_pct"),
+        "sharpe": risk.get("sharpe"),
+        "maxDrawdown": abs(risk.get("max_drawdown", 0)) * 100
+        if risk.get("max_drawdown")
+        else None,
+        "winRate": risk.get("win_rate", 0) * 100 if risk.get("win_rate") else None,
+        "equityCurve": chart_data,
+    }
+
+
+def lttb(xs, ys, threshold: int) -> list:
+    """Indices of the points Largest-Triangle-Three-Buckets keeps.
+
+    The first and last points always stay; in between, each bucket keeps
+    the point forming the largest triangle with the previously kept point
+    and the next bucket's average, so peaks and drawdowns survive. Buckets
+    are scored with NumPy when it is installed.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    every = (n - 2) / (threshold - 2)
+    # Bucket i spans [bounds[i], bounds[i + 1]); the last one is the end point.
+    bounds = [min(int(i * every) + 1, n - 1) for i in range(threshold - 1)] + [n]
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    keep = [0]
+    a = 0
+    if np is not None:
+        x = np.asarray(xs, dtype=float)
+        y = np.asarray(ys, dtype=float)
+        for i in range(threshold - 2):
+            lo, hi, end = bounds[i], bounds[i + 1], bounds[i + 2]
+            avg_x, avg_y = x[hi:end].mean(), y[hi:end].mean()
+            area = np.abs(
+                (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+            )
+            a = lo + int(area.argmax())
+            keep.append(a)
+    else:
+        for i in range(threshold - 2):
+            lo, hi, end = bounds[i], bounds[i + 1], bounds[i + 2]
+            avg_x = sum(xs[hi:end]) / (end - hi)
+            avg_y = sum(ys[hi:end]) / (end - hi)
+            xa, ya = xs[a], ys[a]
+            a = max(
+                range(lo, hi),
+                key=lambda j: abs(
+                    (xa - avg_x) * (ys[j] - ya) - (xa - xs[j]) * (avg_y - ya)
+                ),
+            )
+            keep.append(a)
+    keep.append(n - 1)
+    return keep
+
+
+def _downsample(points: list, threshold: int) -> list:
+    xs = [datetime.strptime(p["date"], "%Y-%m-%d").toordinal() for p in points]
+    ys = [p["value"] for p in points]
+    return [points[i] for i in lttb(xs, ys, threshold)]
+
+
+def equity_resolutions(curve, max_points: int = None) -> dict:
+    """Chart-sized views of an equity curve, keyed by strategy field.
+
+    ``equityCurve30d`` is the last 30 days at full resolution,
+    ``equityCurve`` the last year of daily points and ``equityCurveAll``
+    the whole history as weekly closes; the last two are LTTB-reduced to
+    ``max_points`` so the strategy document stays small however old the
+    strategy is. The full series lives in equityPoints.
+    """
+    max_points = max_points or EQUITY_CHART_POINTS
+    by_date = {p["date"]: p for p in curve or []}
+    points = [by_date[d] for d in sorted(by_date)]
+    if len(points) < 2:
+        return {}
+    last = datetime.strptime(points[-1]["date"], "%Y-%m-%d")
+    d30 = (last - timedelta(days=30)).strftime("%Y-%m-%d")
+    y1 = (last - timedelta(days=365)).strftime("%Y-%m-%d")
+
+    weekly = {}
+    for p in points:
+        week = datetime.strptime(p["date"], "%Y-%m-%d").isocalendar()[:2]
+        weekly[week] = p
+    weekly = list(weekly.values())
+    if weekly[0] is not points[0]:
+        weekly.insert(0, points[0])
+
+    return {
+        "equityCurve30d": [p for p in points if p["date"] > d30],
+        "equityCurve": _downsample([p for p in points if p["date"] > y1], max_points),
+        "equityCurveAll": _downsample(weekly, max_points),
+    }
+
+
+def _queue_equity_points(marks: DeploymentMarks, strategy_id: str, curve) -> int:
+    """Queue the part of ``curve`` each deployment lacks; returns points sent.
+
+    A deployment's mark for ``strategy_id`` remembers the last uploaded date
+    and point plus a hash of everything before that date. Normally only
+    points from that date on go out (the last one again, in case it was
+    revised). If earlier history changed, the whole curve is re-sent with
+    ``replace``. Deployments that need the same points share one entry.
+    """
+    by_date = {p["date"]: p for p in curve}
+    points = [by_date[d] for d in sorted(by_date)]
+    if not points:
+        return 0
+    new_last = points[-1]["date"]
+    new_mark = {
+        "date": new_last,
+        "point": points[-1],
+        "prefix": _hash_obj(points[:-1]),
+    }
+    plans = {}
+    for d in marks.targets:
+        mark = marks.marks[d.name].get(strategy_id) or {}
+        last = mark.get("date")
+        prefix = _hash_obj([p for p in points if last and p["date"] < last])
+        replace = not last or prefix != mark.get("prefix") or new_last < last
+        send = points if replace else [p for p in points if p["date"] >= last]
+        if not replace and send == [mark.get("point")]:
+            continue
+        key = "full" if replace else f"{send[0]['date']}..{new_last}"
+        args = {"strategyId": strategy_id, "points": send, "replace": replace}
+        plans.setdefault(key, (args, []))[1].append(d)
+        marks.marks[d.name][strategy_id] = new_mark
+
+    for key, (args, ds) in plans.items():
+        enqueue(
+            "trading:appendEquityPoints",
+            [(f"{strategy_id}|{key}", args)],
+            bulk=False,
+            targets=ds,
+        )
+    return sum(len(args["points"]) for args, _ in plans.values())
+
+
+def _sync_trading(state: dict, repo: str, git: GitObjectReader):
+    import re
 
     strategies = []
+    cache = parse_cache()
+    hits, misses = cache.hits, cache.misses
 
     # --- 1. Main branch: Carver Trend v1 (Hyperliquid) ---
     try:
@@ -377,121 +3051,14 @@ def sync_trading(state: dict):
             if files:
                 report_path = os.path.join(reports_dir, files[-1])
                 report_date = files[-1].replace(".md", "")
-                with open(report_path) as f:
-                    md = f.read()
-
-                def extract_val(pattern, text, as_float=True):
-                    m = re.search(pattern, text)
-                    if m:
-                        v = (
-                            m.group(1)
-                            .replace(",", "")
-                            .replace("$", "")
-                            .replace("+", "")
-                            .replace("%", "")
-                            .strip()
-                        )
-                        if v == "—" or v == "":
-                            return None
-                        return float(v) if as_float else v
-                    return None
-
-                equity = extract_val(r"Portfolio \(post\)\s*\|\s*\$?([\d,.]+)", md)
-                pnl_match = re.search(r"PnL\s*\|\s*\$?([-\d,.]+)\s*\(([-+\d.]+)%\)", md)
-                pnl = float(pnl_match.group(1).replace(",", "")) if pnl_match else None
-                pnl_pct = float(pnl_match.group(2)) if pnl_match else None
-                net_exp = extract_val(
-                    r"Net exposure\s*\|\s*([-+\d.%]+)", md, as_float=False
-                )
-                positions = extract_val(r"Positions\s*\|\s*(\d+)", md)
-
-                r1d = extract_val(r"1 Day\s*\|\s*([-+\d.]+)%", md)
-                r7d = extract_val(r"7 Day\s*\|\s*([-+\d.]+)%", md)
-                r30d = extract_val(r"30 Day\s*\|\s*([-+\d.]+)%", md)
-                ritd = extract_val(r"Inception\s*\|\s*([-+\d.]+)%", md)
-
-                sharpe = extract_val(r"Sharpe\s*\|\s*([-\d.]+)", md)
-                max_dd = extract_val(r"Max Drawdown\s*\|\s*([-\d.]+)%", md)
-                win_rate = extract_val(r"Win Rate\s*\|\s*([\d.]+)%", md)
-
-                # Parse equity curve
-                eq_curve = []
-                for line in md.split("\n"):
-                    m = re.match(r"\s+(\d{4}-\d{2}-\d{2})\s+\|+\s+\$?([\d,.]+)", line)
-                    if m:
-                        eq_curve.append(
-                            {
-                                "date": m.group(1),
-                                "value": float(m.group(2).replace(",", "")),
-                            }
-                        )
-
-                # Parse position breakdown table
-                # | Symbol | Target Wt | Actual Wt | Drift | Notional | Unrealized PnL |
-                pos_breakdown = []
-                in_pos_table = False
-                for line in md.split("\n"):
-                    if "Position Reconciliation" in line or (
-                        "Symbol" in line and "Target Wt" in line
-                    ):
-                        in_pos_table = True
-                        continue
-                    if in_pos_table:
-                        # skip header separator
-                        if re.match(r"^\|[\s:|-]+\|", line):
-                            continue
-                        # stop at next section
-                        if line.startswith("#") or (
-                            line.strip() and not line.startswith("|")
-                        ):
-                            break
-                        pos_m = re.match(
-                            r"\|\s*([A-Z]+)\s*\|\s*([-+\d.]+)%\s*\|\s*([-+\d.]+)%\s*\|\s*([-+\d.]+)%\s*\|\s*\$?([-\d,.]+)\s*\|\s*\$?([-\d,.]+)\s*\|",
-                            line,
-                        )
-                        if pos_m:
-                            actual_wt = float(pos_m.group(3))
-                            pos_breakdown.append(
-                                {
-                                    "symbol": pos_m.group(1),
-                                    "targetWt": float(pos_m.group(2)),
-                                    "actualWt": actual_wt,
-                                    "drift": float(pos_m.group(4)),
-                                    "notional": float(pos_m.group(5).replace(",", "")),
-                                    "unrealizedPnl": float(
-                                        pos_m.group(6).replace(",", "")
-                                    ),
-                                    "side": "short"
-                                    if actual_wt < 0
-                                    else "long"
-                                    if actual_wt > 0
-                                    else "flat",
-                                }
-                            )
-
-                strategies.append(
-                    {
-                        "strategyId": "carver_trend_v1",
-                        "name": "Carver Trend v1",
-                        "mode": "live",
-                        "exchange": "Hyperliquid",
-                        "equity": equity,
-                        "pnl": pnl,
-                        "pnlPct": pnl_pct,
-                        "return1d": r1d,
-                        "return7d": r7d,
-                        "return30d": r30d,
-                        "returnItd": ritd,
-                        "sharpe": sharpe,
-                        "maxDrawdown": abs(max_dd) if max_dd else None,
-                        "winRate": win_rate,
-                        "positions": positions,
-                        "netExposure": str(net_exp) if net_exp else None,
-                        "equityCurve": eq_curve if eq_curve else None,
-                        "positionBreakdown": pos_breakdown if pos_breakdown else None,
-                        "reportDate": report_date,
-                    }
+                st = os.stat(report_path)
+                carver = cache.get(
+                    f"carver:{report_date}:{st.st_size}:{st.st_mtime_ns}",
+                    lambda: _parse_carver_report(_read_text(report_path), report_date),
                 )
+                strategies.append(carver)
+                equity, sharpe = carver["equity"], carver["sharpe"]
+                pos_breakdown = carver["positionBreakdown"] or []
                 print(
                     f"  ✓ Carver Trend v1: ${equity}, Sharpe {sharpe}, {len(pos_breakdown)} positions"
                 )
@@ -500,134 +3067,52 @@ def sync_trading(state: dict):
 
     # --- 2. quantlab-binance branch: CryptoTrend + Momentum (Binance) ---
     try:
-        result = subprocess.run(
-            [
-                "git",
-                "-C",
-                repo,
-                "show",
-                "origin/quantlab-binance:performance/artifacts/",
-            ],
-            capture_output=True,
-            text=True,
-        )
-        # Find latest date folder
-        if result.returncode == 0:
-            # List performance artifacts via git ls-tree
-            ls = subprocess.run(
-                [
-                    "git",
-                    "-C",
-                    repo,
-                    "ls-tree",
-                    "-r",
-                    "--name-only",
-                    "origin/quantlab-binance",
-                    "performance/artifacts/",
-                ],
-                capture_output=True,
-                text=True,
+        # List performance artifacts (path, blob oid) through the object reader
+        artifacts = [
+            (path, oid)
+            for path, oid in git.ls_tree(
+                "origin/quantlab-binance", "performance/artifacts/"
             )
-            artifact_files = [
-                l for l in ls.stdout.strip().split("\n") if l.endswith("artifact.json")
-            ]
-            if artifact_files:
-                # Build equity curve from all daily artifacts (dedupe by date, take last per day)
-                eq_by_date = {}
-                for af in sorted(artifact_files):
-                    try:
-                        raw_af = subprocess.run(
-                            [
-                                "git",
-                                "-C",
-                                repo,
-                                "show",
-                                f"origin/quantlab-binance:{af}",
-                            ],
-                            capture_output=True,
-                            text=True,
-                        )
-                        if raw_af.returncode == 0:
-                            ad = json.loads(raw_af.stdout)
-                            rd_af = ad.get("report_date", "")
-                            pv = ad.get("payload", {}).get("portfolio_value")
-                            if rd_af and pv:
-                                eq_by_date[rd_af] = pv
-                    except Exception:
-                        pass
+            if path.endswith("artifact.json")
+        ]
+        if artifacts:
+            # Build equity curve from all daily artifacts (dedupe by date, take last per day).
+            # Points are cached per blob, so only artifacts new since last run are read.
+            eq_by_date = {}
+            for _, oid in artifacts:
+                try:
+                    point = cache.get(
+                        f"binance_point:{oid}",
+                        lambda: _parse_binance_point(git.blob(oid)),
+                    )
+                    if point:
+                        eq_by_date[point[0]] = point[1]
+                except Exception:
+                    pass
 
-                eq_curve = [
-                    {"date": dt, "value": v} for dt, v in sorted(eq_by_date.items())
-                ]
+            eq_curve = [
+                {"date": dt, "value": v} for dt, v in sorted(eq_by_date.items())
+            ]
 
-                latest = sorted(artifact_files)[-1]
-                raw = subprocess.run(
-                    ["git", "-C", repo, "show", f"origin/quantlab-binance:{latest}"],
-                    capture_output=True,
-                    text=True,
-                )
-                if raw.returncode == 0:
-                    data = json.loads(raw.stdout)
-                    p = data.get("payload", {})
-                    periods = p.get("periods", {})
-                    risk = p.get("risk", {}).get("portfolio", {})
-                    rd = data.get("report_date", "")
-
-                    strategies.append(
-                        {
-                            "strategyId": "binance_crypto_trend",
-                            "name": "CryptoTrend + Momentum",
-                            "mode": "live",
-                            "exchange": "Binance",
-                            "equity": p.get("portfolio_value"),
-                            "pnl": periods.get("CTD", {}).get("pnl_usdc"),
-                            "pnlPct": periods.get("CTD", {}).get("pnl_pct"),
-                            "return1d": periods.get("1D", {}).get("twr_pct"),
-                            "return7d": periods.get("7D", {}).get("twr_pct"),
-                            "return30d": periods.get("30D", {}).get("twr_pct"),
-                            "returnItd": periods.get("CTD", {}).get("twr_pct"),
-                            "sharpe": risk.get("sharpe_ratio"),
-                            "maxDrawdown": abs(risk.get("max_drawdown", 0))
-                            if risk.get("max_drawdown")
-                            else None,
-                            "winRate": None,
-                            "positions": len(
-                                p.get("asset_allocation", {}).get("holdings", [])
-                            ),
-                            "netExposure": f"{p.get('asset_allocation', {}).get('invested_pct', 0)}%",
-                            "reportDate": rd,
-                            "equityCurve": eq_curve if len(eq_curve) > 1 else None,
-                        }
-                    )
-                    print(
-                        f"  ✓ Binance CryptoTrend: ${p.get('portfolio_value')} ({len(eq_curve)} equity points)"
-                    )
+            latest_oid = artifacts[-1][1]
+            binance = cache.get(
+                f"binance_strategy:{latest_oid}",
+                lambda: _parse_binance_artifact(git.blob(latest_oid)),
+            )
+            binance = dict(binance, equityCurve=eq_curve if len(eq_curve) > 1 else None)
+            strategies.append(binance)
+            print(
+                f"  ✓ Binance CryptoTrend: ${binance['equity']} ({len(eq_curve)} equity points)"
+            )
     except Exception as e:
         print(f"  ⚠ Binance branch parse error: {e}")
 
     # --- 3. Paper branch: 5 paper strategies (from JSON performance files) ---
     try:
-        ls = subprocess.run(
-            [
-                "git",
-                "-C",
-                repo,
-                "ls-tree",
-                "-r",
-                "--name-only",
-                "origin/paper",
-                "reports/",
-            ],
-            capture_output=True,
-            text=True,
-        )
+        paper_tree = dict(git.ls_tree("origin/paper", "reports/"))
         # Find latest report directory with JSON performance files
         json_files = sorted(
-            [
-                l
-                for l in ls.stdout.strip().split("\n")
-                if l.endswith(".json") and "performance_" in l
-            ]
+            [l for l in paper_tree if l.endswith(".json") and "performance_" in l]
         )
         if json_files:
             # Group by date directory
@@ -637,59 +3122,18 @@ def sync_trading(state: dict):
             latest_jsons = [f for f in json_files if f"/{latest_date}/" in f]
 
             for jf in latest_jsons:
-                raw = subprocess.run(
-                    ["git", "-C", repo, "show", f"origin/paper:{jf}"],
-                    capture_output=True,
-                    text=True,
-                )
-                if raw.returncode != 0:
-                    continue
+                # Extract strategy id from filename: performance_carver_trend_n10.json -> carver_trend_n10
+                sid = jf.split("/")[-1].replace("performance_", "").replace(".json", "")
+                oid = paper_tree[jf]
                 try:
-                    d = json.loads(raw.stdout)
+                    s_data = cache.get(
+                        f"paper:{oid}:{jf}",
+                        lambda: _parse_paper_performance(
+                            git.blob(oid), sid, latest_date
+                        ),
+                    )
                 except Exception:
                     continue
-
-                # Extract strategy id from filename: performance_carver_trend_n10.json -> carver_trend_n10
-                fname = (
-                    jf.split("/")[-1].replace("performance_", "").replace(".json", "")
-                )
-                sid = fname
-
-                periods = d.get("periods", {})
-                risk = d.get("risk_metrics", {})
-                eq_curve = d.get("equity_curve", [])
-
-                # Build equity curve for chart
-                chart_data = None
-                if eq_curve and len(eq_curve) > 1:
-                    chart_data = [
-                        {"date": p["date"], "value": p["equity"]} for p in eq_curve
-                    ]
-
-                s_data = {
-                    "strategyId": f"paper_{sid}",
-                    "name": sid.replace("_", " ").title(),
-                    "mode": "paper",
-                    "exchange": "Paper",
-                    "equity": d.get("equity_usdc"),
-                    "pnl": d.get("cumulative_pnl_usdc"),
-                    "pnlPct": (d.get("cumulative_pnl_usdc", 0) / 10000 * 100)
-                    if d.get("cumulative_pnl_usdc")
-                    else None,
-                    "reportDate": latest_date,
-                    "return1d": periods.get("1D", {}).get("return_pct"),
-                    "return7d": periods.get("7D", {}).get("return_pct"),
-                    "return30d": periods.get("30D", {}).get("return_pct"),
-                    "returnItd": periods.get("ITD", {}).get("return_pct"),
-                    "sharpe": risk.get("sharpe"),
-                    "maxDrawdown": abs(risk.get("max_drawdown", 0)) * 100
-                    if risk.get("max_drawdown")
-                    else None,
-                    "winRate": risk.get("win_rate", 0) * 100
-                    if risk.get("win_rate")
-                    else None,
-                    "equityCurve": chart_data,
-                }
                 strategies.append(s_data)
 
             print(
@@ -698,18 +3142,12 @@ def sync_trading(state: dict):
 
         # Fallback: parse markdown if no JSON found
         if not any(s["mode"] == "paper" for s in strategies):
-            paper_files = sorted(
-                [l for l in ls.stdout.strip().split("\n") if l.endswith("_paper.md")]
-            )
+            paper_files = sorted([l for l in paper_tree if l.endswith("_paper.md")])
             if paper_files:
                 latest = paper_files[-1]
-                raw = subprocess.run(
-                    ["git", "-C", repo, "show", f"origin/paper:{latest}"],
-                    capture_output=True,
-                    text=True,
-                )
-                if raw.returncode == 0:
-                    md = raw.stdout
+                raw = git.blob(paper_tree[latest])
+                if raw is not None:
+                    md = raw.decode()
                     report_date = latest.split("/")[-1].replace("_paper.md", "")
                     for row in re.finditer(
                         r"\|\s*(\w+)\s*\|\s*\$?([\d,.]+)\s*\|",
@@ -735,48 +3173,100 @@ def sync_trading(state: dict):
     except Exception as e:
         print(f"  ⚠ Paper branch parse error: {e}")
 
-    # Push to Convex
+    # Push to Convex. Full equity curves go to the append-only equityPoints
+    # path; the strategy document only carries downsampled chart views.
+    rows = RowPatches("tradingStrategies", key_fields=("strategyId",))
+    marks = DeploymentMarks("equity_marks")
+    points_sent = 0
     for s in strategies:
         # Remove None values
         args = {k: v for k, v in s.items() if v is not None}
-        convex_mutation("trading:upsertStrategy", args)
+        curve = args.pop("equityCurve", None) or []
+        points_sent += _queue_equity_points(marks, args["strategyId"], curve)
+        args.update(equity_resolutions(curve))
+        rows.send(
+            "trading:upsertStrategy", args["strategyId"], args, "trading:patchStrategy"
+        )
+    rows.commit()
+    marks.commit()
 
-    print(f"  ✓ Synced {len(strategies)} strategies total")
+    cache.save()
+    print(
+        f"  ✓ Synced {len(strategies)} strategies total, {rows.patched} patched, "
+        f"{rows.skipped} unchanged"
+    )
+    print(f"  ✓ Equity points: {points_sent} queued")
+    print(
+        f"  ✓ Parse cache: {cache.hits - hits} cached, {cache.misses - misses} parsed"
+    )
 
 
+@syncer(
+    "trade_log",
+    DirectoryInput(
+        os.path.join(QUANTBOX_REPO, "reports"),
+        names={"trade_history.json"},
+        recursive=True,
+    ),
+)
 def sync_trade_log(state: dict):
-    """Sync trade fills from Hyperliquid report directories."""
+    """Sync trade fills from Hyperliquid report directories.
+
+    Each deployment's ``trade_log`` marks hold a watermark per report
+    directory: the trade_history.json signature and the ids (content
+    hashes) of the fills already uploaded from it. Directories whose
+    signature matches everywhere are skipped without opening the file;
+    otherwise every fill goes to the deployments that lack its id, so late
+    or back-dated fills are picked up wherever they land in the file. Ids
+    only join a set once their rows were queued.
+    """
     print("📜 Syncing trade log...")
-    reports_dir = os.path.expanduser("~/.openclaw/repos/quantbox-live/reports")
+    reports_dir = os.path.join(os.path.expanduser(QUANTBOX_REPO), "reports")
     if not os.path.isdir(reports_dir):
         print("  ⚠ No reports dir")
         return
 
-    # Collect trade_history.json from last 14 days of report dirs
-    trades_synced = 0
-    for d in sorted(os.listdir(reports_dir)):
-        dir_path = os.path.join(reports_dir, d)
-        if not os.path.isdir(dir_path):
+    marks = DeploymentMarks("trade_log")
+    with os.scandir(reports_dir) as it:
+        entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+
+    batch = MutationBatcher("trading:upsertTrades")
+    pending = []
+    seen = set()
+    skipped = 0
+    for entry in entries:
+        d = entry.name
+        sig = _file_sig(os.path.join(entry.path, "trade_history.json"))
+        if not sig:
             continue
-        th_path = os.path.join(dir_path, "trade_history.json")
-        if not os.path.isfile(th_path):
+        seen.add(d)
+        dir_marks = {t.name: marks.marks[t.name].get(d) or {} for t in marks.targets}
+        need = [t for t in marks.targets if dir_marks[t.name].get("sig") != sig]
+        if not need:
+            skipped += 1
             continue
         try:
-            with open(th_path) as f:
+            with METRICS.fetching(), open(
+                os.path.join(entry.path, "trade_history.json")
+            ) as f:
                 data = json.load(f)
             ts = data.get("timestamp", f"{d}T00:00:00Z")
-            trades = data.get("trades", [])
-            for t in trades:
-                if t.get("status") != "FILLED":
+            fills = [t for t in data.get("trades", []) if t.get("status") == "FILLED"]
+            uploaded = {t.name: set(dir_marks[t.name].get("fills", [])) for t in need}
+            ids = [_hash_obj(t)[:16] for t in fills]
+            start = batch.added
+            for fill_id, t in zip(ids, fills):
+                targets = [x for x in need if fill_id not in uploaded[x.name]]
+                if not targets:
                     continue
+                fill_ts = t.get("timestamp") or ts
                 qty = t.get("quantity", 0)
                 price = t.get("executed_price", 0)
-                convex_mutation(
-                    "trading:upsertTrade",
+                batch.add(
                     {
                         "strategyId": "carver_trend_v1",
                         "date": d,
-                        "timestamp": ts,
+                        "timestamp": fill_ts,
                         "symbol": t.get("symbol", "?"),
                         "side": t.get("action", "?"),
                         "quantity": float(qty),
@@ -785,34 +3275,38 @@ def sync_trade_log(state: dict):
                         "fee": float(t.get("fee", 0)),
                         "status": "FILLED",
                     },
+                    key=f"{d}|{fill_id}",
+                    targets=targets,
                 )
-                trades_synced += 1
+            # Ids of fills no longer in the file drop out of the set.
+            new_mark = {"sig": sig, "fills": sorted(set(ids))}
+            pending.append((d, new_mark, need, start, batch.added))
         except Exception as e:
             print(f"  ⚠ Error parsing {d}: {e}")
 
-    print(f"  ✓ Synced {trades_synced} filled trades")
+    batch.flush()
+    for d, new_mark, need, start, end in pending:
+        if batch.all_ok(start, end):
+            for t in need:
+                marks.marks[t.name][d] = new_mark
+    marks.commit(keep=seen)
+    print(
+        f"  ✓ Synced filled trades: {batch.report()}, {skipped} unchanged dirs skipped"
+    )
 
 
+@syncer("meal_log", QuarkTables("meals"), Today())
 def sync_meal_log(state: dict):
     """Sync logged meals from SQLite meals.db."""
-    import sqlite3
-
     print("📋 Syncing meal log...")
 
-    db_path = f"{WORKSPACE}/data/quark.db"
-    if not os.path.exists(db_path):
+    if not os.path.exists(QUARK_DB):
         print("  ⚠ quark.db not found")
         return
-    sig = _file_sig(db_path)
-    if sig and not _changed(state, "meal_log", sig):
-        print("  ↩ Meal log unchanged — skipping")
-        return
-
-    db = sqlite3.connect(db_path)
-    db.row_factory = sqlite3.Row
-
     # Sync last 30 days
     cutoff = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+
+    db = quark_snapshot()
     rows = db.execute(
         "SELECT * FROM meals WHERE date >= ? ORDER BY date, meal_type", (cutoff,)
     ).fetchall()
@@ -837,12 +3331,17 @@ def sync_meal_log(state: dict):
         )
 
     count = 0
+    batch = MutationBatcher("meals:syncMealLogs")
+    day_rows = RowHashes("mealLog")
     for date, meals in by_date.items():
-        convex_mutation("meals:syncMealLog", {"date": date, "meals": meals})
+        day_rows.add(batch, date, {"date": date, "meals": meals})
         count += len(meals)
 
-    print(f"  ✓ Synced {count} logged meals across {len(by_date)} days")
-    db.close()
+    batch.flush()
+    day_rows.commit()
+    print(
+        f"  ✓ Synced {count} logged meals across {len(by_date)} days: {batch.report()}, {day_rows.skipped} days unchanged"
+    )
 
 
 def _parse_weekly_plan_lines(lines):
@@ -971,23 +3470,22 @@ def _parse_weekly_plan_lines(lines):
     return days, summary_lines
 
 
+@syncer("meal_plan", QuarkTables("weekly_plans"))
 def sync_meals(state: dict):
     """Sync weekly meal plan from quark.db (chef plan)."""
-    import sqlite3
-
     print("🍽️ Syncing meal plan...")
-    db_path = f"{WORKSPACE}/data/quark.db"
-    if not os.path.exists(db_path):
+    if not os.path.exists(QUARK_DB):
         print("  ⚠ quark.db not found")
         return
 
-    db = sqlite3.connect(db_path)
-    db.row_factory = sqlite3.Row
-    row = db.execute(
-        "SELECT week_start, plan, summary FROM weekly_plans "
-        "WHERE domain='chef' ORDER BY week_start DESC LIMIT 1"
-    ).fetchone()
-    db.close()
+    row = (
+        quark_snapshot()
+        .execute(
+            "SELECT week_start, plan, summary FROM weekly_plans "
+            "WHERE domain='chef' ORDER BY week_start DESC LIMIT 1"
+        )
+        .fetchone()
+    )
 
     if not row:
         print("  ↩ No chef plan in quark.db")
@@ -995,10 +3493,6 @@ def sync_meals(state: dict):
 
     week_start = row["week_start"]
     summary = row["summary"] or None
-    sig = _hash_obj(f"{week_start}:{row['plan']}")
-    if sig and not _changed(state, "meal_plan", sig):
-        print("  ↩ Meal plan unchanged — skipping")
-        return
 
     try:
         plan = json.loads(row["plan"])
@@ -1044,32 +3538,29 @@ def sync_meals(state: dict):
     if summary:
         args["summary"] = summary
 
-    convex_mutation("meals:upsertMealPlan", args)
+    rows = RowHashes("mealPlan")
+    rows.send("meals:upsertMealPlan", week_start, args)
+    rows.commit()
     print(
         f"  ✓ Chef plan {week_start}: {len(days)} days, {sum(len(d['meals']) for d in days)} meals"
     )
 
 
+@syncer("chef_brief", QuarkTables("daily_briefs"), Today())
 def sync_chef_daily_brief(state: dict):
     """Sync today's adjusted Chef brief to Convex dailyAdjustedMeals."""
-    import sqlite3
-
     print("⚡ Syncing Chef daily brief...")
-    db_path = f"{WORKSPACE}/data/quark.db"
-    if not os.path.exists(db_path):
+    if not os.path.exists(QUARK_DB):
         print("  ⚠ quark.db not found")
         return
 
     today = datetime.now().strftime("%Y-%m-%d")
 
-    db = sqlite3.connect(db_path)
-    db.row_factory = sqlite3.Row
-
+    db = quark_snapshot()
     exists = db.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name='daily_briefs'"
     ).fetchone()
     if not exists:
-        db.close()
         print("  ↩ daily_briefs table not found")
         return
 
@@ -1077,17 +3568,11 @@ def sync_chef_daily_brief(state: dict):
         "SELECT plan_today, adjustment FROM daily_briefs WHERE domain='chef' AND date=?",
         (today,),
     ).fetchone()
-    db.close()
 
     if not row or not row["plan_today"]:
         print(f"  ↩ No chef brief for {today}")
         return
 
-    sig = _hash_obj(f"chef_brief:{today}:{row['plan_today']}")
-    if not _changed(state, "chef_daily_brief", sig):
-        print("  ↩ Chef brief unchanged — skipping")
-        return
-
     try:
         plan_today = json.loads(row["plan_today"])
     except (json.JSONDecodeError, TypeError):
@@ -1143,31 +3628,28 @@ def sync_chef_daily_brief(state: dict):
     if adj_reason:
         args["adjustmentReason"] = adj_reason[:200]
 
-    convex_mutation("meals:upsertDailyMeals", args)
+    rows = RowHashes("dailyAdjustedMeals")
+    rows.send("meals:upsertDailyMeals", f"chef|{today}", args)
+    rows.commit()
     adj_str = f" ⚡ {adj_reason[:50]}" if adj_reason else ""
     print(
         f"  ✓ Chef brief {today}: {len(meals)} meals, {args['totalKcal']}kcal{adj_str}"
     )
 
 
+@syncer("briefs", QuarkTables("daily_briefs"))
 def sync_daily_briefs(state: dict):
     """Sync all daily briefs (coach + chef) to Convex dailyBriefs table."""
-    import sqlite3
-
     print("📋 Syncing daily briefs...")
-    db_path = f"{WORKSPACE}/data/quark.db"
-    if not os.path.exists(db_path):
+    if not os.path.exists(QUARK_DB):
         print("  ⚠ quark.db not found")
         return
 
-    db = sqlite3.connect(db_path)
-    db.row_factory = sqlite3.Row
-
+    db = quark_snapshot()
     exists = db.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name='daily_briefs'"
     ).fetchone()
     if not exists:
-        db.close()
         print("  ↩ daily_briefs table not found")
         return
 
@@ -1176,22 +3658,13 @@ def sync_daily_briefs(state: dict):
         "SELECT domain, date, metrics, plan_today, actual, delta, adjustment, alert "
         "FROM daily_briefs ORDER BY date DESC LIMIT 14"
     ).fetchall()
-    db.close()
 
     if not rows:
         print("  ↩ No daily briefs")
         return
 
-    sig = _hash_obj(
-        "|".join(
-            f"{r['domain']}:{r['date']}:{r['metrics']}:{r['plan_today']}" for r in rows
-        )
-    )
-    if not _changed(state, "daily_briefs", sig):
-        print("  ↩ Daily briefs unchanged — skipping")
-        return
-
-    count = 0
+    batch = MutationBatcher("briefs:upsertDailyBriefs")
+    brief_rows = RowHashes("dailyBriefs")
     for row in rows:
 
         def _parse(val):
@@ -1224,12 +3697,18 @@ def sync_daily_briefs(state: dict):
         if row["alert"]:
             args["alert"] = row["alert"]
 
-        convex_mutation("briefs:upsertDailyBrief", args)
-        count += 1
+        brief_rows.add(batch, f"{args['domain']}|{args['date']}", args)
 
-    print(f"  ✓ Synced {count} daily briefs")
+    batch.flush()
+    brief_rows.commit()
+    print(f"  ✓ Synced daily briefs: {batch.report()}, {brief_rows.skipped} unchanged")
 
 
+@syncer(
+    "cron",
+    FileInput("~/.openclaw/cron/jobs.json"),
+    FileInput("~/.openclaw/workspace/data/cron_snapshot.json"),
+)
 def sync_cron(state: dict):
     """Sync cron job statuses from jobs.json (source of truth)."""
     print("⏰ Syncing cron jobs...")
@@ -1243,17 +3722,15 @@ def sync_cron(state: dict):
     if not os.path.exists(source):
         print("  ⚠ No cron data — need jobs.json or cron_snapshot.json")
         return
-    sig = _file_sig(source)
-    if sig and not _changed(state, "cron", sig):
-        print("  ↩ Cron data unchanged — skipping")
-        return
-    with open(source) as f:
+    with METRICS.fetching(), open(source) as f:
         data = json.load(f)
 
     # jobs.json wraps jobs in {"version":1,"jobs":[...]}, snapshot is a flat list
     jobs = data.get("jobs", data) if isinstance(data, dict) else data
 
-    count = 0
+    batch = MutationBatcher("cron:upsertCronJobs")
+    patches = MutationBatcher("cron:patchCronJobs")
+    rows = RowPatches("cronJobs", key_fields=("jobId",))
     for job in jobs:
         state = job.get("state", {})
         schedule = job.get("schedule", {})
@@ -1288,36 +3765,89 @@ def sync_cron(state: dict):
         }
         args = {k: v for k, v in args.items() if v is not None}
         if "jobId" in args:
-            convex_mutation("cron:upsertCronJob", args)
-            count += 1
+            rows.add(batch, args["jobId"], args, patches)
 
-    print(f"  ✓ Synced {count} cron jobs")
+    batch.flush()
+    patches.flush()
+    rows.commit()
+    print(
+        f"  ✓ Synced cron jobs: {batch.report()}, {patches.report()} as patches, "
+        f"{rows.skipped} unchanged"
+    )
 
 
+def chunk_text(text: str) -> list:
+    """Split ``text`` into content-defined chunks at line boundaries.
+
+    A chunk ends after a line whose hash has its low three bits clear once
+    it holds ``CHUNK_MIN`` characters, or at ``CHUNK_MAX`` regardless. Since
+    boundaries depend on the lines themselves, an edit only changes the
+    chunks around it and the rest keep their hashes.
+    """
+    import zlib
+
+    chunks, cur, size = [], [], 0
+    for line in text.splitlines(keepends=True):
+        while len(line) > CHUNK_MAX - size:
+            cut = CHUNK_MAX - size
+            cur.append(line[:cut])
+            chunks.append("".join(cur))
+            cur, size, line = [], 0, line[cut:]
+        if not line:
+            continue
+        cur.append(line)
+        size += len(line)
+        if size >= CHUNK_MIN and zlib.crc32(line.encode()) & 7 == 0:
+            chunks.append("".join(cur))
+            cur, size = [], 0
+    if cur:
+        chunks.append("".join(cur))
+    return chunks
+
+
+def upload_chunks(chunks: dict, fn_name: str = "chunks:putChunks", checks=()) -> int:
+    """Queue the ``{hash: text}`` chunks Convex does not have; returns count.
+
+    Each deployment is asked separately and only gets the chunks it lacks,
+    through the bulk mutation ``fn_name``. If one cannot be asked, it is
+    sent every chunk except ``checks`` — chunks of documents that did not
+    change, offered only to fill gaps; storing one is idempotent.
+    """
+    hashes = sorted(chunks)
+    checks = set(checks)
+    targets = {}
+    for d in deployments():
+        for i in range(0, len(hashes), BATCH_MAX_ROWS):
+            part = hashes[i : i + BATCH_MAX_ROWS]
+            try:
+                found = convex_query("chunks:missingChunks", {"hashes": part}, d)
+            except EndpointDown:
+                found = None
+            if found is None:
+                found = [h for h in part if h not in checks]
+            for h in found:
+                targets.setdefault(h, []).append(d)
+    batch = MutationBatcher(fn_name)
+    for h in sorted(targets):
+        batch.add({"hash": h, "text": chunks[h]}, key=h, targets=targets[h])
+    batch.flush()
+    return len(targets)
+
+
+@syncer("weekly", QuarkTables("weekly_reports"))
 def sync_weekly_reports(state: dict):
     """Sync weekly reports from quark.db into Convex."""
-    import sqlite3
-
     print("🗂️ Syncing weekly reports...")
-    db_path = os.path.join(WORKSPACE, "data", "quark.db")
-    if not os.path.exists(db_path):
+    if not os.path.exists(QUARK_DB):
         print("  ⚠ quark.db not found")
         return
 
-    sig = _file_sig(db_path)
-    if sig and not _changed(state, "weekly_reports", sig):
-        print("  ↩ Weekly reports unchanged — skipping")
-        return
-
-    db = sqlite3.connect(db_path)
-    db.row_factory = sqlite3.Row
-
+    db = quark_snapshot()
     # Check table exists
     exists = db.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name='weekly_reports'"
     ).fetchone()
     if not exists:
-        db.close()
         print("  ↩ weekly_reports table not yet created")
         return
 
@@ -1325,44 +3855,68 @@ def sync_weekly_reports(state: dict):
         "SELECT domain, week_start, title, summary, content FROM weekly_reports "
         "ORDER BY week_start DESC"
     ).fetchall()
-    db.close()
 
     if not rows:
         print("  ↩ No weekly reports in quark.db")
         return
 
-    max_content = 4000
-    count = 0
+    # Long bodies go up as content-addressed chunks, and only chunks Convex
+    # lacks are sent. They are queued before the reports that reference
+    # them, on the reports' module so the same outbox lane sends them in
+    # that order. Unchanged reports offer theirs too, so a lost chunk is
+    # put back.
+    batch = MutationBatcher("weekly:upsertWeeklyReports")
+    report_rows = RowHashes("weeklyReports")
+    reports = []
     for row in rows:
         content = row["content"] or ""
-        trimmed = (
-            content
-            if len(content) <= max_content
-            else content[:max_content] + "\n\n[TRUNCATED]"
-        )
         args = {
             "domain": row["domain"],
             "reportDate": row["week_start"],
             "title": row["title"] or f"{row['domain']} weekly {row['week_start']}",
             "summary": (row["summary"] or "")[:200] or None,
-            "content": trimmed,
         }
         if args["summary"] is None:
             del args["summary"]
-        convex_mutation("weekly:upsertWeeklyReport", args)
-        count += 1
-
-    print(f"  ✓ Synced {count} weekly reports")
+        pieces = chunk_text(content) if len(content) > CHUNK_MIN else []
+        hashes = [hashlib.sha256(p.encode()).hexdigest() for p in pieces]
+        if pieces:
+            args["contentChunks"] = hashes
+        else:
+            args["content"] = content
+        key = f"{args['domain']}|{args['reportDate']}"
+        reports.append((key, args, dict(zip(hashes, pieces))))
+
+    chunks, checks = {}, {}
+    for key, args, pieces in reports:
+        (chunks if report_rows.stale(key, args) else checks).update(pieces)
+    checks = {h: text for h, text in checks.items() if h not in chunks}
+    sent = (
+        upload_chunks({**checks, **chunks}, "weekly:putReportChunks", checks)
+        if chunks or checks
+        else 0
+    )
+    for key, args, _ in reports:
+        report_rows.add(batch, key, args)
+    batch.flush()
+    report_rows.commit()
+    print(
+        f"  ✓ Synced weekly reports: {batch.report()}, {report_rows.skipped} unchanged"
+    )
+    if chunks or checks:
+        print(f"  ✓ Content chunks: {sent} sent of {len(chunks) + len(checks)}")
 
 
+@syncer("activities", ApiInput(GARMIN_ACTIVITY_PATHS[0]))
 def sync_activities(state: dict):
     """Sync recent activities from Garmin."""
     print("🏃 Syncing activities...")
-    data = fetch_api_bridge("/garmin/activities?count=10")
+    data = fetch_api_bridge(GARMIN_ACTIVITY_PATHS[0])
     if not data or not isinstance(data, list):
         print("  ⚠ No activities data")
         return
 
+    rows = RowHashes("activities")
     count = 0
     for act in data:
         name = act.get("activityName", "")
@@ -1388,62 +3942,473 @@ def sync_activities(state: dict):
             "source": "garmin",
         }
         args = {k: v for k, v in args.items() if v is not None}
-        convex_mutation("activities:upsertActivity", args)
-        count += 1
-    print(f"  ✓ Synced {count} activities")
+        key = f"{start}|{args['type']}|{args['name']}"
+        if rows.send("activities:upsertActivity", key, args) is not None:
+            count += 1
+    rows.commit()
+    print(f"  ✓ Synced {count} activities, {rows.skipped} unchanged")
+
+
+class _Inotify:
+    """Minimal ctypes binding to Linux inotify; raises OSError if unavailable."""
+
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_ISDIR = 0x40000000
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            self._add = libc.inotify_add_watch
+            self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError, TypeError) as e:
+            raise OSError(f"inotify unavailable: {e}")
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._ctypes = ctypes
+
+    def add(self, path: str) -> int:
+        wd = self._add(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            raise OSError(self._ctypes.get_errno(), f"inotify_add_watch {path}")
+        return wd
+
+    def read(self, timeout: float):
+        """Events as ``(wd, mask, name)``; empty list on timeout."""
+        import select
+        import struct
+
+        if not select.select([self.fd], [], [], max(timeout, 0))[0]:
+            return []
+        try:
+            buf = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        events, i = [], 0
+        while i + 16 <= len(buf):
+            wd, mask, _, size = struct.unpack_from("iIII", buf, i)
+            name = buf[i + 16 : i + 16 + size].rstrip(b"\0").decode(errors="replace")
+            events.append((wd, mask, name))
+            i += 16 + size
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class SourceWatcher:
+    """Watch source files and report which syncers they feed.
+
+    Each target is ``(directory, names, syncers, recursive)``: a change to a
+    file in ``names`` (any file if None) under ``directory`` -- one level of
+    subdirectories deep if ``recursive`` -- fires ``syncers``. inotify is used
+    where available; directories it cannot watch (missing, or no inotify)
+    fall back to stat polling.
+    """
+
+    def __init__(self, targets, debounce=WATCH_DEBOUNCE, poll=WATCH_POLL_INTERVAL):
+        self.targets = targets
+        self.debounce = debounce
+        self.poll = poll
+        self._wds = {}
+        self._polled = set()
+        self._sigs = {}
+        try:
+            self._inotify = _Inotify()
+        except OSError as e:
+            print(f"  ⚠ {e} — polling every {poll:g}s")
+            self._inotify = None
+        for i, (directory, _, _, recursive) in enumerate(targets):
+            if not self._watch(i, directory, recursive):
+                self._polled.add(i)
+            self._sigs[i] = self._signature(i)
+
+    def _watch(self, i: int, directory: str, recursive: bool) -> bool:
+        if self._inotify is None:
+            return False
+        try:
+            self._wds[self._inotify.add(directory)] = (i, False)
+            if recursive:
+                with os.scandir(directory) as it:
+                    for e in it:
+                        if e.is_dir():
+                            self._wds[self._inotify.add(e.path)] = (i, True)
+        except OSError:
+            return False
+        return True
+
+    def _signature(self, i: int):
+        directory, names, _, recursive = self.targets[i]
+        sig = []
+        dirs = [directory]
+        while dirs:
+            d = dirs.pop()
+            try:
+                with os.scandir(d) as it:
+                    for e in it:
+                        if e.is_dir():
+                            if recursive and d == directory:
+                                dirs.append(e.path)
+                            continue
+                        if names is None or e.name in names:
+                            st = e.stat()
+                            sig.append((e.path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                pass
+        return sorted(sig)
+
+    def _poll_changes(self):
+        fired = set()
+        for i in self._polled:
+            sig = self._signature(i)
+            if sig != self._sigs[i]:
+                self._sigs[i] = sig
+                fired.add(i)
+        return fired
+
+    def _inotify_changes(self, timeout: float):
+        fired = set()
+        for wd, mask, name in self._inotify.read(timeout):
+            if wd not in self._wds:
+                continue
+            i, is_sub = self._wds[wd]
+            directory, names, _, recursive = self.targets[i]
+            if mask & _Inotify.IN_ISDIR:
+                if recursive and not is_sub and mask & _Inotify.IN_CREATE:
+                    try:
+                        path = os.path.join(directory, name)
+                        self._wds[self._inotify.add(path)] = (i, True)
+                    except OSError:
+                        pass
+                    fired.add(i)
+                continue
+            if names is None or name in names:
+                fired.add(i)
+        return fired
+
+    def _changes(self, timeout: float):
+        if self._inotify is None or (self._polled and timeout > self.poll):
+            timeout = min(timeout, self.poll)
+        if self._inotify is None:
+            time.sleep(max(timeout, 0))
+            return self._poll_changes()
+        return self._inotify_changes(timeout) | self._poll_changes()
+
+    def wait(self, timeout: float):
+        """Block up to ``timeout`` seconds; return the syncers to run.
+
+        Once something changes, keep collecting until the sources have been
+        quiet for ``debounce`` seconds so a burst of writes fires once.
+        """
+        deadline = time.monotonic() + timeout
+        fired = set()
+        while not fired:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            fired = self._changes(remaining)
+        quiet_until = time.monotonic() + self.debounce
+        while time.monotonic() < quiet_until:
+            more = self._changes(quiet_until - time.monotonic())
+            if more:
+                fired |= more
+                quiet_until = time.monotonic() + self.debounce
+        syncers = set()
+        for i in fired:
+            syncers.update(self.targets[i][2])
+        return syncers
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+
+
+def _watch_targets(jobs=None):
+    """SourceWatcher targets for the inputs ``jobs`` (default: all) declare."""
+    merged = {}
+    for fn in jobs or SYNCERS.values():
+        for inp in fn.syncer.inputs:
+            for directory, names, recursive in inp.watch():
+                target = merged.setdefault(
+                    (directory, recursive), [directory, set(), [], recursive]
+                )
+                if names is None or target[1] is None:
+                    target[1] = None
+                else:
+                    target[1] |= names
+                if fn not in target[2]:
+                    target[2].append(fn)
+    return [tuple(t) for t in merged.values()]
+
+
+def _check_deployments(state: dict):
+    """Reset what a deployment that joined the fan-out is known to have.
+
+    What each deployment was sent — row hashes and the
+    ``DEPLOYMENT_NAMESPACES`` watermarks — lives in its own state store
+    namespaces, so a deployment that joined has only its own namespaces
+    cleared (they may be left over from an earlier stint). The syncers'
+    input fingerprints are dropped so the next pass reads every source
+    again; the deployments already there are sent nothing they have.
+    Watermarks older versions kept in ``state`` for every deployment move
+    to the namespaces of the deployments known when they were recorded.
+    """
+    names = sorted(d.name for d in deployments())
+    known = state.get("deployments", [""])
+    removed = []
+    for key in DEPLOYMENT_NAMESPACES:
+        if key not in state:
+            continue
+        legacy = state.pop(key) or {}
+        removed.append(key)
+        for d in deployments():
+            if d.name in known and not state_store().items(d.ns(key)):
+                state_store().save(d.ns(key), legacy)
+    added = sorted(set(names) - set(known))
+    if added:
+        print(f"🔀 New deployment(s) {', '.join(added)} — reading all sources again")
+        for ns in state_store().namespaces():
+            base, _, name = ns.partition("@")
+            if name in added and (
+                base.startswith("rows:") or base in DEPLOYMENT_NAMESPACES
+            ):
+                state_store().clear(ns)
+        inputs = [k for k in state if k.startswith("inputs:")]
+        for k in inputs:
+            del state[k]
+        removed += inputs
+    if names == known and not removed:
+        return
+    state["deployments"] = names
+    state_store().save("sync", {"deployments": names}, removed)
+
+
+def _check_run(targets, outboxes: dict, uses_bridge: bool):
+    """Set the pass's status and list what went wrong in ``METRICS``.
+
+    An unreachable deployment outranks an API-bridge failure, which
+    outranks dead outbox entries; a pass where the bridge failed is not ok
+    even though its syncers were only skipped.
+    """
+    down = [d for d in targets if breaker_for(d.url).is_open]
+    for d in down:
+        METRICS.problems.append(
+            f"{d.label} unreachable: {breaker_for(d.url).last_error}; "
+            f"{outboxes[d.label]['pending']} writes kept in its outbox"
+        )
+    bridge = breaker_for(API_BRIDGE_URL)
+    bridge_down = uses_bridge and bridge.is_open
+    if bridge_down:
+        METRICS.problems.append(f"API bridge unreachable: {bridge.last_error}")
+    elif API_BRIDGE.errors:
+        METRICS.problems += [
+            f"API bridge error {path}: {error}"
+            for path, error in sorted(API_BRIDGE.errors.items())
+        ]
+    dead = {d.label: outboxes[d.label]["dead"] for d in targets}
+    for d in targets:
+        if dead[d.label]:
+            last = d.outbox().dead_entries(1)[0]
+            METRICS.problems.append(
+                f"{d.label}: {dead[d.label]} outbox entries dead after "
+                f"{d.outbox().max_attempts} attempts (last: {last['fn']} "
+                f"{last['key']}: {(last['error'] or '')[:100]}) — "
+                f"fix the cause and rerun with --retry-dead"
+            )
+    if down:
+        METRICS.status = (
+            "convex-unreachable" if len(down) == len(targets) else "partial"
+        )
+    elif bridge_down:
+        METRICS.status = "api-bridge-unreachable"
+    elif API_BRIDGE.errors:
+        METRICS.status = "api-bridge-errors"
+    elif any(dead.values()):
+        METRICS.status = "dead-letters"
+
+
+def _sync_once(jobs, state: dict, workers: int):
+    METRICS.reset()
+    RETRIES.reset()
+    targets = deployments()
+    # Find out about an outage up front rather than one timeout per request.
+    # Syncers still run while Convex is down; their writes wait in the outbox.
+    for d in targets:
+        probe_endpoint(d.label, d.url)
+    uses_bridge = sync_health in jobs or sync_activities in jobs
+    if uses_bridge:
+        probe_endpoint("API bridge", API_BRIDGE_URL)
+    # One flusher per deployment: each drains its own outbox, so a slow or
+    # unreachable deployment never holds up the others.
+    flushers = [OutboxFlusher(d).start() for d in targets]
+    # Start the Garmin requests before any syncer runs so they overlap.
+    if sync_health in jobs:
+        API_BRIDGE.prefetch(GARMIN_HEALTH_PATHS)
+    if sync_activities in jobs:
+        API_BRIDGE.prefetch(GARMIN_ACTIVITY_PATHS)
+    _run_syncers(jobs, state, workers=workers)
+    outboxes = {}
+    for d, flusher in zip(targets, flushers):
+        flusher.stop()
+        label = "" if len(targets) == 1 else f" {d.label}"
+        print(f"📮 Outbox{label}: {flusher.report()}")
+        pending, dead = d.outbox().counts()
+        outboxes[d.label] = {"sent": flusher.sent, "pending": pending, "dead": dead}
+    METRICS.outbox = {
+        k: sum(o[k] for o in outboxes.values()) for k in ("sent", "pending", "dead")
+    }
+    if len(targets) > 1:
+        METRICS.outbox["deployments"] = outboxes
+    _check_run(targets, outboxes, uses_bridge)
+    reset_quark_snapshot()
+    API_BRIDGE.reset()
+    dropped = state_store().compact()
+    if dropped:
+        print(f"🧹 State: {dropped} expired keys dropped")
+    try:
+        return METRICS.write()
+    except OSError as e:
+        print(f"  ⚠ Could not write metrics: {e}")
+        return METRICS.summary()
+
+
+def watch(jobs, state: dict, workers: int, full_interval: float = WATCH_FULL_INTERVAL):
+    """Run as a daemon: sync whatever a source change affects.
+
+    Every ``full_interval`` seconds all jobs run anyway, which covers the API
+    bridge sources and date-driven windows; the per-source change gates make
+    that cheap. The HTTP pool and parse cache stay warm between triggers.
+    """
+    watcher = SourceWatcher(_watch_targets(jobs))
+    next_full = 0.0
+    try:
+        while True:
+            fired = watcher.wait(max(next_full - time.monotonic(), 0))
+            if time.monotonic() >= next_full:
+                fired = set(jobs)
+                next_full = time.monotonic() + full_interval
+            run = [fn for fn in jobs if fn in fired]
+            if not run:
+                continue
+            print(
+                f"👀 {datetime.now().isoformat()} — {', '.join(fn.__name__ for fn in run)}"
+            )
+            started = time.monotonic()
+            summary = _sync_once(run, state, workers)
+            for problem in summary["problems"]:
+                print(f"⛔ {problem}")
+            done = "✅ Done" if summary["status"] == "ok" else f"⛔ {summary['status']}"
+            print(f"{done} ({time.monotonic() - started:.1f}s) — {HTTP.report()}")
+            print()
+    except KeyboardInterrupt:
+        print("👋 Stopping watch")
+    finally:
+        watcher.close()
 
 
 def main():
     parser = argparse.ArgumentParser(description="Sync data to Convex.")
     parser.add_argument(
         "--only",
-        help="Comma-separated list: health,tes,weed,trading,meal_log,meal_plan,chef_brief,cron,briefs,weekly",
+        help=f"Comma-separated list: {','.join(SYNCERS)}",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=SYNC_WORKERS,
+        help="Number of syncers run concurrently (1 = serial, default: %(default)s)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and sync whenever a source changes",
+    )
+    parser.add_argument(
+        "--full-interval",
+        type=float,
+        default=WATCH_FULL_INTERVAL,
+        help="With --watch: seconds between full passes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--retry-dead",
+        action="store_true",
+        help="Queue dead outbox entries again before syncing",
+    )
+    parser.add_argument(
+        "--deployment",
+        action="append",
+        metavar="NAME=URL",
+        help="Write to this Convex deployment; repeat to fan out to several "
+        "(default: MC_DEPLOYMENTS, else CONVEX_URL)",
     )
     args = parser.parse_args()
-
+    try:
+        configure_deployments(",".join(args.deployment or []) or DEPLOYMENTS)
+    except ValueError as e:
+        parser.error(str(e))
+
+    names = {}
+    for name, fn in SYNCERS.items():
+        for alias in (name,) + fn.syncer.aliases:
+            names[alias] = name
     selected = None
     if args.only:
         selected = set(x.strip() for x in args.only.split(",") if x.strip())
+        unknown = selected - names.keys()
+        if unknown:
+            parser.error(f"unknown syncer(s): {', '.join(sorted(unknown))}")
+        selected = {names[x] for x in selected}
 
     state = _load_state()
+    _check_deployments(state)
     print(f"🚀 Mission Control Sync — {datetime.now().isoformat()}")
-    print(f"   Convex: {CONVEX_URL}")
+    for d in deployments():
+        print(f"   Convex: {d.url}" + (f" ({d.name})" if d.name else ""))
     if selected:
         print(f"   Only: {', '.join(sorted(selected))}")
+    if args.retry_dead:
+        for d in deployments():
+            revived = d.outbox().revive()
+            if revived:
+                print(f"   ↻ {d.label}: {revived} dead outbox entries queued again")
     print()
 
-    before = json.dumps(state, sort_keys=True)
-    if not selected or "health" in selected:
-        sync_health(state)
-    if not selected or "tes" in selected:
-        sync_tes(state)
-    if not selected or "weed" in selected or "ziolo" in selected:
-        sync_weed(state)
-    if not selected or "trading" in selected:
-        sync_trading(state)
-    if not selected or "meal_log" in selected:
-        sync_meal_log(state)
-    if not selected or "meal_plan" in selected:
-        sync_meals(state)
-    if not selected or "chef_brief" in selected:
-        sync_chef_daily_brief(state)
-    if not selected or "cron" in selected:
-        sync_cron(state)
-    if not selected or "trade_log" in selected:
-        sync_trade_log(state)
-    if not selected or "activities" in selected:
-        sync_activities(state)
-    if not selected or "briefs" in selected:
-        sync_daily_briefs(state)
-    if not selected or "weekly" in selected:
-        sync_weekly_reports(state)
-
-    after = json.dumps(state, sort_keys=True)
-    if before != after:
-        _save_state(state)
+    jobs = [fn for name, fn in SYNCERS.items() if not selected or name in selected]
 
+    if args.watch:
+        watch(jobs, state, args.workers, full_interval=args.full_interval)
+        HTTP.close()
+        return
+
+    started = time.monotonic()
+    summary = _sync_once(jobs, state, args.workers)
+
+    HTTP.close()
+    total = summary["total"]
     print()
-    print("✅ Sync complete!")
+    print(f"🔌 HTTP: {HTTP.report()}")
+    print(
+        f"🧾 Metrics: {total['mutations_attempted']} mutations "
+        f"({total['mutations_failed']} failed), {total['rows_skipped']} rows unchanged, "
+        f"{total['bytes_sent'] / 1024:.1f} KiB sent → {METRICS_PATH}"
+    )
+    if summary["status"] != "ok":
+        for problem in summary["problems"]:
+            print(f"⛔ {problem}")
+        print(
+            f"⛔ Sync finished with status {summary['status']} "
+            f"after {time.monotonic() - started:.1f}s"
+        )
+        sys.exit(2)
+    print(f"✅ Sync complete! ({time.monotonic() - started:.1f}s)")
 
 
 if __name__ == "__main__":